@@ -2,14 +2,32 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import google.generativeai as genai
 import os
-import json
 from datetime import datetime
 import warnings
 import time
+from config import CACHE_CONFIG, DATA_CONFIG, IA_EXECUTOR_CONFIG, validate_dataframe
+from ingestao import ResumoIngestao, carregar_arquivo
+from esbocos import EsbocosDataset
+from exportacao import (FORMATOS_DATA, compressoes_disponiveis, exportar_em_arquivo, limpar_exportacoes_antigas,
+                        remover_arquivo)
+from qualidade import PerfilQualidade
+from compactacao import compactar_dataframe
+from planilhas import abas_excel, colunas_excel
+from cache_datasets import CacheDatasets, chave_opcoes, hash_conteudo
+from gerador_dados import gerar_dados_vendas
+from cubo import CuboOLAP
+from filtros import MotorFiltros
+from busca import IndiceTextual
+from cache_ia import CacheRespostas, impressao_dataframe
+from graficos_avancados import GRAFICOS, construir_grafico
+from graficos_cache import CacheFiguras, carregar_figura, chave_figura
+from graficos_paralelos import executar_graficos
+from executor_ia import ExecutorIA
+from ia_gemini import (PERGUNTA_INSIGHTS_RAPIDOS, SUGESTOES_PERGUNTAS, analisar, configurar,
+                       tarefas_analises)
+from relatorios import gerar_relatorio_executivo, gerar_relatorio_tecnico
+from formatos import FORMATOS_COLUNARES, colunas_disponiveis, formato_do_arquivo, interpretar_valor
 warnings.filterwarnings('ignore')
 
 # Configuração da página
@@ -250,6 +268,12 @@ if 'df' not in st.session_state:
     st.session_state.df = None
 if 'charts_generated' not in st.session_state:
     st.session_state.charts_generated = False
+if 'resumo_ingestao' not in st.session_state:
+    st.session_state.resumo_ingestao = None
+if 'relatorio_compactacao' not in st.session_state:
+    st.session_state.relatorio_compactacao = None
+if 'chave_dataset' not in st.session_state:
+    st.session_state.chave_dataset = None
 
 # Header Ultra Melhorado
 st.markdown("""
@@ -273,520 +297,331 @@ st.markdown("""
 def configure_gemini():
     """Configura a API do Gemini com cache"""
     try:
-        api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+        try:
+            api_key = st.secrets.get("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY")
+        except FileNotFoundError:
+            # Sem secrets.toml: usa apenas a variável de ambiente
+            api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            genai.configure(api_key=api_key)
+            configurar(api_key)
             return True, "🟢 Conectado"
         return False, "🔴 Chave API não encontrada"
     except Exception as e:
         return False, f"🔴 Erro: {str(e)}"
 
+# Limpeza única de exportações temporárias órfãs
+@st.cache_resource
+def sweep_old_exports():
+    """Na subida do servidor, apaga exportações deixadas por sessões anteriores"""
+    return limpar_exportacoes_antigas(CACHE_CONFIG['exportacao_max_horas'] * 3600)
+
+sweep_old_exports()
+
+# Cache de datasets em disco compartilhado entre sessões
+@st.cache_resource
+def get_dataset_cache():
+    """Cria o cache de datasets processados"""
+    return CacheDatasets(CACHE_CONFIG['dataset_dir'], CACHE_CONFIG['dataset_max_mb'] * 1024**2)
+
+# Cubo OLAP do dataset atual (agregados por dimensão, construídos uma vez)
+def get_cubo():
+    """Devolve o cubo do dataset carregado, construindo-o apenas na primeira consulta"""
+    resumo = st.session_state.resumo_ingestao
+    if resumo is not None and resumo.cubo is not None:
+        return resumo.cubo
+    
+    versao = (st.session_state.chave_dataset, id(st.session_state.df))
+    if st.session_state.get('cubo_versao') != versao:
+        st.session_state.cubo = CuboOLAP.construir(st.session_state.df)
+        st.session_state.cubo_versao = versao
+    return st.session_state.cubo
+
+def memo_dataset(nome, calcular):
+    """Resultado de calcular() memorizado enquanto o dataset carregado não muda"""
+    versao = (st.session_state.chave_dataset, id(st.session_state.df))
+    if st.session_state.get('memo_versao') != versao:
+        st.session_state.memo = {}
+        st.session_state.memo_versao = versao
+    if nome not in st.session_state.memo:
+        st.session_state.memo[nome] = calcular()
+    return st.session_state.memo[nome]
+
+def memo_arquivo(arquivo, nome, calcular):
+    """Resultado de calcular() memorizado enquanto o arquivo enviado não muda (abas, colunas...)"""
+    if st.session_state.get('memo_arquivo_id') != arquivo.file_id:
+        st.session_state.memo_arquivo = {}
+        st.session_state.memo_arquivo_id = arquivo.file_id
+    if nome not in st.session_state.memo_arquivo:
+        st.session_state.memo_arquivo[nome] = calcular()
+    return st.session_state.memo_arquivo[nome]
+
+# Perfil de qualidade: uma passada por versão do dataset, compartilhada pelos painéis
+def get_perfil(df):
+    """Perfil da ingestão em blocos ou construído uma vez a partir do df"""
+    resumo = st.session_state.resumo_ingestao
+    if resumo is not None:
+        return resumo.perfil
+    return memo_dataset('perfil', lambda: PerfilQualidade.de_dataframe(df))
+
+# Estatísticas descritivas: exatas por padrão, por esboços quando não há o dataset inteiro em memória
+def use_sketch_stats():
+    """Esboços sempre na ingestão em blocos; nos demais casos, só se o usuário pedir"""
+    if st.session_state.resumo_ingestao is not None:
+        return True
+    return st.session_state.get('estatisticas_aproximadas', False)
+
+def get_esbocos(df):
+    """Esboços do dataset: os da ingestão em blocos ou construídos uma vez a partir do df"""
+    resumo = st.session_state.resumo_ingestao
+    if resumo is not None:
+        return resumo.esbocos
+    return memo_dataset('esbocos', lambda: EsbocosDataset.de_dataframe(df, tamanho_bloco=DATA_CONFIG['chunk_size']))
+
+def dataset_statistics(df, numeric_cols):
+    """Tabela no formato do describe() e nota com os limites de erro (None quando exata)"""
+    if use_sketch_stats():
+        esbocos = get_esbocos(df)
+        return esbocos.describe(numeric_cols), esbocos.nota_erro()
+    return memo_dataset('describe', lambda: df[numeric_cols].describe()), None
+
+def get_motor_filtros(df):
+    """Motor de filtros do Explorador, mantido na sessão enquanto o dataset não muda"""
+    versao = (st.session_state.chave_dataset, id(df))
+    if st.session_state.get('motor_filtros_versao') != versao:
+        medidas = [c for c in ['vendas', 'lucro'] if c in df.columns]
+        st.session_state.motor_filtros = MotorFiltros(df, medidas=medidas)
+        st.session_state.motor_filtros_versao = versao
+    return st.session_state.motor_filtros
+
+def get_indice_busca(df):
+    """Índice da busca textual, construído na primeira busca sobre cada dataset"""
+    versao = (st.session_state.chave_dataset, id(df))
+    if st.session_state.get('indice_busca_versao') != versao:
+        with st.spinner("🔎 Indexando valores para a busca..."):
+            st.session_state.indice_busca = IndiceTextual(df)
+        st.session_state.indice_busca_versao = versao
+    return st.session_state.indice_busca
+
+# Cache de respostas do Gemini compartilhado entre sessões
+@st.cache_resource
+def get_cache_ia():
+    """Cria o cache persistente de respostas da IA"""
+    return CacheRespostas(
+        CACHE_CONFIG['ia_db'],
+        ttl_segundos=CACHE_CONFIG['ia_ttl_horas'] * 3600,
+        max_entradas=CACHE_CONFIG['ia_max_entradas']
+    )
+
+def get_impressao_dataset(df):
+    """Impressão digital do dataset carregado, calculada uma vez por versão"""
+    versao = (st.session_state.chave_dataset, id(df))
+    if st.session_state.get('impressao_dataset_versao') != versao:
+        st.session_state.impressao_dataset = impressao_dataframe(df)
+        st.session_state.impressao_dataset_versao = versao
+    return st.session_state.impressao_dataset
+
 # Função para gerar dados de exemplo MELHORADA
 @st.cache_data
-def generate_sample_data():
+def generate_sample_data(n_records=300):
     """Gera dados de exemplo mais realistas"""
-    np.random.seed(42)
-    n_records = 300
-    
-    # Dados mais realistas
-    vendedores = [
-        'João Silva', 'Maria Santos', 'Pedro Costa', 'Ana Lima', 'Carlos Rocha',
-        'Lucia Ferreira', 'Roberto Alves', 'Fernanda Dias', 'Marcos Oliveira',
-        'Patricia Souza', 'Ricardo Mendes', 'Juliana Castro', 'Gabriel Torres',
-        'Camila Ribeiro', 'Diego Martins', 'Beatriz Gomes'
-    ]
-    
-    produtos = [
-        'iPhone 15 Pro', 'MacBook Air M2', 'iPad Pro', 'Apple Watch Ultra',
-        'Samsung Galaxy S24', 'Dell XPS 13', 'Surface Pro 9', 'PlayStation 5',
-        'Xbox Series X', 'Nintendo Switch', 'AirPods Pro', 'Sony WH-1000XM5',
-        'Canon EOS R6', 'GoPro Hero 12', 'Tesla Model Y', 'Drone DJI Mini 4'
-    ]
-    
-    regioes = ['Norte', 'Sul', 'Leste', 'Oeste', 'Centro']
-    meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-    categorias = ['Eletrônicos', 'Informática', 'Games', 'Acessórios', 'Automotivo']
-    canais = ['Online', 'Loja Física', 'Marketplace', 'App Mobile', 'Telefone']
-    
-    data = []
-    for i in range(n_records):
-        categoria = np.random.choice(categorias)
-        
-        # Vendas baseadas na categoria
-        if categoria == 'Eletrônicos':
-            vendas_base = np.random.normal(45000, 15000)
-        elif categoria == 'Informática':
-            vendas_base = np.random.normal(35000, 12000)
-        elif categoria == 'Games':
-            vendas_base = np.random.normal(25000, 8000)
-        elif categoria == 'Automotivo':
-            vendas_base = np.random.normal(85000, 25000)
-        else:
-            vendas_base = np.random.normal(15000, 5000)
-        
-        vendas = max(2000, int(vendas_base))
-        custo = int(vendas * np.random.uniform(0.35, 0.65))
-        lucro = vendas - custo
-        margem = (lucro / vendas) * 100
-        
-        # Satisfação correlacionada com margem e categoria
-        if margem > 45:
-            satisfacao = np.random.choice([4, 5], p=[0.2, 0.8])
-        elif margem > 30:
-            satisfacao = np.random.choice([3, 4, 5], p=[0.1, 0.4, 0.5])
-        elif margem > 15:
-            satisfacao = np.random.choice([2, 3, 4], p=[0.2, 0.5, 0.3])
-        else:
-            satisfacao = np.random.choice([1, 2, 3], p=[0.4, 0.4, 0.2])
-        
-        # Quantidade baseada no preço
-        if vendas > 50000:
-            quantidade = np.random.randint(1, 5)
-        elif vendas > 20000:
-            quantidade = np.random.randint(1, 15)
-        else:
-            quantidade = np.random.randint(1, 50)
-        
-        data.append({
-            'id': i + 1,
-            'vendas': vendas,
-            'custo': custo,
-            'lucro': lucro,
-            'margem': round(margem, 2),
-            'regiao': np.random.choice(regioes),
-            'produto': np.random.choice(produtos),
-            'categoria': categoria,
-            'mes': np.random.choice(meses),
-            'vendedor': np.random.choice(vendedores),
-            'canal': np.random.choice(canais),
-            'satisfacao': satisfacao,
-            'quantidade': quantidade,
-            'desconto': round(np.random.uniform(0, 0.35), 3),
-            'tempo_entrega': np.random.randint(1, 21),
-            'avaliacao': round(np.random.uniform(1, 5), 1),
-            'idade_cliente': np.random.randint(18, 70),
-            'genero': np.random.choice(['M', 'F'], p=[0.52, 0.48])
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Adicionar colunas calculadas
-    df['ticket_medio'] = df['vendas'] / df['quantidade']
-    df['roi'] = (df['lucro'] / df['custo']) * 100
-    df['score_cliente'] = (df['satisfacao'] * 0.4 + df['avaliacao'] * 0.6).round(1)
-    
-    return df
+    return gerar_dados_vendas(n_registros=n_records, perfil='app', seed=42)
+
+# Cache de figuras compartilhado entre sessões
+@st.cache_resource
+def get_cache_figuras():
+    """Cria o cache em memória das figuras serializadas"""
+    return CacheFiguras(max_bytes=CACHE_CONFIG['figuras_max_mb'] * 1024 * 1024)
+
+def chart_json(df, cubo, grafico, versao, cache):
+    """JSON da figura, construída só se ainda não estiver no cache"""
+    chave = chave_figura(versao, grafico, GRAFICOS[grafico][1])
+    return cache.obter_ou_criar(chave, lambda: construir_grafico(grafico, df, cubo))
 
 # Função ULTRA MELHORADA para criar gráficos
-def create_advanced_charts(df):
-    """Cria gráficos avançados e interativos - VERSÃO CORRIGIDA"""
-    charts = {}
+def create_advanced_charts(df, cubo):
+    """Cria gráficos avançados e interativos - VERSÃO CORRIGIDA
     
+    Cada gráfico é construído em paralelo e guardado no cache compartilhado;
+    devolve os ids dos gráficos que se aplicam ao dataset, o tempo de cada um
+    e {id: erro} dos que falharam.
+    """
     try:
         st.info("🎨 Gerando visualizações avançadas...")
         progress_bar = st.progress(0)
+        versao, cache = get_impressao_dataset(df), get_cache_figuras()
         
-        # 1. Gráfico de Barras 3D - Vendas por Região
-        if 'vendas' in df.columns and 'regiao' in df.columns:
-            progress_bar.progress(15)
-            vendas_regiao = df.groupby('regiao').agg({
-                'vendas': 'sum',
-                'lucro': 'sum',
-                'quantidade': 'sum'
-            }).reset_index()
-            
-            fig1 = px.bar(
-                vendas_regiao,
-                x='regiao',
-                y='vendas',
-                color='lucro',
-                title='📊 Vendas e Lucro por Região',
-                text='vendas',
-                color_continuous_scale='Viridis',
-                hover_data=['lucro', 'quantidade']
-            )
-            
-            fig1.update_traces(
-                texttemplate='R$ %{text:,.0f}',
-                textposition='outside',
-                marker_line_color='white',
-                marker_line_width=2
-            )
-            
-            fig1.update_layout(
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                showlegend=True,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12),
-                coloraxis_colorbar=dict(title="Lucro (R$)")
-            )
-            
-            charts['vendas_regiao'] = fig1
-            st.success("✅ Gráfico 1/8 criado")
-        
-        # 2. Gráfico de Pizza Interativo - Distribuição por Categoria
-        if 'categoria' in df.columns and 'vendas' in df.columns:
-            progress_bar.progress(30)
-            categoria_vendas = df.groupby('categoria')['vendas'].sum().reset_index()
-            
-            fig2 = px.pie(
-                categoria_vendas,
-                values='vendas',
-                names='categoria',
-                title='🥧 Distribuição de Vendas por Categoria',
-                color_discrete_sequence=px.colors.qualitative.Set3,
-                hole=0.4
-            )
-            
-            fig2.update_traces(
-                textposition='inside',
-                textinfo='percent+label',
-                hovertemplate='<b>%{label}</b><br>Vendas: R$ %{value:,.0f}<br>Percentual: %{percent}<extra></extra>',
-                pull=[0.1 if i == 0 else 0 for i in range(len(categoria_vendas))]
-            )
-            
-            fig2.update_layout(
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12)
-            )
-            
-            charts['distribuicao_categoria'] = fig2
-            st.success("✅ Gráfico 2/8 criado")
-        
-        # 3. Gráfico de Linha Múltipla - Tendência Temporal
-        if 'vendas' in df.columns and 'mes' in df.columns:
-            progress_bar.progress(45)
-            meses_ordem = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            
-            vendas_mes = df.groupby('mes').agg({
-                'vendas': 'sum',
-                'lucro': 'sum',
-                'quantidade': 'sum'
-            }).reindex(meses_ordem, fill_value=0).reset_index()
-            
-            fig3 = go.Figure()
-            
-            fig3.add_trace(go.Scatter(
-                x=vendas_mes['mes'],
-                y=vendas_mes['vendas'],
-                mode='lines+markers',
-                name='Vendas',
-                line=dict(color='#667eea', width=4),
-                marker=dict(size=10, symbol='circle'),
-                hovertemplate='<b>Vendas</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
-            ))
-            
-            fig3.add_trace(go.Scatter(
-                x=vendas_mes['mes'],
-                y=vendas_mes['lucro'],
-                mode='lines+markers',
-                name='Lucro',
-                line=dict(color='#f093fb', width=4),
-                marker=dict(size=10, symbol='diamond'),
-                yaxis='y2',
-                hovertemplate='<b>Lucro</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
-            ))
-            
-            fig3.update_layout(
-                title='📈 Tendência de Vendas e Lucro por Mês',
-                xaxis_title='Mês',
-                yaxis_title='Vendas (R$)',
-                yaxis2=dict(title='Lucro (R$)', overlaying='y', side='right'),
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                hovermode='x unified',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12),
-                legend=dict(x=0.02, y=0.98)
-            )
-            
-            charts['tendencia_temporal'] = fig3
-            st.success("✅ Gráfico 3/8 criado")
-        
-        # 4. Scatter Plot Avançado - Vendas vs Satisfação
-        if 'vendas' in df.columns and 'satisfacao' in df.columns:
-            progress_bar.progress(60)
-            
-            fig4 = px.scatter(
-                df,
-                x='satisfacao',
-                y='vendas',
-                color='regiao',
-                size='lucro',
-                title='💫 Relação: Vendas × Satisfação × Região',
-                hover_data=['produto', 'categoria', 'margem'],
-                color_discrete_sequence=px.colors.qualitative.Bold,
-                size_max=30
-            )
-            
-            fig4.update_traces(
-                marker=dict(line=dict(width=1, color='white')),
-                hovertemplate='<b>%{hovertext}</b><br>Satisfação: %{x}<br>Vendas: R$ %{y:,.0f}<br>Região: %{marker.color}<extra></extra>'
-            )
-            
-            fig4.update_layout(
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12),
-                xaxis=dict(title='Satisfação (1-5)', gridcolor='lightgray'),
-                yaxis=dict(title='Vendas (R$)', gridcolor='lightgray')
-            )
-            
-            charts['vendas_satisfacao'] = fig4
-            st.success("✅ Gráfico 4/8 criado")
-        
-        # 5. Histograma Avançado - Distribuição de Vendas
-        if 'vendas' in df.columns:
-            progress_bar.progress(75)
-            
-            fig5 = px.histogram(
-                df,
-                x='vendas',
-                nbins=25,
-                title='📊 Distribuição de Vendas',
-                color_discrete_sequence=['#4facfe'],
-                marginal='box'
-            )
-            
-            fig5.update_traces(
-                marker=dict(line=dict(width=1, color='white')),
-                hovertemplate='<b>Faixa de Vendas</b><br>R$ %{x:,.0f}<br>Quantidade: %{y}<extra></extra>'
-            )
-            
-            fig5.update_layout(
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12),
-                xaxis=dict(title='Vendas (R$)', gridcolor='lightgray'),
-                yaxis=dict(title='Frequência', gridcolor='lightgray')
-            )
-            
-            charts['distribuicao_vendas'] = fig5
-            st.success("✅ Gráfico 5/8 criado")
-        
-        # 6. Box Plot Comparativo - Vendas por Produto
-        if 'vendas' in df.columns and 'produto' in df.columns:
-            progress_bar.progress(85)
-            
-            # Pegar apenas top 8 produtos para melhor visualização
-            top_produtos = df.groupby('produto')['vendas'].sum().nlargest(8).index
-            df_top = df[df['produto'].isin(top_produtos)]
-            
-            fig6 = px.box(
-                df_top,
-                x='produto',
-                y='vendas',
-                color='categoria',
-                title='📦 Distribuição de Vendas por Produto (Top 8)',
-                color_discrete_sequence=px.colors.qualitative.Pastel
-            )
-            
-            fig6.update_traces(
-                hovertemplate='<b>%{x}</b><br>Vendas: R$ %{y:,.0f}<br>Categoria: %{marker.color}<extra></extra>'
-            )
-            
-            fig6.update_layout(
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12),
-                xaxis=dict(title='Produto', tickangle=45),
-                yaxis=dict(title='Vendas (R$)', gridcolor='lightgray')
-            )
-            
-            charts['vendas_produto'] = fig6
-            st.success("✅ Gráfico 6/8 criado")
+        def ao_concluir(grafico, resultado, segundos, concluidas, total):
+            progress_bar.progress(concluidas / total, text=f"{grafico}: {segundos:.2f}s")
+            if isinstance(resultado, str) and resultado:
+                st.success(f"✅ Gráfico {concluidas}/{total} criado")
         
-        # 7. Heatmap de Correlação
-        if len(df.select_dtypes(include=[np.number]).columns) >= 3:
-            progress_bar.progress(95)
-            
-            numeric_cols = ['vendas', 'lucro', 'margem', 'satisfacao', 'quantidade', 'desconto']
-            available_cols = [col for col in numeric_cols if col in df.columns]
-            
-            if len(available_cols) >= 3:
-                corr_matrix = df[available_cols].corr()
-                
-                fig7 = px.imshow(
-                    corr_matrix,
-                    title='🔥 Matriz de Correlação',
-                    color_continuous_scale='RdBu',
-                    aspect='auto',
-                    text_auto=True
-                )
-                
-                fig7.update_layout(
-                    height=500,
-                    title_x=0.5,
-                    title_font_size=20,
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(size=12)
-                )
-                
-                charts['correlacao'] = fig7
-                st.success("✅ Gráfico 7/8 criado")
-        
-        # 8. Gráfico de Funil - Top Vendedores
-        if 'vendedor' in df.columns and 'vendas' in df.columns:
-            progress_bar.progress(100)
-            
-            top_vendedores = df.groupby('vendedor')['vendas'].sum().nlargest(10).reset_index()
-            
-            fig8 = go.Figure(go.Funnel(
-                y=top_vendedores['vendedor'],
-                x=top_vendedores['vendas'],
-                textinfo="value+percent initial",
-                hovertemplate='<b>%{y}</b><br>Vendas: R$ %{x:,.0f}<extra></extra>',
-                marker=dict(
-                    color=px.colors.sequential.Viridis,
-                    line=dict(width=2, color='white')
-                )
-            ))
-            
-            fig8.update_layout(
-                title='🏆 Top 10 Vendedores',
-                height=500,
-                title_x=0.5,
-                title_font_size=20,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12)
-            )
-            
-            charts['top_vendedores'] = fig8
-            st.success("✅ Gráfico 8/8 criado")
-        
-        progress_bar.progress(100)
-        time.sleep(0.5)
+        tarefas = {g: (lambda g=g: chart_json(df, cubo, g, versao, cache)) for g in GRAFICOS}
+        resultados, tempos = executar_graficos(tarefas, ao_concluir=ao_concluir)
         progress_bar.empty()
         
+        # Uma falha não descarta os demais: os gráficos com erro são devolvidos à parte
+        falhas = {g: f"{type(r).__name__}: {r}" for g, r in resultados.items() if isinstance(r, Exception)}
+        
+        # Mantém a ordem de exibição do registro de gráficos
+        charts = [g for g in GRAFICOS if resultados[g] and g not in falhas]
         st.success(f"🎉 {len(charts)} gráficos criados com sucesso!")
-        return charts
+        return charts, tempos, falhas
         
     except Exception as e:
         st.error(f"❌ Erro ao criar gráficos: {str(e)}")
         st.error(f"Detalhes: {type(e).__name__}")
-        return {}
+        return [], {}, {}
+
+def show_chart(df, cubo, grafico):
+    """Exibe um gráfico a partir do cache (reconstruído se tiver sido descartado)"""
+    figura = carregar_figura(chart_json(df, cubo, grafico, get_impressao_dataset(df), get_cache_figuras()))
+    if figura is not None:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(figura, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
 
 # Função para análise com Gemini AI MELHORADA
-def analyze_with_gemini(df, custom_question=None):
-    """Analisa dados com Gemini AI - Versão Melhorada"""
+def analyze_with_gemini(df, custom_question=None, usar_cache=True, area=None, metricas=None):
+    """Analisa dados com Gemini AI - respostas repetidas vêm do cache local
+    
+    Com `area` (um st.empty), o texto é exibido progressivamente enquanto é gerado.
+    """
     gemini_status, status_msg = configure_gemini()
     
     if not gemini_status:
         return f"❌ Erro na configuração: {status_msg}"
     
+    ao_receber = None
+    if area is not None:
+        ao_receber = lambda parcial: area.markdown(parcial + " ▌")
+    
     try:
-        # Preparar estatísticas avançadas
-        stats = {
-            'total_records': len(df),
-            'total_vendas': df['vendas'].sum() if 'vendas' in df.columns else 0,
-            'total_lucro': df['lucro'].sum() if 'lucro' in df.columns else 0,
-            'margem_media': df['margem'].mean() if 'margem' in df.columns else 0,
-            'satisfacao_media': df['satisfacao'].mean() if 'satisfacao' in df.columns else 0,
-            'top_regiao': df['regiao'].value_counts().index[0] if 'regiao' in df.columns else 'N/A',
-            'top_produto': df['produto'].value_counts().index[0] if 'produto' in df.columns else 'N/A',
-            'top_categoria': df['categoria'].value_counts().index[0] if 'categoria' in df.columns else 'N/A'
-        }
-        
-        sample_data = df.head(3).to_dict('records')
-        
-        if custom_question:
-            prompt = f"""
-            🤖 ANALISTA DE DADOS ESPECIALISTA
-
-            PERGUNTA ESPECÍFICA: {custom_question}
-            
-            📊 CONTEXTO DOS DADOS:
-            • Total de registros: {stats['total_records']:,}
-            • Vendas totais: R$ {stats['total_vendas']:,.0f}
-            • Lucro total: R$ {stats['total_lucro']:,.0f}
-            • Margem média: {stats['margem_media']:.1f}%
-            • Satisfação média: {stats['satisfacao_media']:.1f}/5
-            • Top região: {stats['top_regiao']}
-            • Top produto: {stats['top_produto']}
-            • Top categoria: {stats['top_categoria']}
-            
-            📋 AMOSTRA DOS DADOS:
-            {json.dumps(sample_data, indent=2, ensure_ascii=False)}
-            
-            🎯 INSTRUÇÕES:
-            • Responda em português brasileiro
-            • Seja específico e use dados reais
-            • Forneça insights acionáveis
-            • Use emojis para destacar pontos importantes
-            • Máximo 400 palavras
-            """
-        else:
-            prompt = f"""
-            🤖 CONSULTOR DE NEGÓCIOS ESPECIALISTA EM DADOS
-
-            📊 ANÁLISE COMPLETA DO DATASET DE VENDAS
-            
-            📈 MÉTRICAS PRINCIPAIS:
-            • Total de registros: {stats['total_records']:,}
-            • Vendas totais: R$ {stats['total_vendas']:,.0f}
-            • Lucro total: R$ {stats['total_lucro']:,.0f}
-            • Margem média: {stats['margem_media']:.1f}%
-            • Satisfação média: {stats['satisfacao_media']:.1f}/5
-            • Região líder: {stats['top_regiao']}
-            • Produto líder: {stats['top_produto']}
-            • Categoria líder: {stats['top_categoria']}
-            
-            📋 AMOSTRA REPRESENTATIVA:
-            {json.dumps(sample_data, indent=2, ensure_ascii=False)}
-            
-            🎯 FORNEÇA UMA ANÁLISE ESTRUTURADA:
-            
-            1. 📊 VISÃO GERAL DO NEGÓCIO
-            • Performance geral das vendas
-            • Principais características do dataset
-            
-            2. 🔍 INSIGHTS ESTRATÉGICOS (Top 3)
-            • Descobertas mais importantes
-            • Padrões identificados nos dados
-            
-            3. ⚠️ PONTOS DE ATENÇÃO
-            • Problemas ou riscos identificados
-            • Áreas que precisam de melhoria
-            
-            4. 🚀 RECOMENDAÇÕES PRÁTICAS (Top 3)
-            • Ações específicas para melhorar resultados
-            • Estratégias baseadas nos dados
-            
-            5. 📈 PRÓXIMOS PASSOS
-            • Sugestões para análises futuras
-            • KPIs para monitorar
-            
-            Use emojis, seja específico com números reais e forneça insights acionáveis.
-            Máximo 600 palavras.
-            """
-        
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(prompt)
-        
-        return response.text
+        contexto = gemini_context_sources()
+        if usar_cache:
+            return analisar(df, custom_question, cache=get_cache_ia(), impressao=get_impressao_dataset(df),
+                            ao_receber=ao_receber, metricas=metricas, **contexto)
+        return analisar(df, custom_question, ao_receber=ao_receber, metricas=metricas, **contexto)
         
     except Exception as e:
         return f"❌ Erro na análise com IA: {str(e)}\n\n💡 Dica: Verifique sua chave API e conexão com a internet."
+    finally:
+        if area is not None:
+            area.empty()
+
+def run_gemini_analysis(df, chave, custom_question=None, area=None):
+    """Executa a análise, guarda o resultado e as métricas de latência na sessão"""
+    metricas = {}
+    st.session_state[chave] = analyze_with_gemini(df, custom_question, area=area, metricas=metricas)
+    st.session_state.setdefault('ia_metricas', {})[chave] = metricas
+
+@st.cache_resource
+def get_executor_ia():
+    """Pool de threads compartilhado para requisições ao Gemini"""
+    return ExecutorIA(
+        max_concorrencia=IA_EXECUTOR_CONFIG['max_concurrency'],
+        requisicoes_por_minuto=IA_EXECUTOR_CONFIG['requests_per_minute'],
+        tentativas=IA_EXECUTOR_CONFIG['max_retries'],
+        espera_inicial=IA_EXECUTOR_CONFIG['initial_backoff_s']
+    )
+
+def gemini_context_sources():
+    """Agregados já calculados que alimentam o contexto dos prompts"""
+    resumo = st.session_state.get('resumo_ingestao')
+    return {
+        'cubo': get_cubo(),
+        'estatisticas': resumo.estatisticas() if resumo is not None else None,
+        'esbocos': resumo.esbocos if resumo is not None else None
+    }
+
+def gemini_tasks(df):
+    return tarefas_analises(df, cache=get_cache_ia(), impressao=get_impressao_dataset(df),
+                            **gemini_context_sources())
+
+def run_all_gemini_analyses(df):
+    """Roda análise completa, insights rápidos e sugestões concorrentemente"""
+    progress_bar = st.progress(0.0, text="🧠 Enviando análises ao Gemini...")
+    
+    def ao_concluir(pergunta, resultado, concluidas, total):
+        progress_bar.progress(concluidas / total, text=f"🧠 {concluidas}/{total} análises concluídas")
+    
+    inicio = time.time()
+    resultados = get_executor_ia().executar(gemini_tasks(df), ao_concluir=ao_concluir)
+    respostas = {
+        pergunta: (f"❌ Erro na análise com IA: {str(r)}" if isinstance(r, Exception) else r)
+        for pergunta, r in resultados.items()
+    }
+    st.session_state.ai_analysis = respostas.pop(None)
+    st.session_state.quick_insights = respostas.pop(PERGUNTA_INSIGHTS_RAPIDOS)
+    st.session_state.suggestion_answers = respostas
+    st.session_state.setdefault('ia_metricas', {}).pop('ai_analysis', None)
+    st.session_state.ia_metricas.pop('quick_insights', None)
+    progress_bar.progress(1.0, text=f"✅ {len(resultados)} análises em {time.time() - inicio:.1f}s")
+
+def precompute_gemini_suggestions(df):
+    """Agenda, uma vez por dataset, todas as análises em segundo plano (só alimenta o cache)"""
+    versao = (st.session_state.chave_dataset, id(df))
+    if st.session_state.get('ia_pre_calculo_versao') == versao:
+        return
+    executor = get_executor_ia()
+    for tarefa in gemini_tasks(df).values():
+        executor.submeter(tarefa)
+    st.session_state.ia_pre_calculo_versao = versao
+
+def show_gemini_metrics(chave):
+    """Legenda com a origem da resposta e as latências registradas"""
+    metricas = st.session_state.get('ia_metricas', {}).get(chave)
+    if not metricas or 'origem' not in metricas:
+        return
+    if metricas['origem'] == 'cache':
+        st.caption("💾 Resposta recuperada do cache local")
+    else:
+        st.caption(
+            f"⏱️ Primeiro trecho em {metricas['primeiro_trecho_s']:.1f}s · "
+            f"total {metricas['total_s']:.1f}s ({metricas['origem']})"
+        )
+
+# Exportação em blocos: o arquivo é gerado em disco sob demanda, não a cada rerun
+MIMES_COMPRESSAO = {None: None, 'gzip': 'application/gzip', 'zstd': 'application/zstd'}
+ROTULOS_EXPORTACAO = {'csv': 'CSV', 'json': 'JSON', 'xlsx': 'Excel', 'parquet': 'Parquet', 'feather': 'Feather'}
+
+def export_file_button(export_df, formato, opcoes, assinatura, nome_base, icone, mime, ajuda, extras=None):
+    """Botão que gera o arquivo e, depois, o download enquanto a seleção não mudar
+
+    extras() devolve argumentos adicionais de exportar_em_arquivo, calculados só
+    quando o arquivo é gerado.
+    """
+    arquivos = st.session_state.setdefault('export_arquivos', {})
+    atual = arquivos.get(formato)
+    if atual is not None and atual['assinatura'] != assinatura:
+        remover_arquivo(atual['caminho'])
+        arquivos.pop(formato)
+        atual = None
+    if atual is not None and not os.path.exists(atual['caminho']):
+        # Apagado pela limpeza por idade: gera de novo quando pedido
+        arquivos.pop(formato)
+        atual = None
+    
+    if atual is None:
+        if st.button(f"{icone} Gerar {ROTULOS_EXPORTACAO[formato]}", use_container_width=True, help=ajuda):
+            limpar_exportacoes_antigas(CACHE_CONFIG['exportacao_max_horas'] * 3600)
+            with st.spinner(f"Gravando {ROTULOS_EXPORTACAO[formato]} em blocos..."):
+                caminho, estatisticas = exportar_em_arquivo(export_df, formato, **opcoes, **(extras() if extras else {}))
+            atual = arquivos[formato] = {'assinatura': assinatura, 'caminho': caminho, **estatisticas}
+    
+    if atual is not None:
+        extensao = atual['caminho'].split(f'.{formato}', 1)[1]
+        with open(atual['caminho'], 'rb') as arquivo:
+            st.download_button(
+                label=f"{icone} Download {ROTULOS_EXPORTACAO[formato]}",
+                data=arquivo,
+                file_name=f"{nome_base}.{formato}{extensao}",
+                mime=(MIMES_COMPRESSAO[opcoes['compressao']] if formato in ('csv', 'json') else None) or mime,
+                use_container_width=True,
+                help=ajuda
+            )
+        abas = f" · {atual['abas']} aba(s) de dados" if atual.get('abas', 1) > 1 else ""
+        st.caption(f"{atual['registros']:,} registros · {atual['bytes'] / 1024**2:.1f} MB · "
+                   f"{atual['segundos']:.1f}s ({atual['registros_por_s']:,.0f} registros/s){abas}")
 
 # Sidebar Ultra Melhorada
 with st.sidebar:
@@ -823,14 +658,60 @@ with st.sidebar:
     st.markdown("### 📁 Carregar Dados")
     uploaded_file = st.file_uploader(
         "Escolha um arquivo",
-        type=['csv', 'xlsx', 'json'],
-        help="📋 Formatos: CSV, Excel, JSON\n📏 Tamanho máximo: 200MB"
+        type=DATA_CONFIG['supported_formats'],
+        help="📋 Formatos: CSV, Excel, JSON, JSON Lines, Parquet, Feather/Arrow\n📏 Tamanho máximo: 200MB"
     )
     
+    # Projeção de colunas e filtro de linhas na leitura de arquivos colunares
+    colunas_leitura = None
+    filtros_leitura = None
+    if uploaded_file is not None and formato_do_arquivo(uploaded_file.name) in FORMATOS_COLUNARES:
+        with st.expander("🧩 Leitura Colunar", expanded=False):
+            todas_colunas = memo_arquivo(uploaded_file, ('colunas',), lambda: colunas_disponiveis(
+                uploaded_file, formato_do_arquivo(uploaded_file.name)))
+            colunas_leitura = st.multiselect(
+                "Colunas a carregar:",
+                todas_colunas,
+                default=todas_colunas,
+                help="Somente as colunas selecionadas são lidas do arquivo"
+            ) or None
+            filtro_col = st.selectbox("Filtrar linhas por:", ['Nenhum'] + todas_colunas)
+            if filtro_col != 'Nenhum':
+                filtro_op = st.selectbox("Operador:", ['==', '!=', '>', '>=', '<', '<='])
+                filtro_valor = st.text_input("Valor:")
+                if filtro_valor:
+                    filtros_leitura = [(filtro_col, filtro_op, interpretar_valor(filtro_valor))]
+    
+    # Aba e colunas da planilha escolhidas antes da leitura
+    aba_leitura = None
+    if uploaded_file is not None and formato_do_arquivo(uploaded_file.name) == 'xlsx':
+        with st.expander("📗 Planilha Excel", expanded=False):
+            abas = memo_arquivo(uploaded_file, ('abas',), lambda: abas_excel(uploaded_file))
+            aba_leitura = st.selectbox("Aba:", abas) if len(abas) > 1 else (abas[0] if abas else None)
+            todas_colunas = memo_arquivo(uploaded_file, ('colunas', aba_leitura),
+                                         lambda: colunas_excel(uploaded_file, aba_leitura))
+            colunas_leitura = st.multiselect(
+                "Colunas a carregar:",
+                todas_colunas,
+                default=todas_colunas,
+                help="Somente as colunas selecionadas são convertidas"
+            ) or None
+    
     # Botão para dados de exemplo melhorado
+    n_exemplo = st.select_slider(
+        "🎲 Registros de exemplo:",
+        options=[300, 10_000, 100_000, 1_000_000, 5_000_000],
+        value=300,
+        format_func=lambda n: f"{n:,}",
+        help="Volumes maiores servem para testes de carga"
+    )
     if st.button("🎲 Gerar Dados de Exemplo", type="primary", use_container_width=True):
         with st.spinner("🔄 Gerando dataset avançado..."):
-            st.session_state.df = generate_sample_data()
+            df, relatorio = compactar_dataframe(generate_sample_data(n_exemplo))
+            st.session_state.df = df
+            st.session_state.resumo_ingestao = None
+            st.session_state.relatorio_compactacao = relatorio
+            st.session_state.chave_dataset = f'exemplo-{n_exemplo}'
             st.session_state.data_loaded = True
             st.session_state.charts_generated = False
             st.success("✅ Dataset carregado com sucesso!")
@@ -842,69 +723,149 @@ with st.sidebar:
     # Informações do dataset
     if st.session_state.data_loaded and st.session_state.df is not None:
         df = st.session_state.df
+        resumo = st.session_state.resumo_ingestao
+        cubo = get_cubo()
         
         st.markdown("### 📊 Informações do Dataset")
         
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("📋 Registros", f"{len(df):,}")
+            n_registros = cubo.n_registros
+            st.metric("📋 Registros", f"{n_registros:,}")
             st.metric("📊 Colunas", len(df.columns))
         
         with col2:
             if 'vendas' in df.columns:
-                st.metric("💰 Vendas", f"R$ {df['vendas'].sum()/1000:.0f}K")
+                st.metric("💰 Vendas", f"R$ {cubo.total('vendas')/1000:.0f}K")
             if 'lucro' in df.columns:
-                st.metric("📈 Lucro", f"R$ {df['lucro'].sum()/1000:.0f}K")
+                st.metric("📈 Lucro", f"R$ {cubo.total('lucro')/1000:.0f}K")
         
         # Tamanho do arquivo
-        size_mb = df.memory_usage(deep=True).sum() / 1024**2
-        st.info(f"💾 Tamanho: {size_mb:.2f} MB")
+        perfil = get_perfil(df)
+        if resumo is not None:
+            st.info(f"💾 Tamanho estimado: {perfil.memoria_mb:.2f} MB ({len(df):,} registros em memória)")
+        else:
+            st.info(f"💾 Tamanho: {perfil.memoria_mb:.2f} MB")
+        
+        relatorio = st.session_state.relatorio_compactacao
+        if relatorio is not None and relatorio['colunas']:
+            st.caption(f"🗜️ Compactação: {relatorio['antes_mb']:.2f} MB → {relatorio['depois_mb']:.2f} MB "
+                       f"({relatorio['reducao']:.1f}x menor, {len(relatorio['colunas'])} colunas)")
         
         # Qualidade dos dados
-        missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
-        if missing_pct == 0:
+        missing_pct = 100 - perfil.completude
+        if perfil.ausentes == 0:
             st.success("✅ Dados completos")
         else:
             st.warning(f"⚠️ {missing_pct:.1f}% dados ausentes")
+        
+        # Modo das estatísticas descritivas
+        if resumo is not None:
+            st.caption("📐 Estatísticas por esboços (KLL/HyperLogLog) acumulados na ingestão")
+        else:
+            st.toggle(
+                "📐 Estatísticas aproximadas",
+                key='estatisticas_aproximadas',
+                help="Quartis por esboço KLL e valores distintos por HyperLogLog, com limites de erro"
+            )
 
 # Processamento do arquivo melhorado
 if uploaded_file is not None:
     try:
-        with st.spinner("📤 Processando arquivo..."):
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file, encoding='utf-8')
-            elif uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(uploaded_file)
-            elif uploaded_file.name.endswith('.json'):
-                df = pd.read_json(uploaded_file)
+        formato = formato_do_arquivo(uploaded_file.name)
+        # O hash do conteúdo é calculado uma vez por upload; mudar as opções só refaz a combinação
+        chave_upload = chave_opcoes(
+            memo_arquivo(uploaded_file, ('hash',), lambda: hash_conteudo(uploaded_file.getbuffer())),
+            formato=formato,
+            colunas=colunas_leitura,
+            filtros=filtros_leitura,
+            aba=aba_leitura,
+            streaming_threshold_mb=DATA_CONFIG['streaming_threshold_mb'],
+            chunk_size=DATA_CONFIG['chunk_size'],
+            explorer_sample_size=DATA_CONFIG['explorer_sample_size'],
+            versao_resumo=ResumoIngestao.VERSAO
+        )
+    except Exception as e:
+        chave_upload = None
+        st.error(f"❌ Erro ao carregar arquivo: {str(e)}")
+    
+    # Dataset já carregado nesta sessão: nada a fazer neste rerun
+    if chave_upload is not None and chave_upload != st.session_state.chave_dataset:
+        try:
+            dataset_cache = get_dataset_cache()
+            em_cache = dataset_cache.obter(chave_upload)
+            
+            if em_cache is not None:
+                df, metadados = em_cache
+                resumo = metadados.get('resumo')
+                relatorio = metadados.get('relatorio')
+                origem = "⚡ recuperado do cache"
+            else:
+                with st.spinner("📤 Processando arquivo..."):
+                    tamanho_mb = uploaded_file.size / 1024**2
+                    
+                    progresso = st.empty()
+                    df, resumo = carregar_arquivo(
+                        uploaded_file, formato, tamanho_mb,
+                        colunas=colunas_leitura,
+                        filtros=filtros_leitura,
+                        aba=aba_leitura,
+                        limite_streaming_mb=DATA_CONFIG['streaming_threshold_mb'],
+                        tamanho_bloco=DATA_CONFIG['chunk_size'],
+                        tamanho_amostra=DATA_CONFIG['explorer_sample_size'],
+                        ao_progredir=lambda r: progresso.info(f"📦 {r.total_registros:,} registros lidos...")
+                    )
+                    progresso.empty()
+                    
+                    # Compactação de tipos antes da checagem de orçamento de memória
+                    df, relatorio = compactar_dataframe(df)
+                    
+                    valido, mensagem = validate_dataframe(df)
+                    if not valido:
+                        raise ValueError(mensagem)
+                    
+                    dataset_cache.guardar(chave_upload, df, {'resumo': resumo, 'relatorio': relatorio})
+                    origem = "carregado com sucesso"
             
             st.session_state.df = df
+            st.session_state.resumo_ingestao = resumo
+            st.session_state.relatorio_compactacao = relatorio
+            st.session_state.chave_dataset = chave_upload
             st.session_state.data_loaded = True
             st.session_state.charts_generated = False
             
-            st.success(f"✅ Arquivo '{uploaded_file.name}' carregado com sucesso!")
-            st.info(f"📊 {len(df)} registros e {len(df.columns)} colunas carregados")
+            st.success(f"✅ Arquivo '{uploaded_file.name}' {origem}!")
+            if resumo is not None:
+                st.info(f"📊 {resumo.total_registros:,} registros lidos em {resumo.total_blocos} blocos; "
+                        f"{len(df):,} mantidos em memória para exploração")
+            else:
+                st.info(f"📊 {len(df)} registros e {len(df.columns)} colunas carregados")
             time.sleep(1)
             st.rerun()
             
-    except Exception as e:
-        st.error(f"❌ Erro ao carregar arquivo: {str(e)}")
-        st.info("💡 Dica: Verifique se o arquivo não está corrompido e está no formato correto")
+        except Exception as e:
+            st.error(f"❌ Erro ao carregar arquivo: {str(e)}")
+            st.info("💡 Dica: Verifique se o arquivo não está corrompido e está no formato correto")
 
 # Interface principal ULTRA MELHORADA
 if st.session_state.data_loaded and st.session_state.df is not None:
     df = st.session_state.df
+    resumo = st.session_state.resumo_ingestao
+    cubo = get_cubo()
+    n_registros = cubo.n_registros
     
-    # Tabs com ícones melhorados
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    # Navegação por seções: só a seção ativa é executada a cada interação
+    # (st.tabs executaria o corpo de todas as abas em todo rerun)
+    SECOES = [
         "📊 Dashboard Executivo", 
         "📈 Visualizações Avançadas", 
         "🤖 IA Insights Pro", 
         "🔍 Explorador de Dados",
         "📥 Centro de Exportação"
-    ])
+    ]
+    secao_ativa = st.radio("Seção", SECOES, horizontal=True, key='secao_ativa', label_visibility='collapsed')
     
-    with tab1:
+    if secao_ativa == SECOES[0]:
         st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
         st.markdown("## 📊 Dashboard Executivo")
         
@@ -915,7 +876,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-label">📋 Total de Registros</div>
-                <div class="metric-number">{len(df):,}</div>
+                <div class="metric-number">{n_registros:,}</div>
             </div>
             """, unsafe_allow_html=True)
         
@@ -929,7 +890,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
         
         with col3:
             if 'vendas' in df.columns:
-                total_vendas = df['vendas'].sum()
+                total_vendas = cubo.total('vendas')
                 st.markdown(f"""
                 <div class="metric-card">
                     <div class="metric-label">💰 Vendas Totais</div>
@@ -939,7 +900,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
         
         with col4:
             if 'lucro' in df.columns:
-                total_lucro = df['lucro'].sum()
+                total_lucro = cubo.total('lucro')
                 st.markdown(f"""
                 <div class="metric-card">
                     <div class="metric-label">📈 Lucro Total</div>
@@ -954,24 +915,24 @@ if st.session_state.data_loaded and st.session_state.df is not None:
         
         with col1:
             if 'margem' in df.columns:
-                margem_media = df['margem'].mean()
+                margem_media = cubo.media('margem')
                 st.metric("📊 Margem Média", f"{margem_media:.1f}%", 
                          delta=f"{margem_media-30:.1f}%" if margem_media > 30 else None)
         
         with col2:
             if 'satisfacao' in df.columns:
-                satisfacao_media = df['satisfacao'].mean()
+                satisfacao_media = cubo.media('satisfacao')
                 st.metric("⭐ Satisfação Média", f"{satisfacao_media:.1f}/5",
                          delta=f"{satisfacao_media-4:.1f}" if satisfacao_media > 4 else None)
         
         with col3:
             if 'ticket_medio' in df.columns:
-                ticket_medio = df['ticket_medio'].mean()
+                ticket_medio = cubo.media('ticket_medio')
                 st.metric("🎫 Ticket Médio", f"R$ {ticket_medio:,.0f}")
         
         with col4:
             if 'roi' in df.columns:
-                roi_medio = df['roi'].mean()
+                roi_medio = cubo.media('roi')
                 st.metric("📈 ROI Médio", f"{roi_medio:.1f}%")
         
         st.markdown("---")
@@ -983,25 +944,28 @@ if st.session_state.data_loaded and st.session_state.df is not None:
             st.markdown("### 📈 Estatísticas Numéricas")
             numeric_cols = df.select_dtypes(include=[np.number]).columns
             if len(numeric_cols) > 0:
-                stats_df = df[numeric_cols].describe().round(2)
-                st.dataframe(stats_df, use_container_width=True)
+                stats_df, nota_erro = dataset_statistics(df, numeric_cols)
+                st.dataframe(stats_df.round(2), use_container_width=True)
+                if nota_erro:
+                    st.caption(f"ℹ️ {nota_erro}")
             else:
                 st.info("ℹ️ Nenhuma coluna numérica encontrada")
         
         with col2:
             st.markdown("### 🔍 Qualidade dos Dados")
             
-            missing_values = df.isnull().sum().sum()
-            duplicates = df.duplicated().sum()
-            memory_usage = df.memory_usage(deep=True).sum() / 1024**2
+            perfil = get_perfil(df)
+            missing_values = perfil.ausentes
+            duplicates = perfil.duplicadas
+            memory_usage = perfil.memoria_mb
             
             quality_data = {
                 'Métrica': ['Valores Ausentes', 'Linhas Duplicadas', 'Tamanho (MB)', 'Completude (%)'],
                 'Valor': [
                     missing_values,
-                    duplicates,
+                    f"~{duplicates:,}" if perfil.duplicadas_aproximadas else duplicates,
                     f"{memory_usage:.2f}",
-                    f"{((len(df) * len(df.columns) - missing_values) / (len(df) * len(df.columns)) * 100):.1f}"
+                    f"{perfil.completude:.1f}"
                 ],
                 'Status': [
                     '✅' if missing_values == 0 else '⚠️',
@@ -1020,99 +984,91 @@ if st.session_state.data_loaded and st.session_state.df is not None:
         insight_col1, insight_col2, insight_col3 = st.columns(3)
         
         with insight_col1:
-            if 'regiao' in df.columns and 'vendas' in df.columns:
-                top_regiao = df.groupby('regiao')['vendas'].sum().idxmax()
-                top_regiao_valor = df.groupby('regiao')['vendas'].sum().max()
-                st.info(f"🏆 **Região Líder**: {top_regiao}\n\nVendas: R$ {top_regiao_valor:,.0f}")
+            if cubo.possui('regiao') and 'vendas' in cubo.medidas:
+                top_regiao, top_regiao_valor = cubo.top('regiao', 'vendas')
+                if top_regiao is not None:
+                    st.info(f"🏆 **Região Líder**: {top_regiao}\n\nVendas: R$ {top_regiao_valor:,.0f}")
         
         with insight_col2:
-            if 'produto' in df.columns and 'vendas' in df.columns:
-                top_produto = df.groupby('produto')['vendas'].sum().idxmax()
-                top_produto_valor = df.groupby('produto')['vendas'].sum().max()
-                st.success(f"🥇 **Produto Top**: {top_produto}\n\nVendas: R$ {top_produto_valor:,.0f}")
+            if cubo.possui('produto') and 'vendas' in cubo.medidas:
+                top_produto, top_produto_valor = cubo.top('produto', 'vendas')
+                if top_produto is not None:
+                    st.success(f"🥇 **Produto Top**: {top_produto}\n\nVendas: R$ {top_produto_valor:,.0f}")
         
         with insight_col3:
-            if 'vendedor' in df.columns and 'vendas' in df.columns:
-                top_vendedor = df.groupby('vendedor')['vendas'].sum().idxmax()
-                top_vendedor_valor = df.groupby('vendedor')['vendas'].sum().max()
-                st.warning(f"⭐ **Vendedor Destaque**: {top_vendedor}\n\nVendas: R$ {top_vendedor_valor:,.0f}")
+            if cubo.possui('vendedor') and 'vendas' in cubo.medidas:
+                top_vendedor, top_vendedor_valor = cubo.top('vendedor', 'vendas')
+                if top_vendedor is not None:
+                    st.warning(f"⭐ **Vendedor Destaque**: {top_vendedor}\n\nVendas: R$ {top_vendedor_valor:,.0f}")
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab2:
+    elif secao_ativa == SECOES[1]:
         st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
         st.markdown("## 📈 Visualizações Avançadas")
         
         # Botão para gerar gráficos
         if not st.session_state.charts_generated:
             if st.button("🎨 Gerar Visualizações Avançadas", type="primary", use_container_width=True):
-                charts = create_advanced_charts(df)
+                charts, tempos, falhas = create_advanced_charts(df, cubo)
+                # Só os ids: as figuras ficam no cache compartilhado
                 st.session_state.charts = charts
+                st.session_state.charts_tempos = tempos
+                st.session_state.charts_falhas = falhas
                 st.session_state.charts_generated = True
                 st.rerun()
         else:
-            charts = st.session_state.get('charts', {})
+            charts = st.session_state.get('charts', [])
+            for grafico, erro in st.session_state.get('charts_falhas', {}).items():
+                st.warning(f"⚠️ Gráfico '{grafico}' não pôde ser criado: {erro}")
         
         if st.session_state.charts_generated and charts:
             st.success(f"🎉 {len(charts)} visualizações criadas com sucesso!")
+            tempos = st.session_state.get('charts_tempos', {})
+            if tempos:
+                mais_lento = max(tempos, key=tempos.get)
+                st.caption(f"⏱️ Construção: {sum(tempos.values()):.2f}s somando todos os gráficos; "
+                           f"mais lento: {mais_lento} ({tempos[mais_lento]:.2f}s)")
             
             # Organizar gráficos em grid responsivo
-            chart_keys = list(charts.keys())
-            
             # Primeira linha - 2 gráficos
-            if len(chart_keys) >= 2:
+            if len(charts) >= 2:
                 col1, col2 = st.columns(2)
                 with col1:
                     if 'vendas_regiao' in charts:
-                        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                        st.plotly_chart(charts['vendas_regiao'], use_container_width=True)
-                        st.markdown('</div>', unsafe_allow_html=True)
+                        show_chart(df, cubo, 'vendas_regiao')
                 
                 with col2:
                     if 'distribuicao_categoria' in charts:
-                        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                        st.plotly_chart(charts['distribuicao_categoria'], use_container_width=True)
-                        st.markdown('</div>', unsafe_allow_html=True)
+                        show_chart(df, cubo, 'distribuicao_categoria')
             
             # Segunda linha - 1 gráfico grande
             if 'tendencia_temporal' in charts:
-                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.plotly_chart(charts['tendencia_temporal'], use_container_width=True)
-                st.markdown('</div>', unsafe_allow_html=True)
+                show_chart(df, cubo, 'tendencia_temporal')
             
             # Terceira linha - 2 gráficos
             col1, col2 = st.columns(2)
             with col1:
                 if 'vendas_satisfacao' in charts:
-                    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    st.plotly_chart(charts['vendas_satisfacao'], use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
+                    show_chart(df, cubo, 'vendas_satisfacao')
             
             with col2:
                 if 'distribuicao_vendas' in charts:
-                    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    st.plotly_chart(charts['distribuicao_vendas'], use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
+                    show_chart(df, cubo, 'distribuicao_vendas')
             
             # Quarta linha - 2 gráficos
             col1, col2 = st.columns(2)
             with col1:
                 if 'vendas_produto' in charts:
-                    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    st.plotly_chart(charts['vendas_produto'], use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
+                    show_chart(df, cubo, 'vendas_produto')
             
             with col2:
                 if 'correlacao' in charts:
-                    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    st.plotly_chart(charts['correlacao'], use_container_width=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
+                    show_chart(df, cubo, 'correlacao')
             
             # Quinta linha - 1 gráfico
             if 'top_vendedores' in charts:
-                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.plotly_chart(charts['top_vendedores'], use_container_width=True)
-                st.markdown('</div>', unsafe_allow_html=True)
+                show_chart(df, cubo, 'top_vendedores')
             
             # Botão para regenerar
             if st.button("🔄 Regenerar Visualizações", use_container_width=True):
@@ -1161,7 +1117,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab3:
+    elif secao_ativa == SECOES[2]:
         st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
         st.markdown("## 🤖 IA Insights Pro")
         
@@ -1170,25 +1126,38 @@ if st.session_state.data_loaded and st.session_state.df is not None:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                if st.button("🚀 Análise Completa", type="primary", use_container_width=True):
-                    with st.spinner("🤖 Analisando dados com Gemini AI..."):
-                        analysis = analyze_with_gemini(df)
-                        st.session_state.ai_analysis = analysis
+                run_complete = st.button("🚀 Análise Completa", type="primary", use_container_width=True)
             
             with col2:
                 if st.button("🔄 Testar Conexão IA", use_container_width=True):
                     with st.spinner("🧪 Testando conexão..."):
-                        test_result = analyze_with_gemini(df, "Responda apenas: 'IA funcionando perfeitamente!'")
+                        # O teste de conexão sempre vai à API
+                        test_result = analyze_with_gemini(df, "Responda apenas: 'IA funcionando perfeitamente!'", usar_cache=False)
                         if "funcionando" in test_result.lower():
                             st.success("✅ IA conectada e funcionando!")
                         else:
                             st.error("❌ Problema na conexão com IA")
             
             with col3:
-                if st.button("⚡ Insights Rápidos", use_container_width=True):
-                    with st.spinner("⚡ Gerando insights rápidos..."):
-                        quick_analysis = analyze_with_gemini(df, "Dê 3 insights rápidos e práticos sobre estes dados")
-                        st.session_state.quick_insights = quick_analysis
+                run_quick = st.button("⚡ Insights Rápidos", use_container_width=True)
+            
+            # Texto parcial aparece aqui enquanto o Gemini gera a resposta
+            streaming_area = st.empty()
+            if run_complete:
+                with st.spinner("🤖 Analisando dados com Gemini AI..."):
+                    run_gemini_analysis(df, 'ai_analysis', area=streaming_area)
+            if run_quick:
+                with st.spinner("⚡ Gerando insights rápidos..."):
+                    run_gemini_analysis(df, 'quick_insights', PERGUNTA_INSIGHTS_RAPIDOS, area=streaming_area)
+            
+            # Todas as análises de uma vez, em paralelo (respeitando o limite de taxa da API)
+            if st.button("🧠 Gerar Todas as Análises em Paralelo", use_container_width=True,
+                         help="Análise completa, insights rápidos e todas as perguntas sugeridas"):
+                run_all_gemini_analyses(df)
+            
+            # Pré-cálculo das sugestões em segundo plano para o consultor responder do cache
+            if IA_EXECUTOR_CONFIG['precompute_suggestions']:
+                precompute_gemini_suggestions(df)
             
             st.markdown("---")
             
@@ -1196,18 +1165,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
             st.markdown("### 💬 Consultor IA Personalizado")
             
             # Sugestões de perguntas melhoradas
-            suggestions = [
-                "Quais são as 3 principais oportunidades de crescimento?",
-                "Como posso aumentar a margem de lucro em 20%?",
-                "Que produtos devo focar para maximizar vendas?",
-                "Quais regiões têm maior potencial inexplorado?",
-                "Como melhorar a satisfação do cliente?",
-                "Que estratégias de pricing recomendam?",
-                "Quais vendedores precisam de treinamento?",
-                "Como otimizar o mix de produtos?",
-                "Que tendências sazonais identificam?",
-                "Como reduzir custos operacionais?"
-            ]
+            suggestions = SUGESTOES_PERGUNTAS
             
             col1, col2 = st.columns([3, 1])
             
@@ -1232,8 +1190,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
             
             if st.button("🤖 Consultar IA Especialista", use_container_width=True) and custom_question:
                 with st.spinner("🤖 Processando consulta especializada..."):
-                    custom_analysis = analyze_with_gemini(df, custom_question)
-                    st.session_state.custom_analysis = custom_analysis
+                    run_gemini_analysis(df, 'custom_analysis', custom_question, area=st.empty())
                     st.session_state.last_question = custom_question
             
             st.markdown("---")
@@ -1248,6 +1205,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
                 """, unsafe_allow_html=True)
                 
                 st.markdown(st.session_state.ai_analysis)
+                show_gemini_metrics('ai_analysis')
                 
                 # Botão para nova análise
                 if st.button("🔄 Nova Análise Completa"):
@@ -1263,6 +1221,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
                 """, unsafe_allow_html=True)
                 
                 st.markdown(st.session_state.quick_insights)
+                show_gemini_metrics('quick_insights')
             
             if 'custom_analysis' in st.session_state:
                 st.markdown(f"""
@@ -1273,6 +1232,7 @@ if st.session_state.data_loaded and st.session_state.df is not None:
                 """, unsafe_allow_html=True)
                 
                 st.markdown(st.session_state.custom_analysis)
+                show_gemini_metrics('custom_analysis')
                 
                 # Botão para nova pergunta
                 if st.button("❓ Fazer Nova Pergunta"):
@@ -1280,6 +1240,18 @@ if st.session_state.data_loaded and st.session_state.df is not None:
                     if 'last_question' in st.session_state:
                         del st.session_state.last_question
                     st.rerun()
+            
+            if st.session_state.get('suggestion_answers'):
+                st.markdown("""
+                <div class="insight-box">
+                    <h3>📚 Respostas às Perguntas Sugeridas</h3>
+                    <p>Geradas em paralelo pelo Gemini AI</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                for pergunta, resposta in st.session_state.suggestion_answers.items():
+                    with st.expander(f"💡 {pergunta}"):
+                        st.markdown(resposta)
         
         else:
             st.markdown("""
@@ -1303,50 +1275,56 @@ GEMINI_API_KEY = "sua_chave_aqui"
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab4:
+    elif secao_ativa == SECOES[3]:
         st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
         st.markdown("## 🔍 Explorador de Dados Avançado")
         
+        if resumo is not None and resumo.amostrado:
+            st.info(f"ℹ️ Explorando uma amostra de {len(df):,} de {n_registros:,} registros")
+        
         # Filtros avançados
         st.markdown("### 🎛️ Filtros Inteligentes")
         
         filter_col1, filter_col2, filter_col3 = st.columns(3)
+        motor = get_motor_filtros(df)
         
         with filter_col1:
             # Filtro categórico
-            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+            selected_col = 'Todas'
             if categorical_cols:
                 selected_col = st.selectbox("📊 Filtrar por coluna:", ['Todas'] + categorical_cols)
                 if selected_col != 'Todas':
-                    unique_values = df[selected_col].unique()
+                    unique_values = list(df[selected_col].unique())
                     selected_values = st.multiselect(
                         f"🎯 Valores de {selected_col}:", 
                         unique_values, 
                         default=unique_values[:5] if len(unique_values) > 5 else unique_values
                     )
-                    df_filtered = df[df[selected_col].isin(selected_values)] if selected_values else df
-                else:
-                    df_filtered = df
-            else:
-                df_filtered = df
-        
-    with filter_col2:
-        # Filtro numérico
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        if numeric_cols:
-            numeric_col = st.selectbox("🔢 Filtro numérico:", ['Nenhum'] + numeric_cols)
-            if numeric_col != 'Nenhum':
-                min_val = float(df[numeric_col].min())
-                max_val = float(df[numeric_col].max())
-                range_vals = st.slider(
-                    f"📏 Range de {numeric_col}:",
-                    min_val, max_val, (min_val, max_val),
-                    help=f"Valores entre {min_val:,.0f} e {max_val:,.0f}"
-                )
-                df_filtered = df_filtered[
-                    (df_filtered[numeric_col] >= range_vals[0]) & 
-                    (df_filtered[numeric_col] <= range_vals[1])
-                ]
+                    motor.definir_categorias(selected_col, selected_values if selected_values else None)
+            if selected_col == 'Todas':
+                motor.definir_categorias(None, None)
+        
+        with filter_col2:
+            # Filtro numérico
+            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            numeric_col = 'Nenhum'
+            if numeric_cols:
+                numeric_col = st.selectbox("🔢 Filtro numérico:", ['Nenhum'] + numeric_cols)
+                if numeric_col != 'Nenhum':
+                    min_val = float(df[numeric_col].min())
+                    max_val = float(df[numeric_col].max())
+                    range_vals = st.slider(
+                        f"📏 Range de {numeric_col}:",
+                        min_val, max_val, (min_val, max_val),
+                        help=f"Valores entre {min_val:,.0f} e {max_val:,.0f}"
+                    )
+                    motor.definir_faixa(numeric_col, *range_vals)
+            if numeric_col == 'Nenhum':
+                motor.definir_faixa(None)
+        
+        # Agregados vêm do motor; o DataFrame filtrado só é materializado para tabela e gráficos
+        df_filtered = motor.filtrar()
         
         with filter_col3:
             # Configurações de exibição
@@ -1355,26 +1333,26 @@ GEMINI_API_KEY = "sua_chave_aqui"
             show_charts = st.checkbox("📈 Gráficos rápidos", False)
         
         # Estatísticas dos dados filtrados
-        if show_stats and len(df_filtered) > 0:
+        if show_stats and motor.n_registros > 0:
             st.markdown("### 📊 Estatísticas dos Dados Filtrados")
             
             stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
             
             with stat_col1:
-                st.metric("📋 Registros Filtrados", f"{len(df_filtered):,}")
+                st.metric("📋 Registros Filtrados", f"{motor.n_registros:,}")
             
             with stat_col2:
-                if 'vendas' in df_filtered.columns:
-                    total_vendas_filtered = df_filtered['vendas'].sum()
+                if 'vendas' in motor.medidas:
+                    total_vendas_filtered = motor.soma('vendas')
                     st.metric("💰 Vendas Filtradas", f"R$ {total_vendas_filtered/1000:.0f}K")
             
             with stat_col3:
-                if 'lucro' in df_filtered.columns:
-                    total_lucro_filtered = df_filtered['lucro'].sum()
+                if 'lucro' in motor.medidas:
+                    total_lucro_filtered = motor.soma('lucro')
                     st.metric("📈 Lucro Filtrado", f"R$ {total_lucro_filtered/1000:.0f}K")
             
             with stat_col4:
-                filtro_pct = (len(df_filtered) / len(df)) * 100
+                filtro_pct = (motor.n_registros / len(df)) * 100
                 st.metric("🎯 % dos Dados", f"{filtro_pct:.1f}%")
         
         # Gráficos rápidos dos dados filtrados
@@ -1395,8 +1373,11 @@ GEMINI_API_KEY = "sua_chave_aqui"
                     st.plotly_chart(fig_quick, use_container_width=True)
             
             with chart_col2:
-                if 'regiao' in df_filtered.columns and 'vendas' in df_filtered.columns:
-                    vendas_regiao_filtered = df_filtered.groupby('regiao')['vendas'].sum().reset_index()
+                if 'regiao' in df_filtered.columns and 'vendas' in motor.medidas:
+                    if not motor.ativo and resumo is None:
+                        vendas_regiao_filtered = cubo.agregar('regiao', 'vendas').reset_index()
+                    else:
+                        vendas_regiao_filtered = motor.agregar('regiao', 'vendas').reset_index()
                     fig_quick2 = px.bar(
                         vendas_regiao_filtered,
                         x='regiao',
@@ -1421,15 +1402,15 @@ GEMINI_API_KEY = "sua_chave_aqui"
             )
         
         with search_col2:
-            st.markdown("<br>", unsafe_allow_html=True)
             case_sensitive = st.checkbox("🔤 Case Sensitive")
+            prefix_only = st.checkbox("⏩ Início do valor", help="Busca apenas valores que começam com o termo")
         
-        # Aplicar busca se houver termo
+        # Aplicar busca se houver termo (índice invertido combinado com os filtros acima)
         if search_term:
-            mask = df_filtered.astype(str).apply(
-                lambda x: x.str.contains(search_term, case=case_sensitive, na=False)
-            ).any(axis=1)
-            df_display = df_filtered[mask]
+            encontrados = get_indice_busca(df).buscar(search_term, case_sensitive, prefix_only)
+            if motor.ativo:
+                encontrados = np.intersect1d(encontrados, motor.posicoes(), assume_unique=True)
+            df_display = df.iloc[encontrados]
             st.info(f"🔍 Encontrados {len(df_display)} registros com '{search_term}'")
         else:
             df_display = df_filtered
@@ -1458,12 +1439,13 @@ GEMINI_API_KEY = "sua_chave_aqui"
                 st.markdown("**📊 Resumo Estatístico:**")
                 numeric_cols_display = df_display.select_dtypes(include=[np.number]).columns
                 if len(numeric_cols_display) > 0:
-                    summary_stats = df_display[numeric_cols_display].describe().round(2)
-                    st.dataframe(summary_stats.T[['mean', 'std', 'min', 'max']], use_container_width=True)
+                    # Só momentos e extremos: sem os quartis que o describe() ordenaria à toa
+                    summary_stats = df_display[numeric_cols_display].agg(['mean', 'std', 'min', 'max']).T
+                    st.dataframe(summary_stats.round(2), use_container_width=True)
             
             with analysis_col2:
                 st.markdown("**📋 Informações Categóricas:**")
-                categorical_cols_display = df_display.select_dtypes(include=['object']).columns
+                categorical_cols_display = df_display.select_dtypes(include=['object', 'category']).columns
                 if len(categorical_cols_display) > 0:
                     for col in categorical_cols_display[:3]:  # Mostrar apenas 3 primeiras
                         unique_count = df_display[col].nunique()
@@ -1472,7 +1454,7 @@ GEMINI_API_KEY = "sua_chave_aqui"
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab5:
+    elif secao_ativa == SECOES[4]:
         st.markdown('<div class="fade-in-up">', unsafe_allow_html=True)
         st.markdown("## 📥 Centro de Exportação")
         
@@ -1485,142 +1467,131 @@ GEMINI_API_KEY = "sua_chave_aqui"
             # Preparar dados para download
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
-            # Seletor de dados para exportar
+            # Seletor de dados para exportar; na ingestão em blocos só a amostra está em memória
+            amostrado = resumo is not None and resumo.amostrado
+            opcao_dados = "Amostra carregada" if amostrado else "Todos os dados"
             export_option = st.radio(
                 "📋 Dados para exportar:",
-                ["Todos os dados", "Dados filtrados", "Apenas dados numéricos", "Resumo estatístico"]
+                [opcao_dados, "Dados filtrados", "Apenas dados numéricos", "Resumo estatístico"]
             )
+            if amostrado and export_option != "Resumo estatístico":
+                st.warning(f"⚠️ Arquivo lido em blocos: a exportação contém a amostra de {len(df):,} "
+                           f"de {n_registros:,} registros")
             
-            if export_option == "Todos os dados":
+            if export_option == opcao_dados:
                 export_df = df
-            elif export_option == "Dados filtrados" and 'df_filtered' in locals():
-                export_df = df_filtered
+            elif export_option == "Dados filtrados":
+                # Mesmos filtros definidos no Explorador (o motor fica na sessão)
+                export_df = get_motor_filtros(df).filtrar()
             elif export_option == "Apenas dados numéricos":
                 numeric_cols = df.select_dtypes(include=[np.number]).columns
                 export_df = df[numeric_cols]
             else:  # Resumo estatístico
                 numeric_cols = df.select_dtypes(include=[np.number]).columns
-                export_df = df[numeric_cols].describe()
+                export_df, _ = dataset_statistics(df, numeric_cols)
             
             st.info(f"📊 Preparando {len(export_df)} registros para exportação")
             
+            # Configurações de exportação (valem para os arquivos gerados abaixo)
+            with st.expander("⚙️ Configurações de Exportação", expanded=False):
+                include_index = st.checkbox("📋 Incluir índice nos arquivos")
+                date_format = st.selectbox("📅 Formato de data:", list(FORMATOS_DATA))
+                decimal_separator = st.selectbox("🔢 Separador decimal:", ["Ponto (.)", "Vírgula (,)"])
+                compressao = st.selectbox(
+                    "🗜️ Compressão (CSV/JSON):",
+                    compressoes_disponiveis(),
+                    format_func=lambda c: c or "Nenhuma",
+                    help="Arquivos comprimidos ocupam de 3 a 5x menos para baixar"
+                )
+                st.caption("Com vírgula decimal, o CSV usa ';' como separador; JSON mantém o ponto")
+            
+            opcoes_exportacao = {
+                'compressao': compressao,
+                # O resumo estatístico perde o nome das linhas sem o índice
+                'incluir_indice': include_index or export_option == "Resumo estatístico",
+                'formato_data': FORMATOS_DATA[date_format],
+                'decimal': ',' if decimal_separator == "Vírgula (,)" else '.'
+            }
+            motor_export = get_motor_filtros(df) if export_option == "Dados filtrados" else None
+            assinatura_export = (
+                st.session_state.chave_dataset, id(df), export_option, tuple(opcoes_exportacao.items()),
+                None if motor_export is None else (
+                    motor_export.coluna_categoria, str(sorted(map(str, motor_export.categorias or []))),
+                    motor_export.coluna_faixa, motor_export.faixa
+                )
+            )
+            
             # Botões de download melhorados
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                csv_data = export_df.to_csv(index=False)
-                st.download_button(
-                    label="📄 Download CSV",
-                    data=csv_data,
-                    file_name=f"datainsight_dados_{timestamp}.csv",
-                    mime="text/csv",
-                    use_container_width=True,
-                    help="Formato universal, compatível com Excel e outras ferramentas"
+                export_file_button(
+                    export_df, 'csv', opcoes_exportacao, assinatura_export,
+                    f"datainsight_dados_{timestamp}", "📄", "text/csv",
+                    "Formato universal, compatível com Excel e outras ferramentas"
                 )
             
             with col2:
-                # Excel com múltiplas abas
-                from io import BytesIO
-                buffer = BytesIO()
-                with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                    export_df.to_excel(writer, sheet_name='Dados', index=False)
-                    
-                    # Adicionar aba com estatísticas se houver dados numéricos
+                # Excel com múltiplas abas, gravado em modo de memória constante
+                def excel_extras():
                     numeric_cols = export_df.select_dtypes(include=[np.number]).columns
-                    if len(numeric_cols) > 0:
-                        export_df[numeric_cols].describe().to_excel(writer, sheet_name='Estatísticas')
-                    
-                    # Adicionar aba com análise da IA se existir
-                    if 'ai_analysis' in st.session_state:
-                        analysis_df = pd.DataFrame({
-                            'Análise_IA': [st.session_state.ai_analysis]
-                        })
-                        analysis_df.to_excel(writer, sheet_name='Análise_IA', index=False)
+                    return {
+                        'estatisticas': export_df[numeric_cols].describe() if len(numeric_cols) > 0 else None,
+                        'analise_ia': st.session_state.get('ai_analysis')
+                    }
                 
-                st.download_button(
-                    label="📊 Download Excel",
-                    data=buffer.getvalue(),
-                    file_name=f"datainsight_relatorio_{timestamp}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True,
-                    help="Relatório completo com múltiplas abas"
+                export_file_button(
+                    export_df, 'xlsx', opcoes_exportacao,
+                    assinatura_export + (st.session_state.get('ai_analysis'),),
+                    f"datainsight_relatorio_{timestamp}", "📊",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    "Relatório completo com múltiplas abas (dados divididos no limite de linhas do Excel)",
+                    extras=excel_extras
                 )
             
             with col3:
-                json_data = export_df.to_json(orient='records', indent=2)
-                st.download_button(
-                    label="📋 Download JSON",
-                    data=json_data,
-                    file_name=f"datainsight_dados_{timestamp}.json",
-                    mime="application/json",
-                    use_container_width=True,
-                    help="Formato para APIs e desenvolvimento"
+                export_file_button(
+                    export_df, 'json', opcoes_exportacao, assinatura_export,
+                    f"datainsight_dados_{timestamp}", "📋", "application/json",
+                    "Formato para APIs e desenvolvimento"
                 )
+            
+            # Formatos colunares (recarregam muito mais rápido que CSV)
+            col4, col5 = st.columns(2)
+            
+            with col4:
+                try:
+                    export_file_button(
+                        export_df, 'parquet', opcoes_exportacao, assinatura_export,
+                        f"datainsight_dados_{timestamp}", "🧱", "application/vnd.apache.parquet",
+                        "Formato colunar comprimido, ideal para recarregar datasets grandes"
+                    )
+                except ImportError as e:
+                    st.warning(f"⚠️ {str(e)}")
+            
+            with col5:
+                try:
+                    export_file_button(
+                        export_df, 'feather', opcoes_exportacao, assinatura_export,
+                        f"datainsight_dados_{timestamp}", "🪶", "application/vnd.apache.arrow.file",
+                        "Arrow IPC: leitura quase instantânea com pandas/pyarrow"
+                    )
+                except ImportError as e:
+                    st.warning(f"⚠️ {str(e)}")
         
         with export_col2:
             st.markdown("### 📈 Relatórios Especializados")
             
             # Relatório executivo
             if st.button("📊 Gerar Relatório Executivo", use_container_width=True):
-                executive_report = f"""
-RELATÓRIO EXECUTIVO - DATAINSIGHT AI PRO
-========================================
-Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
-Dataset: {len(df)} registros, {len(df.columns)} colunas
-
-RESUMO EXECUTIVO:
-================
-• Total de Registros: {len(df):,}
-• Total de Colunas: {len(df.columns)}
-"""
-                
-                if 'vendas' in df.columns:
-                    total_vendas = df['vendas'].sum()
-                    executive_report += f"• Vendas Totais: R$ {total_vendas:,.2f}\n"
-                
-                if 'lucro' in df.columns:
-                    total_lucro = df['lucro'].sum()
-                    margem_total = (total_lucro / total_vendas * 100) if 'vendas' in df.columns else 0
-                    executive_report += f"• Lucro Total: R$ {total_lucro:,.2f}\n"
-                    executive_report += f"• Margem Total: {margem_total:.1f}%\n"
-                
-                if 'satisfacao' in df.columns:
-                    satisfacao_media = df['satisfacao'].mean()
-                    executive_report += f"• Satisfação Média: {satisfacao_media:.1f}/5\n"
-                
-                executive_report += f"""
-
-TOP PERFORMERS:
-==============
-"""
-                
-                if 'regiao' in df.columns and 'vendas' in df.columns:
-                    top_regiao = df.groupby('regiao')['vendas'].sum().idxmax()
-                    top_regiao_valor = df.groupby('regiao')['vendas'].sum().max()
-                    executive_report += f"• Região Líder: {top_regiao} (R$ {top_regiao_valor:,.0f})\n"
-                
-                if 'produto' in df.columns and 'vendas' in df.columns:
-                    top_produto = df.groupby('produto')['vendas'].sum().idxmax()
-                    top_produto_valor = df.groupby('produto')['vendas'].sum().max()
-                    executive_report += f"• Produto Top: {top_produto} (R$ {top_produto_valor:,.0f})\n"
-                
-                if 'ai_analysis' in st.session_state:
-                    executive_report += f"""
-
-ANÁLISE DA IA:
-=============
-{st.session_state.ai_analysis}
-"""
-                
-                executive_report += f"""
-
-ESTATÍSTICAS DETALHADAS:
-=======================
-{df.describe().to_string()}
-
----
-Relatório gerado automaticamente pelo DataInsight AI Pro
-"""
+                estatisticas, nota_erro = dataset_statistics(df, df.select_dtypes(include=[np.number]).columns)
+                executive_report = gerar_relatorio_executivo(
+                    cubo,
+                    n_colunas=len(df.columns),
+                    estatisticas=estatisticas,
+                    analise_ia=st.session_state.get('ai_analysis'),
+                    nota_estatisticas=nota_erro
+                )
                 
                 st.download_button(
                     label="📄 Download Relatório Executivo",
@@ -1632,50 +1603,10 @@ Relatório gerado automaticamente pelo DataInsight AI Pro
             
             # Relatório técnico
             if st.button("🔧 Gerar Relatório Técnico", use_container_width=True):
-                technical_report = f"""
-RELATÓRIO TÉCNICO - DATAINSIGHT AI PRO
-======================================
-Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
-
-INFORMAÇÕES DO DATASET:
-======================
-• Nome: Dataset de Análise
-• Registros: {len(df):,}
-• Colunas: {len(df.columns)}
-• Tamanho em Memória: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB
-• Tipos de Dados: {dict(df.dtypes.value_counts())}
-
-QUALIDADE DOS DADOS:
-===================
-• Valores Ausentes: {df.isnull().sum().sum()}
-• Linhas Duplicadas: {df.duplicated().sum()}
-• Completude: {((len(df) * len(df.columns) - df.isnull().sum().sum()) / (len(df) * len(df.columns)) * 100):.1f}%
-
-ANÁLISE POR COLUNA:
-==================
-"""
-                
-                for col in df.columns:
-                    technical_report += f"\n{col}:\n"
-                    technical_report += f"  - Tipo: {df[col].dtype}\n"
-                    technical_report += f"  - Valores únicos: {df[col].nunique()}\n"
-                    technical_report += f"  - Valores ausentes: {df[col].isnull().sum()}\n"
-                    
-                    if df[col].dtype in ['int64', 'float64']:
-                        technical_report += f"  - Mín: {df[col].min()}\n"
-                        technical_report += f"  - Máx: {df[col].max()}\n"
-                        technical_report += f"  - Média: {df[col].mean():.2f}\n"
-                        technical_report += f"  - Desvio Padrão: {df[col].std():.2f}\n"
-                
-                technical_report += f"""
-
-CORRELAÇÕES (COLUNAS NUMÉRICAS):
-===============================
-{df.select_dtypes(include=[np.number]).corr().to_string()}
-
----
-Relatório técnico gerado pelo DataInsight AI Pro
-"""
+                technical_report = gerar_relatorio_tecnico(
+                    df, cubo, perfil=get_perfil(df),
+                    esbocos=get_esbocos(df) if use_sketch_stats() else None
+                )
                 
                 st.download_button(
                     label="🔧 Download Relatório Técnico",
@@ -1684,15 +1615,6 @@ Relatório técnico gerado pelo DataInsight AI Pro
                     mime="text/plain",
                     use_container_width=True
                 )
-            
-            # Configurações de exportação
-            st.markdown("### ⚙️ Configurações de Exportação")
-            
-            include_index = st.checkbox("📋 Incluir índice nos arquivos")
-            date_format = st.selectbox("📅 Formato de data:", ["ISO (YYYY-MM-DD)", "BR (DD/MM/YYYY)", "US (MM/DD/YYYY)"])
-            decimal_separator = st.selectbox("🔢 Separador decimal:", ["Ponto (.)", "Vírgula (,)"])
-            
-            st.info("⚙️ Configurações aplicadas aos próximos downloads")
         
         # Estatísticas de exportação
         st.markdown("---")
@@ -1701,7 +1623,7 @@ Relatório técnico gerado pelo DataInsight AI Pro
         summary_col1, summary_col2, summary_col3, summary_col4 = st.columns(4)
         
         with summary_col1:
-            st.metric("📋 Total de Registros", f"{len(df):,}")
+            st.metric("📋 Total de Registros", f"{n_registros:,}")
         
         with summary_col2:
             st.metric("📊 Total de Colunas", len(df.columns))
@@ -1711,7 +1633,7 @@ Relatório técnico gerado pelo DataInsight AI Pro
             st.metric("🔢 Colunas Numéricas", numeric_count)
         
         with summary_col4:
-            categorical_count = len(df.select_dtypes(include=['object']).columns)
+            categorical_count = len(df.select_dtypes(include=['object', 'category']).columns)
             st.metric("📝 Colunas Categóricas", categorical_count)
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -1824,7 +1746,11 @@ else:
     with action_col2:
         if st.button("🎲 Começar com Dados de Exemplo", type="primary", use_container_width=True):
             with st.spinner("🔄 Gerando dataset avançado..."):
-                st.session_state.df = generate_sample_data()
+                df, relatorio = compactar_dataframe(generate_sample_data())
+                st.session_state.df = df
+                st.session_state.resumo_ingestao = None
+                st.session_state.relatorio_compactacao = relatorio
+                st.session_state.chave_dataset = 'exemplo-300'
                 st.session_state.data_loaded = True
                 st.session_state.charts_generated = False
                 st.success("✅ Dataset carregado! Explore as funcionalidades.")
@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import time
 import warnings
+from gerador_dados import gerar_dados_vendas
+from graficos_paralelos import executar_graficos
+from graficos_estatisticas import histograma
 warnings.filterwarnings('ignore')
 
 # Tentar importar bibliotecas de gráficos (com fallbacks)
@@ -14,6 +17,8 @@ try:
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
+    from graficos_lod import figura_densidade, modo_dispersao
+    from graficos_avancados import grafico_distribuicao_vendas
     PLOTLY_AVAILABLE = True
     print("✅ Plotly carregado com sucesso")
 except ImportError:
@@ -158,114 +163,208 @@ if 'charts_generated' not in st.session_state:
 @st.cache_data
 def generate_advanced_sample_data():
     """Gera dados de exemplo mais realistas e complexos"""
-    np.random.seed(42)
-    n_records = 500
-    
-    # Dados mais realistas
-    vendedores = [
-        'João Silva', 'Maria Santos', 'Pedro Costa', 'Ana Lima', 'Carlos Rocha',
-        'Lucia Ferreira', 'Roberto Alves', 'Fernanda Dias', 'Marcos Oliveira',
-        'Patricia Souza', 'Ricardo Mendes', 'Juliana Castro', 'Gabriel Torres',
-        'Camila Ribeiro', 'Diego Martins', 'Beatriz Gomes', 'Leonardo Pereira',
-        'Isabela Cardoso', 'Thiago Barbosa', 'Natalia Ramos'
-    ]
-    
-    produtos = [
-        'iPhone 15 Pro Max', 'MacBook Pro M3', 'iPad Air', 'Apple Watch Ultra 2',
-        'Samsung Galaxy S24 Ultra', 'Dell XPS 15', 'Surface Pro 10', 'PlayStation 5',
-        'Xbox Series X', 'Nintendo Switch OLED', 'AirPods Pro 2', 'Sony WH-1000XM5',
-        'Canon EOS R6 Mark II', 'GoPro Hero 12', 'Tesla Model 3', 'Drone DJI Air 3',
-        'Monitor LG 4K', 'Teclado Mecânico', 'Mouse Gamer', 'Webcam 4K'
-    ]
-    
-    regioes = ['Norte', 'Sul', 'Leste', 'Oeste', 'Centro', 'Nordeste']
-    meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-    categorias = ['Eletrônicos', 'Informática', 'Games', 'Acessórios', 'Automotivo', 'Casa']
-    canais = ['Online', 'Loja Física', 'Marketplace', 'App Mobile', 'Telefone', 'WhatsApp']
-    
-    data = []
-    for i in range(n_records):
-        categoria = np.random.choice(categorias)
-        
-        # Vendas baseadas na categoria com distribuição mais realista
-        if categoria == 'Eletrônicos':
-            vendas_base = np.random.lognormal(10.5, 0.8)  # Distribuição log-normal
-        elif categoria == 'Informática':
-            vendas_base = np.random.lognormal(10.2, 0.7)
-        elif categoria == 'Games':
-            vendas_base = np.random.lognormal(9.8, 0.6)
-        elif categoria == 'Automotivo':
-            vendas_base = np.random.lognormal(11.2, 1.0)
-        elif categoria == 'Casa':
-            vendas_base = np.random.lognormal(9.5, 0.5)
-        else:  # Acessórios
-            vendas_base = np.random.lognormal(8.8, 0.4)
-        
-        vendas = max(1000, int(vendas_base))
-        custo = int(vendas * np.random.uniform(0.30, 0.70))
-        lucro = vendas - custo
-        margem = (lucro / vendas) * 100
-        
-        # Satisfação correlacionada com margem e categoria
-        if margem > 50:
-            satisfacao = np.random.choice([4, 5], p=[0.2, 0.8])
-        elif margem > 35:
-            satisfacao = np.random.choice([3, 4, 5], p=[0.1, 0.3, 0.6])
-        elif margem > 20:
-            satisfacao = np.random.choice([2, 3, 4], p=[0.2, 0.5, 0.3])
-        else:
-            satisfacao = np.random.choice([1, 2, 3], p=[0.4, 0.4, 0.2])
-        
-        # Quantidade baseada no preço
-        if vendas > 80000:
-            quantidade = np.random.randint(1, 3)
-        elif vendas > 30000:
-            quantidade = np.random.randint(1, 8)
-        elif vendas > 10000:
-            quantidade = np.random.randint(1, 20)
-        else:
-            quantidade = np.random.randint(1, 100)
-        
-        # Adicionar sazonalidade
-        mes = np.random.choice(meses)
-        if mes in ['Nov', 'Dez']:  # Black Friday e Natal
-            vendas = int(vendas * np.random.uniform(1.2, 1.8))
-        elif mes in ['Jan', 'Fev']:  # Início do ano
-            vendas = int(vendas * np.random.uniform(0.7, 0.9))
-        
-        data.append({
-            'id': i + 1,
-            'vendas': vendas,
-            'custo': custo,
-            'lucro': lucro,
-            'margem': round(margem, 2),
-            'regiao': np.random.choice(regioes),
-            'produto': np.random.choice(produtos),
-            'categoria': categoria,
-            'mes': mes,
-            'vendedor': np.random.choice(vendedores),
-            'canal': np.random.choice(canais),
-            'satisfacao': satisfacao,
-            'quantidade': quantidade,
-            'desconto': round(np.random.uniform(0, 0.40), 3),
-            'tempo_entrega': np.random.randint(1, 30),
-            'avaliacao': round(np.random.uniform(1, 5), 1),
-            'idade_cliente': np.random.randint(18, 75),
-            'genero': np.random.choice(['M', 'F'], p=[0.52, 0.48]),
-            'cidade': np.random.choice(['São Paulo', 'Rio de Janeiro', 'Belo Horizonte', 'Salvador', 'Brasília', 'Fortaleza', 'Manaus', 'Curitiba', 'Recife', 'Porto Alegre']),
-            'forma_pagamento': np.random.choice(['Cartão Crédito', 'Cartão Débito', 'PIX', 'Boleto', 'Dinheiro'], p=[0.4, 0.2, 0.25, 0.1, 0.05])
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Adicionar colunas calculadas
-    df['ticket_medio'] = df['vendas'] / df['quantidade']
-    df['roi'] = (df['lucro'] / df['custo']) * 100
-    df['score_cliente'] = (df['satisfacao'] * 0.4 + df['avaliacao'] * 0.6).round(1)
-    df['vendas_por_dia'] = df['vendas'] / df['tempo_entrega']
-    df['eficiencia'] = (df['vendas'] / (df['tempo_entrega'] + 1)).round(2)
-    
-    return df
+    return gerar_dados_vendas(n_registros=500, perfil='robusto', seed=42)
+
+# Figuras Plotly montadas fora do Streamlit (executadas em paralelo)
+def agregados_graficos(df):
+    """Agregações usadas pelos gráficos (None quando faltam colunas)"""
+    agregados = dict.fromkeys(['vendas_regiao', 'categoria_vendas', 'vendas_mes', 'top_produtos'])
+    if 'vendas' in df.columns and 'regiao' in df.columns:
+        agregados['vendas_regiao'] = df.groupby('regiao', observed=True).agg({
+            'vendas': 'sum',
+            'lucro': 'sum',
+            'quantidade': 'sum'
+        }).reset_index()
+    if 'categoria' in df.columns and 'vendas' in df.columns:
+        agregados['categoria_vendas'] = df.groupby('categoria', observed=True)['vendas'].sum().reset_index()
+    if 'vendas' in df.columns and 'mes' in df.columns:
+        meses_ordem = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+        vendas_mes = df.groupby('mes', observed=True).agg({
+            'vendas': 'sum',
+            'lucro': 'sum',
+            'quantidade': 'sum'
+        }).reindex(meses_ordem, fill_value=0).reset_index()
+        vendas_mes.columns = ['mes', 'vendas', 'lucro', 'quantidade']
+        agregados['vendas_mes'] = vendas_mes
+    if 'produto' in df.columns and 'vendas' in df.columns:
+        agregados['top_produtos'] = df.groupby('produto', observed=True)['vendas'].sum().nlargest(10).reset_index()
+    return agregados
+
+def plotly_vendas_regiao(vendas_regiao):
+    """Barras de vendas por região (Plotly)"""
+    fig1 = px.bar(
+        vendas_regiao,
+        x='regiao',
+        y='vendas',
+        color='lucro',
+        title='📊 Vendas e Lucro por Região',
+        text='vendas',
+        color_continuous_scale='Viridis',
+        hover_data=['lucro', 'quantidade']
+    )
+
+    fig1.update_traces(
+        texttemplate='R$ %{text:,.0f}',
+        textposition='outside'
+    )
+
+    fig1.update_layout(
+        height=500,
+        title_x=0.5,
+        title_font_size=20,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+
+    return fig1
+
+def plotly_categoria_vendas(categoria_vendas):
+    """Rosca de vendas por categoria (Plotly)"""
+    fig2 = px.pie(
+        categoria_vendas,
+        values='vendas',
+        names='categoria',
+        title='🥧 Distribuição de Vendas por Categoria',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        hole=0.4
+    )
+
+    fig2.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>Vendas: R$ %{value:,.0f}<br>Percentual: %{percent}<extra></extra>'
+    )
+
+    fig2.update_layout(
+        height=500,
+        title_x=0.5,
+        title_font_size=20,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+
+    return fig2
+
+def plotly_vendas_mes(vendas_mes):
+    """Vendas e lucro por mês (Plotly)"""
+    fig3 = go.Figure()
+
+    fig3.add_trace(go.Scatter(
+        x=vendas_mes['mes'],
+        y=vendas_mes['vendas'],
+        mode='lines+markers',
+        name='Vendas',
+        line=dict(color='#667eea', width=4),
+        marker=dict(size=10, symbol='circle'),
+        hovertemplate='<b>Vendas</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
+    ))
+
+    fig3.add_trace(go.Scatter(
+        x=vendas_mes['mes'],
+        y=vendas_mes['lucro'],
+        mode='lines+markers',
+        name='Lucro',
+        line=dict(color='#f093fb', width=4),
+        marker=dict(size=10, symbol='diamond'),
+        yaxis='y2',
+        hovertemplate='<b>Lucro</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
+    ))
+
+    fig3.update_layout(
+        title='📈 Tendência de Vendas e Lucro por Mês',
+        xaxis_title='Mês',
+        yaxis_title='Vendas (R$)',
+        yaxis2=dict(title='Lucro (R$)', overlaying='y', side='right'),
+        height=500,
+        title_x=0.5,
+        title_font_size=20,
+        hovermode='x unified',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        legend=dict(x=0.02, y=0.98)
+    )
+
+    return fig3
+
+def plotly_vendas_satisfacao(df):
+    """Dispersão vendas × satisfação (Plotly; WebGL ou densidade em datasets grandes)"""
+    modo = modo_dispersao(len(df))
+    if modo == 'densidade':
+        fig4 = figura_densidade(df['satisfacao'], df['vendas'], '💫 Relação: Vendas × Satisfação',
+                                'Satisfação (1-5)', 'Vendas (R$)')
+        fig4.update_layout(height=500, title_x=0.5, title_font_size=20,
+                           plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+        return fig4
+
+    fig4 = px.scatter(
+        df,
+        x='satisfacao',
+        y='vendas',
+        color='regiao',
+        size='lucro',
+        title='💫 Relação: Vendas × Satisfação × Região',
+        hover_data=['produto', 'categoria', 'margem'],
+        color_discrete_sequence=px.colors.qualitative.Bold,
+        size_max=30,
+        render_mode='webgl' if modo == 'webgl' else 'svg'
+    )
+
+    fig4.update_traces(
+        marker=dict(line=dict(width=1, color='white'))
+    )
+
+    fig4.update_layout(
+        height=500,
+        title_x=0.5,
+        title_font_size=20,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(title='Satisfação (1-5)'),
+        yaxis=dict(title='Vendas (R$)')
+    )
+
+    return fig4
+
+def plotly_distribuicao_vendas(df):
+    """Histograma de vendas com bins e quartis calculados no servidor (Plotly)"""
+    return grafico_distribuicao_vendas(df, None, nbins=25)
+
+def plotly_top_produtos(top_produtos):
+    """Top 10 produtos (Plotly)"""
+    fig6 = px.bar(
+        top_produtos,
+        y='produto',
+        x='vendas',
+        orientation='h',
+        title='🏆 Top 10 Produtos por Vendas',
+        color='vendas',
+        color_continuous_scale='Viridis'
+    )
+
+    fig6.update_layout(
+        height=500,
+        title_x=0.5,
+        title_font_size=20,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        yaxis=dict(title='Produto'),
+        xaxis=dict(title='Vendas (R$)')
+    )
+
+    return fig6
+
+def tarefas_plotly(df, agregados):
+    """Uma tarefa independente por figura Plotly aplicável ao dataset"""
+    tarefas = {}
+    for nome, construir in [('vendas_regiao', plotly_vendas_regiao), ('categoria_vendas', plotly_categoria_vendas),
+                            ('vendas_mes', plotly_vendas_mes), ('top_produtos', plotly_top_produtos)]:
+        if agregados[nome] is not None:
+            tarefas[nome] = lambda c=construir, dados=agregados[nome]: c(dados)
+    if 'vendas' in df.columns and 'satisfacao' in df.columns:
+        tarefas['vendas_satisfacao'] = lambda: plotly_vendas_satisfacao(df)
+    if 'vendas' in df.columns:
+        tarefas['distribuicao_vendas'] = lambda: plotly_distribuicao_vendas(df)
+    return tarefas
 
 # Função ROBUSTA para criar gráficos com múltiplos fallbacks
 def create_robust_charts(df):
@@ -278,45 +377,38 @@ def create_robust_charts(df):
     status_text = st.empty()
     
     try:
+        # Figuras Plotly construídas em paralelo; a exibição (e os fallbacks
+        # em Matplotlib, que não é thread-safe) seguem na ordem abaixo
+        agregados = agregados_graficos(df)
+        figuras_plotly, tempos = {}, {}
+        if PLOTLY_AVAILABLE:
+            def ao_concluir(nome, resultado, segundos, concluidas, total):
+                progress_bar.progress(concluidas / total * 0.5)
+                status_text.text(f"⚙️ {nome} pronto em {segundos:.2f}s ({concluidas}/{total})")
+            
+            figuras_plotly, tempos = executar_graficos(
+                tarefas_plotly(df, agregados), ao_concluir=ao_concluir
+            )
+        
+        # Exibição sequencial: a barra continua de 0,5 a 1,0, uma etapa por gráfico
+        def avancar(etapa, etapas=6):
+            progress_bar.progress(0.5 + 0.5 * etapa / etapas)
+        
         # 1. Gráfico de Barras - Vendas por Região
         status_text.text("📊 Criando gráfico de vendas por região...")
-        progress_bar.progress(10)
+        avancar(0)
         
         if 'vendas' in df.columns and 'regiao' in df.columns:
-            vendas_regiao = df.groupby('regiao').agg({
-                'vendas': 'sum',
-                'lucro': 'sum',
-                'quantidade': 'sum'
-            }).reset_index()
+            vendas_regiao = agregados['vendas_regiao']
             
             chart_created = False
             
             # Tentar Plotly primeiro
             if PLOTLY_AVAILABLE and not chart_created:
                 try:
-                    fig1 = px.bar(
-                        vendas_regiao,
-                        x='regiao',
-                        y='vendas',
-                        color='lucro',
-                        title='📊 Vendas e Lucro por Região',
-                        text='vendas',
-                        color_continuous_scale='Viridis',
-                        hover_data=['lucro', 'quantidade']
-                    )
-                    
-                    fig1.update_traces(
-                        texttemplate='R$ %{text:,.0f}',
-                        textposition='outside'
-                    )
-                    
-                    fig1.update_layout(
-                        height=500,
-                        title_x=0.5,
-                        title_font_size=20,
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)'
-                    )
+                    fig1 = figuras_plotly['vendas_regiao']
+                    if isinstance(fig1, Exception):
+                        raise fig1
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                     st.plotly_chart(fig1, use_container_width=True)
@@ -373,41 +465,22 @@ def create_robust_charts(df):
                 except Exception as e:
                     st.error(f"❌ Todos os métodos falharam para gráfico 1: {str(e)}")
         
-        progress_bar.progress(25)
+        avancar(1)
         
         # 2. Gráfico de Pizza - Distribuição por Categoria
         status_text.text("🥧 Criando gráfico de distribuição por categoria...")
         
         if 'categoria' in df.columns and 'vendas' in df.columns:
-            categoria_vendas = df.groupby('categoria')['vendas'].sum().reset_index()
+            categoria_vendas = agregados['categoria_vendas']
             
             chart_created = False
             
             # Tentar Plotly primeiro
             if PLOTLY_AVAILABLE and not chart_created:
                 try:
-                    fig2 = px.pie(
-                        categoria_vendas,
-                        values='vendas',
-                        names='categoria',
-                        title='🥧 Distribuição de Vendas por Categoria',
-                        color_discrete_sequence=px.colors.qualitative.Set3,
-                        hole=0.4
-                    )
-                    
-                    fig2.update_traces(
-                        textposition='inside',
-                        textinfo='percent+label',
-                        hovertemplate='<b>%{label}</b><br>Vendas: R$ %{value:,.0f}<br>Percentual: %{percent}<extra></extra>'
-                    )
-                    
-                    fig2.update_layout(
-                        height=500,
-                        title_x=0.5,
-                        title_font_size=20,
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)'
-                    )
+                    fig2 = figuras_plotly['categoria_vendas']
+                    if isinstance(fig2, Exception):
+                        raise fig2
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                     st.plotly_chart(fig2, use_container_width=True)
@@ -448,62 +521,22 @@ def create_robust_charts(df):
             if not chart_created:
                 st.error("❌ Não foi possível criar gráfico de pizza")
         
-        progress_bar.progress(40)
+        avancar(2)
         
         # 3. Gráfico de Linha - Tendência Temporal
         status_text.text("📈 Criando gráfico de tendência temporal...")
         
         if 'vendas' in df.columns and 'mes' in df.columns:
-            meses_ordem = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
-            
-            vendas_mes = df.groupby('mes').agg({
-                'vendas': 'sum',
-                'lucro': 'sum',
-                'quantidade': 'sum'
-            }).reindex(meses_ordem, fill_value=0).reset_index()
-            vendas_mes.columns = ['mes', 'vendas', 'lucro', 'quantidade']
+            vendas_mes = agregados['vendas_mes']
             
             chart_created = False
             
             # Tentar Plotly primeiro
             if PLOTLY_AVAILABLE and not chart_created:
                 try:
-                    fig3 = go.Figure()
-                    
-                    fig3.add_trace(go.Scatter(
-                        x=vendas_mes['mes'],
-                        y=vendas_mes['vendas'],
-                        mode='lines+markers',
-                        name='Vendas',
-                        line=dict(color='#667eea', width=4),
-                        marker=dict(size=10, symbol='circle'),
-                        hovertemplate='<b>Vendas</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
-                    ))
-                    
-                    fig3.add_trace(go.Scatter(
-                        x=vendas_mes['mes'],
-                        y=vendas_mes['lucro'],
-                        mode='lines+markers',
-                        name='Lucro',
-                        line=dict(color='#f093fb', width=4),
-                        marker=dict(size=10, symbol='diamond'),
-                        yaxis='y2',
-                        hovertemplate='<b>Lucro</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
-                    ))
-                    
-                    fig3.update_layout(
-                        title='📈 Tendência de Vendas e Lucro por Mês',
-                        xaxis_title='Mês',
-                        yaxis_title='Vendas (R$)',
-                        yaxis2=dict(title='Lucro (R$)', overlaying='y', side='right'),
-                        height=500,
-                        title_x=0.5,
-                        title_font_size=20,
-                        hovermode='x unified',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        legend=dict(x=0.02, y=0.98)
-                    )
+                    fig3 = figuras_plotly['vendas_mes']
+                    if isinstance(fig3, Exception):
+                        raise fig3
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                     st.plotly_chart(fig3, use_container_width=True)
@@ -569,7 +602,7 @@ def create_robust_charts(df):
                 except Exception as e:
                     st.error(f"❌ Todos os métodos falharam para gráfico 3: {str(e)}")
         
-        progress_bar.progress(55)
+        avancar(3)
         
         # 4. Scatter Plot - Vendas vs Satisfação
         status_text.text("💫 Criando scatter plot...")
@@ -580,31 +613,9 @@ def create_robust_charts(df):
             # Tentar Plotly primeiro
             if PLOTLY_AVAILABLE and not chart_created:
                 try:
-                    fig4 = px.scatter(
-                        df,
-                        x='satisfacao',
-                        y='vendas',
-                        color='regiao',
-                        size='lucro',
-                        title='💫 Relação: Vendas × Satisfação × Região',
-                        hover_data=['produto', 'categoria', 'margem'],
-                        color_discrete_sequence=px.colors.qualitative.Bold,
-                        size_max=30
-                    )
-                    
-                    fig4.update_traces(
-                        marker=dict(line=dict(width=1, color='white'))
-                    )
-                    
-                    fig4.update_layout(
-                        height=500,
-                        title_x=0.5,
-                        title_font_size=20,
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        xaxis=dict(title='Satisfação (1-5)'),
-                        yaxis=dict(title='Vendas (R$)')
-                    )
+                    fig4 = figuras_plotly['vendas_satisfacao']
+                    if isinstance(fig4, Exception):
+                        raise fig4
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                     st.plotly_chart(fig4, use_container_width=True)
@@ -652,7 +663,7 @@ def create_robust_charts(df):
             if not chart_created:
                 st.error("❌ Não foi possível criar scatter plot")
         
-        progress_bar.progress(70)
+        avancar(4)
         
         # 5. Histograma - Distribuição de Vendas
         status_text.text("📊 Criando histograma...")
@@ -663,28 +674,9 @@ def create_robust_charts(df):
             # Tentar Plotly primeiro
             if PLOTLY_AVAILABLE and not chart_created:
                 try:
-                    fig5 = px.histogram(
-                        df,
-                        x='vendas',
-                        nbins=25,
-                        title='📊 Distribuição de Vendas',
-                        color_discrete_sequence=['#4facfe'],
-                        marginal='box'
-                    )
-                    
-                    fig5.update_traces(
-                        marker=dict(line=dict(width=1, color='white'))
-                    )
-                    
-                    fig5.update_layout(
-                        height=500,
-                        title_x=0.5,
-                        title_font_size=20,
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        xaxis=dict(title='Vendas (R$)'),
-                        yaxis=dict(title='Frequência')
-                    )
+                    fig5 = figuras_plotly['distribuicao_vendas']
+                    if isinstance(fig5, Exception):
+                        raise fig5
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                     st.plotly_chart(fig5, use_container_width=True)
@@ -702,7 +694,10 @@ def create_robust_charts(df):
                 try:
                     fig, ax = plt.subplots(figsize=(12, 6))
                     
-                    n, bins, patches = ax.hist(df['vendas'], bins=25, color='#4facfe', alpha=0.7, edgecolor='white')
+                    # Mesmos bins do gráfico Plotly, calculados uma vez com NumPy
+                    bordas, contagens = histograma(df['vendas'], 25)
+                    ax.bar(bordas[:-1], contagens, width=np.diff(bordas), align='edge',
+                           color='#4facfe', alpha=0.7, edgecolor='white')
                     
                     ax.set_xlabel('Vendas (R$)', fontsize=12)
                     ax.set_ylabel('Frequência', fontsize=12)
@@ -724,38 +719,22 @@ def create_robust_charts(df):
             if not chart_created:
                 st.error("❌ Não foi possível criar histograma")
         
-        progress_bar.progress(85)
+        avancar(5)
         
         # 6. Top Produtos
         status_text.text("🏆 Criando ranking de produtos...")
         
         if 'produto' in df.columns and 'vendas' in df.columns:
-            top_produtos = df.groupby('produto')['vendas'].sum().nlargest(10).reset_index()
+            top_produtos = agregados['top_produtos']
             
             chart_created = False
             
             # Tentar Plotly primeiro
             if PLOTLY_AVAILABLE and not chart_created:
                 try:
-                    fig6 = px.bar(
-                        top_produtos,
-                        y='produto',
-                        x='vendas',
-                        orientation='h',
-                        title='🏆 Top 10 Produtos por Vendas',
-                        color='vendas',
-                        color_continuous_scale='Viridis'
-                    )
-                    
-                    fig6.update_layout(
-                        height=500,
-                        title_x=0.5,
-                        title_font_size=20,
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        yaxis=dict(title='Produto'),
-                        xaxis=dict(title='Vendas (R$)')
-                    )
+                    fig6 = figuras_plotly['top_produtos']
+                    if isinstance(fig6, Exception):
+                        raise fig6
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
                     st.plotly_chart(fig6, use_container_width=True)
@@ -804,7 +783,7 @@ def create_robust_charts(df):
             if not chart_created:
                 st.error("❌ Não foi possível criar ranking de produtos")
         
-        progress_bar.progress(100)
+        avancar(6)
         status_text.text("✅ Gráficos concluídos!")
         
         time.sleep(1)
@@ -820,6 +799,8 @@ def create_robust_charts(df):
                 <p>Sistema robusto funcionando perfeitamente.</p>
             </div>
             """, unsafe_allow_html=True)
+            if tempos:
+                st.caption("⏱️ " + " · ".join(f"{nome}: {segundos:.2f}s" for nome, segundos in tempos.items()))
         else:
             st.markdown("""
             <div class="error-alert">
@@ -0,0 +1,151 @@
+"""
+Índice invertido para a Busca Textual Global do DataInsight AI
+Cada coluna é reduzida aos seus valores distintos (como texto); os trigramas
+desses valores (com dois caracteres nulos de preenchimento no fim, para que
+termos de 1 ou 2 caracteres também sejam prefixo de algum trigrama) formam
+listas de postagem ordenadas, construídas com numpy.
+Uma busca intersecta as listas dos trigramas do termo, confirma os
+candidatos e converte os valores encontrados em posições de linha.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Valores mais longos que isso não entram no índice e são conferidos diretamente
+TAMANHO_MAXIMO_INDEXADO = 128
+
+
+def _chaves_trigramas(codigos):
+    """Codifica trigramas (3 pontos de código < 2**21) em um único int64"""
+    return (codigos[..., :-2].astype('int64') << 42) | (codigos[..., 1:-1].astype('int64') << 21) | codigos[..., 2:]
+
+
+def _trigramas_do_termo(termo):
+    codigos = np.array([ord(c) for c in termo], dtype='int64')
+    return np.unique(_chaves_trigramas(codigos))
+
+
+def _faixa_de_chaves(termo):
+    """Intervalo de chaves dos trigramas que começam com um termo de 1 ou 2 caracteres"""
+    codigos = [ord(c) for c in termo]
+    if len(codigos) == 1:
+        return codigos[0] << 42, (codigos[0] + 1) << 42
+    base = codigos[0] << 42
+    return base | (codigos[1] << 21), base | ((codigos[1] + 1) << 21)
+
+
+class IndiceTextual:
+    """Índice de trigramas sobre os valores distintos de cada coluna"""
+
+    def __init__(self, df, tamanho_cache=32):
+        self.n_registros = len(df)
+        self.colunas = list(df.columns)
+        self._codigos = []
+        textos = []
+        self._inicio_coluna = [0]
+        for col in self.colunas:
+            codigos, distintos = pd.factorize(df[col], use_na_sentinel=False)
+            self._codigos.append(codigos)
+            textos.append(pd.Series(distintos, dtype=object).astype(str).to_numpy(dtype=object))
+            self._inicio_coluna.append(self._inicio_coluna[-1] + len(distintos))
+
+        # Vocabulário global: valores distintos de todas as colunas, original e minúsculo
+        self._vocabulario = np.concatenate(textos) if textos else np.empty(0, dtype=object)
+        self._minusculo = pd.Series(self._vocabulario, dtype=object).str.lower().to_numpy(dtype=object)
+        self._coluna_do_valor = np.repeat(np.arange(len(self.colunas)), np.diff(self._inicio_coluna))
+        self._construir_postagens()
+        self._cache = OrderedDict()
+        self._tamanho_cache = tamanho_cache
+
+    def _construir_postagens(self):
+        """Listas de postagem (trigrama -> ids de valores) em formato CSR"""
+        tamanhos = np.fromiter((len(t) for t in self._minusculo), dtype='int64', count=len(self._minusculo))
+        indexaveis = tamanhos <= TAMANHO_MAXIMO_INDEXADO
+        self._longos = np.flatnonzero(tamanhos > TAMANHO_MAXIMO_INDEXADO)
+
+        ids = np.flatnonzero(indexaveis & (tamanhos > 0))
+        if len(ids) == 0:
+            self._chaves = np.empty(0, dtype='int64')
+            self._limites = np.zeros(1, dtype='int64')
+            self._ids = np.empty(0, dtype='int64')
+            return
+
+        largura = int(tamanhos[ids].max()) + 2
+        matriz = np.array(self._minusculo[ids].tolist(), dtype=f'U{largura}')
+        codigos = matriz.view('uint32').reshape(len(ids), largura)
+        chaves = _chaves_trigramas(codigos)
+        # Um trigrama por caractere; os que começam no preenchimento são descartados
+        validos = np.arange(largura - 2)[None, :] < tamanhos[ids][:, None]
+        linhas = np.broadcast_to(ids[:, None], chaves.shape)[validos]
+        chaves = chaves[validos]
+
+        # Ordenação estável: dentro de cada trigrama os ids continuam crescentes
+        ordem = np.argsort(chaves, kind='stable')
+        chaves, linhas = chaves[ordem], linhas[ordem]
+        novo = np.ones(len(chaves), dtype=bool)
+        novo[1:] = (chaves[1:] != chaves[:-1]) | (linhas[1:] != linhas[:-1])
+        chaves, linhas = chaves[novo], linhas[novo]
+
+        inicio = np.flatnonzero(np.r_[True, chaves[1:] != chaves[:-1]])
+        self._chaves = chaves[inicio]
+        self._limites = np.append(inicio, len(chaves))
+        self._ids = linhas
+
+    def _postagem(self, chave):
+        i = np.searchsorted(self._chaves, chave)
+        if i == len(self._chaves) or self._chaves[i] != chave:
+            return np.empty(0, dtype='int64')
+        return self._ids[self._limites[i]:self._limites[i + 1]]
+
+    def _candidatos(self, termo_minusculo):
+        """Ids de valores que podem conter o termo"""
+        if len(termo_minusculo) < 3:
+            # Termos curtos: união das postagens dos trigramas que começam com o termo
+            inicio, fim = np.searchsorted(self._chaves, _faixa_de_chaves(termo_minusculo))
+            candidatos = np.unique(self._ids[self._limites[inicio]:self._limites[fim]])
+            return np.concatenate([candidatos, self._longos])
+        trigramas = _trigramas_do_termo(termo_minusculo)
+        postagens = sorted((self._postagem(c) for c in trigramas), key=len)
+        candidatos = postagens[0]
+        for postagem in postagens[1:]:
+            if len(candidatos) == 0:
+                break
+            candidatos = np.intersect1d(candidatos, postagem, assume_unique=True)
+        return np.concatenate([candidatos, self._longos])
+
+    def valores_encontrados(self, termo, case_sensitive=False, prefixo=False):
+        """Ids dos valores distintos que contêm (ou começam com) o termo"""
+        candidatos = self._candidatos(termo.lower())
+        if len(termo) < 3 and not (case_sensitive or prefixo) and len(self._longos) == 0:
+            # Termo curto sem distinção de maiúsculas: a faixa de trigramas já é exata
+            return candidatos
+        textos = self._vocabulario if case_sensitive else self._minusculo
+        alvo = termo if case_sensitive else termo.lower()
+        if prefixo:
+            confere = [textos[i].startswith(alvo) for i in candidatos]
+        else:
+            confere = [alvo in textos[i] for i in candidatos]
+        return candidatos[np.array(confere, dtype=bool)] if len(candidatos) else candidatos
+
+    def buscar(self, termo, case_sensitive=False, prefixo=False):
+        """Posições (crescentes) das linhas com algum valor que contém o termo"""
+        chave = (termo, case_sensitive, prefixo)
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            return self._cache[chave]
+
+        encontrados = self.valores_encontrados(termo, case_sensitive, prefixo)
+        linhas = np.zeros(self.n_registros, dtype=bool)
+        for c in np.unique(self._coluna_do_valor[encontrados]):
+            inicio, fim = self._inicio_coluna[c], self._inicio_coluna[c + 1]
+            marcados = np.zeros(fim - inicio, dtype=bool)
+            marcados[encontrados[(encontrados >= inicio) & (encontrados < fim)] - inicio] = True
+            linhas |= marcados[self._codigos[c]]
+        posicoes = np.flatnonzero(linhas)
+
+        self._cache[chave] = posicoes
+        if len(self._cache) > self._tamanho_cache:
+            self._cache.popitem(last=False)
+        return posicoes
@@ -0,0 +1,132 @@
+"""
+Cache em disco de datasets processados, endereçado pelo hash do upload
+Guarda o DataFrame já lido e compactado em Feather (Arrow IPC) e devolve
+instantaneamente em novos uploads do mesmo arquivo com as mesmas opções.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import uuid
+
+import pandas as pd
+
+from formatos import PYARROW_AVAILABLE
+
+if PYARROW_AVAILABLE:
+    import pyarrow.feather as feather
+
+
+def hash_conteudo(conteudo):
+    """Hash do conteúdo do arquivo (a parte cara da chave: pode ser calculada uma vez por upload)"""
+    return hashlib.sha256(memoryview(conteudo)).hexdigest()
+
+
+def chave_opcoes(hash_arquivo, **opcoes):
+    """Chave do cache a partir do hash do conteúdo e das opções de leitura"""
+    h = hashlib.sha256(hash_arquivo.encode('ascii'))
+    h.update(json.dumps(opcoes, sort_keys=True, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def chave_conteudo(conteudo, **opcoes):
+    """Hash do conteúdo do arquivo combinado com as opções de leitura"""
+    return chave_opcoes(hash_conteudo(conteudo), **opcoes)
+
+
+class CacheDatasets:
+    """Cache LRU em disco, limitado pelo total de bytes"""
+
+    EXTENSAO_DADOS = '.feather' if PYARROW_AVAILABLE else '.pkl'
+    EXTENSAO_META = '.meta.pkl'
+
+    def __init__(self, diretorio, max_bytes):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, chave, extensao):
+        return os.path.join(self.diretorio, chave + extensao)
+
+    def __contains__(self, chave):
+        return os.path.exists(self._caminho(chave, self.EXTENSAO_DADOS))
+
+    def obter(self, chave):
+        """Devolve (df, metadados) ou None se a chave não está no cache"""
+        caminho_dados = self._caminho(chave, self.EXTENSAO_DADOS)
+        caminho_meta = self._caminho(chave, self.EXTENSAO_META)
+        try:
+            if PYARROW_AVAILABLE:
+                df = feather.read_feather(caminho_dados)
+            else:
+                df = pd.read_pickle(caminho_dados)
+            with open(caminho_meta, 'rb') as f:
+                metadados = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Entrada corrompida (pyarrow.ArrowInvalid é um ValueError): conta como ausente e sai do cache
+            self.remover(chave)
+            return None
+
+        # Marca como usado recentemente para a política LRU
+        os.utime(caminho_dados)
+        os.utime(caminho_meta)
+        return df, metadados
+
+    def guardar(self, chave, df, metadados=None):
+        """Grava o DataFrame e metadados de forma atômica e aplica a evicção"""
+        temporario = f".{uuid.uuid4().hex}.tmp"
+        caminho_tmp = os.path.join(self.diretorio, temporario)
+
+        df = df.reset_index(drop=True)
+        if PYARROW_AVAILABLE:
+            feather.write_feather(df, caminho_tmp, compression='lz4')
+        else:
+            df.to_pickle(caminho_tmp)
+        os.replace(caminho_tmp, self._caminho(chave, self.EXTENSAO_DADOS))
+
+        with open(caminho_tmp, 'wb') as f:
+            pickle.dump(metadados or {}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(caminho_tmp, self._caminho(chave, self.EXTENSAO_META))
+
+        self._evictar()
+
+    def _entradas(self):
+        """Lista (último_uso, bytes, chave) de cada entrada do cache"""
+        entradas = {}
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith('.'):
+                continue
+            chave = nome.split('.', 1)[0]
+            info = os.stat(os.path.join(self.diretorio, nome))
+            uso, tamanho = entradas.get(chave, (0, 0))
+            entradas[chave] = (max(uso, info.st_mtime), tamanho + info.st_size)
+        return sorted((uso, tamanho, chave) for chave, (uso, tamanho) in entradas.items())
+
+    def tamanho_total(self):
+        """Total de bytes ocupados pelo cache"""
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def _evictar(self):
+        """Remove as entradas menos usadas até caber em max_bytes"""
+        entradas = self._entradas()
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, chave in entradas:
+            if total <= self.max_bytes:
+                break
+            self.remover(chave)
+            total -= tamanho
+
+    def remover(self, chave):
+        for extensao in (self.EXTENSAO_DADOS, self.EXTENSAO_META):
+            try:
+                os.remove(self._caminho(chave, extensao))
+            except FileNotFoundError:
+                pass
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        for _, _, chave in self._entradas():
+            self.remover(chave)
@@ -0,0 +1,102 @@
+"""
+Cache persistente de respostas do Gemini para o DataInsight AI
+Guarda as respostas em SQLite, endereçadas pela impressão digital do
+dataset, pelo template do prompt, pela pergunta e pela configuração do
+modelo. Acertos não usam rede nem consomem cota da API.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+def impressao_dataframe(df):
+    """Impressão digital do conteúdo do DataFrame (valores, colunas e tipos)"""
+    h = hashlib.sha256()
+    h.update(json.dumps([(str(c), str(t)) for c, t in df.dtypes.items()]).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def chave_resposta(impressao, template, pergunta, config):
+    """Chave da resposta: dataset + template + pergunta + configuração do modelo"""
+    partes = json.dumps(
+        {'dataset': impressao, 'template': template, 'pergunta': pergunta or '', 'config': config},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(partes.encode('utf-8')).hexdigest()
+
+
+class CacheRespostas:
+    """Cache em SQLite com validade (TTL) e número máximo de entradas (LRU)"""
+
+    def __init__(self, caminho, ttl_segundos, max_entradas):
+        self.caminho = caminho
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS respostas ("
+                "chave TEXT PRIMARY KEY, resposta TEXT NOT NULL, "
+                "criado REAL NOT NULL, acessado REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _conectar(self):
+        """Conexão por operação (o Streamlit atende cada sessão em uma thread)"""
+        conexao = sqlite3.connect(self.caminho, timeout=10)
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    def obter(self, chave):
+        """Devolve a resposta guardada ou None se ausente/expirada"""
+        agora = time.time()
+        with self._conectar() as conexao:
+            linha = conexao.execute(
+                "SELECT resposta, criado FROM respostas WHERE chave = ?", (chave,)
+            ).fetchone()
+            if linha is None:
+                return None
+            if agora - linha[1] > self.ttl_segundos:
+                conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+                return None
+            conexao.execute("UPDATE respostas SET acessado = ? WHERE chave = ?", (agora, chave))
+        return linha[0]
+
+    def guardar(self, chave, resposta):
+        """Grava a resposta e remove expiradas e excedentes menos usadas"""
+        agora = time.time()
+        with self._conectar() as conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO respostas (chave, resposta, criado, acessado) VALUES (?, ?, ?, ?)",
+                (chave, resposta, agora, agora)
+            )
+            conexao.execute("DELETE FROM respostas WHERE criado < ?", (agora - self.ttl_segundos,))
+            conexao.execute(
+                "DELETE FROM respostas WHERE chave NOT IN "
+                "(SELECT chave FROM respostas ORDER BY acessado DESC LIMIT ?)",
+                (self.max_entradas,)
+            )
+
+    def __len__(self):
+        with self._conectar() as conexao:
+            return conexao.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+
+    def __contains__(self, chave):
+        return self.obter(chave) is not None
+
+    def limpar(self):
+        """Remove todas as respostas"""
+        with self._conectar() as conexao:
+            conexao.execute("DELETE FROM respostas")
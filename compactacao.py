@@ -0,0 +1,72 @@
+"""
+Compactação de tipos do DataFrame no carregamento
+Converte texto de baixa cardinalidade em category e reduz a largura dos
+tipos numéricos quando isso não altera nenhum valor.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def memoria_mb(df):
+    """Memória ocupada pelo DataFrame em MB (inclui strings)"""
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+def _compactar_texto(serie, limite_cardinalidade):
+    """Converte para category quando há poucos valores distintos"""
+    n_validos = serie.count()
+    if n_validos == 0:
+        return serie
+    if serie.nunique(dropna=True) / n_validos > limite_cardinalidade:
+        return serie
+    return serie.astype('category')
+
+
+def _compactar_inteiro(serie):
+    """Reduz para o menor inteiro com sinal que comporta os valores"""
+    return pd.to_numeric(serie, downcast='integer')
+
+
+def _compactar_float(serie):
+    """Usa float32 apenas se todos os valores sobrevivem à conversão sem perda"""
+    valores = serie.to_numpy()
+    reduzido = valores.astype(np.float32)
+    if np.array_equal(reduzido.astype(valores.dtype), valores, equal_nan=True):
+        return pd.Series(reduzido, index=serie.index, name=serie.name)
+    return serie
+
+
+def compactar_dataframe(df, limite_cardinalidade=0.5):
+    """Compacta os tipos das colunas e devolve (df_compactado, relatório)"""
+    antes_mb = memoria_mb(df)
+    colunas = {}
+    alteradas = {}
+
+    for col in df.columns:
+        serie = df[col]
+        if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+            nova = _compactar_texto(serie, limite_cardinalidade)
+        elif pd.api.types.is_bool_dtype(serie):
+            nova = serie
+        elif pd.api.types.is_integer_dtype(serie):
+            nova = _compactar_inteiro(serie)
+        elif pd.api.types.is_float_dtype(serie):
+            nova = _compactar_float(serie)
+        else:
+            nova = serie
+
+        colunas[col] = nova
+        if nova.dtype != serie.dtype:
+            alteradas[col] = (str(serie.dtype), str(nova.dtype))
+
+    compactado = pd.DataFrame(colunas, index=df.index)
+    depois_mb = memoria_mb(compactado)
+
+    relatorio = {
+        'antes_mb': antes_mb,
+        'depois_mb': depois_mb,
+        'reducao': antes_mb / depois_mb if depois_mb > 0 else 1.0,
+        'colunas': alteradas
+    }
+    return compactado, relatorio
@@ -19,7 +19,18 @@ GEMINI_CONFIG = {
     'temperature': 0.7,
     'top_p': 0.8,
     'top_k': 40,
-    'max_output_tokens': 1024
+    'max_output_tokens': 1024,
+    'prompt_token_budget': 1500,  # tamanho máximo do contexto estatístico do prompt
+    'api_endpoint': os.getenv('GEMINI_API_ENDPOINT')  # opcional: endpoint REST alternativo
+}
+
+# Execução concorrente das análises de IA
+IA_EXECUTOR_CONFIG = {
+    'max_concurrency': 4,  # requisições simultâneas ao Gemini
+    'requests_per_minute': 15,  # limite do token bucket
+    'max_retries': 4,  # tentativas em erro de cota (429)
+    'initial_backoff_s': 2.0,  # espera inicial, dobrada a cada tentativa
+    'precompute_suggestions': False  # pré-calcular as sugestões ao carregar um dataset
 }
 
 # Configurações de visualização
@@ -32,8 +43,23 @@ PLOT_CONFIG = {
 # Configurações de dados
 DATA_CONFIG = {
     'max_file_size': 200,  # MB
-    'supported_formats': ['csv', 'xlsx', 'json'],
-    'sample_size': 500
+    'supported_formats': ['csv', 'xlsx', 'json', 'jsonl', 'ndjson', 'parquet', 'feather', 'arrow'],
+    'sample_size': 500,
+    'chunk_size': 100_000,  # registros por bloco na ingestão em blocos
+    'streaming_threshold_mb': 50,  # arquivos acima disso são lidos em blocos
+    'explorer_sample_size': 100_000,  # registros mantidos em memória para o Explorador
+    'memory_budget_mb': 1024  # memória máxima para o DataFrame carregado
+}
+
+# Configurações de cache em disco
+CACHE_CONFIG = {
+    'dataset_dir': os.path.join('.datainsight_cache', 'datasets'),
+    'dataset_max_mb': 2048,  # total máximo em disco antes da evicção LRU
+    'ia_db': os.path.join('.datainsight_cache', 'respostas_ia.sqlite'),
+    'ia_ttl_horas': 24,  # validade das respostas do Gemini
+    'ia_max_entradas': 500,  # respostas guardadas antes da evicção LRU
+    'figuras_max_mb': 256,  # figuras Plotly serializadas mantidas em memória
+    'exportacao_max_horas': 6  # arquivos do Centro de Exportação apagados depois disso
 }
 
 def get_gemini_api_key():
@@ -45,7 +71,11 @@ def validate_dataframe(df):
     if df is None or df.empty:
         return False, "DataFrame vazio"
     
-    if len(df) > 100000:
-        return False, "Dataset muito grande (máximo 100.000 registros)"
+    memoria_mb = df.memory_usage(deep=True).sum() / 1024**2
+    if memoria_mb > DATA_CONFIG['memory_budget_mb']:
+        return False, (
+            f"Dataset ocupa {memoria_mb:,.0f} MB em memória "
+            f"(orçamento: {DATA_CONFIG['memory_budget_mb']:,} MB)"
+        )
     
     return True, "DataFrame válido"
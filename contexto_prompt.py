@@ -0,0 +1,224 @@
+"""
+Contexto estatístico dos prompts do DataInsight AI
+Resume qualquer dataset em seções compactas (visão geral, métricas com
+quantis, top-k por dimensão, correlações, anomalias e uma amostra
+estratificada) e as encaixa em um orçamento de tokens, na ordem de
+prioridade. Usa os agregados do cubo OLAP, as estatísticas e os esboços
+(quantis KLL) quando disponíveis, recorrendo ao DataFrame só no que faltar.
+"""
+
+import numpy as np
+import pandas as pd
+
+from correlacao import matriz_do_dataset
+
+# Aproximação usual para português/inglês: ~4 caracteres por token
+CARACTERES_POR_TOKEN = 4
+
+QUANTIS = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+
+def estimar_tokens(texto):
+    return (len(texto) + CARACTERES_POR_TOKEN - 1) // CARACTERES_POR_TOKEN
+
+
+def _fmt(valor):
+    """Número curto para o prompt (3.1B, 1.2M, 35.4K, 0.123)"""
+    if valor is None or pd.isna(valor):
+        return 'n/d'
+    valor = float(valor)
+    if abs(valor) >= 1e9:
+        return f"{valor / 1e9:.2f}B"
+    if abs(valor) >= 1e6:
+        return f"{valor / 1e6:.2f}M"
+    if abs(valor) >= 1e3:
+        return f"{valor / 1e3:.1f}K"
+    return f"{valor:.3g}"
+
+
+def _eh_identificador(serie):
+    """Colunas como 'id' (inteiros todos distintos) não informam nada ao modelo"""
+    return (serie.name == 'id' or
+            (pd.api.types.is_integer_dtype(serie) and len(serie) > 20 and serie.is_unique))
+
+
+def _colunas(df):
+    numericas = [c for c in df.select_dtypes(include=[np.number]).columns if not _eh_identificador(df[c])]
+    categoricas = [c for c in df.select_dtypes(include=['object', 'category', 'bool']).columns]
+    return numericas, categoricas
+
+
+def secao_visao_geral(df, n_registros, numericas, categoricas):
+    return [f"DATASET: {n_registros:,} registros × {len(df.columns)} colunas "
+            f"({len(numericas)} numéricas, {len(categoricas)} categóricas)"]
+
+
+def _com_esboco(numericas, esbocos):
+    return [c for c in numericas if esbocos is not None and c in esbocos.quantis]
+
+
+def secao_metricas(df, numericas, cubo=None, estatisticas=None, esbocos=None):
+    linhas = ["MÉTRICAS (soma | média | p5/p25/p50/p75/p95):"]
+    # Quantis dos esboços KLL; do df só para as colunas sem esboço
+    quantis = {c: esbocos.quantis[c].quantis(QUANTIS) for c in _com_esboco(numericas, esbocos)}
+    faltando = [c for c in numericas if c not in quantis]
+    if faltando:
+        quantis.update(df[faltando].quantile(QUANTIS).items())
+    for col in numericas:
+        if cubo is not None and col in cubo.medidas:
+            soma, media = cubo.total(col), cubo.media(col)
+        elif estatisticas is not None and col in estatisticas.columns:
+            media = estatisticas.loc['mean', col]
+            soma = media * estatisticas.loc['count', col]
+        else:
+            soma, media = df[col].sum(), df[col].mean()
+        faixa = '/'.join(_fmt(v) for v in quantis[col])
+        linhas.append(f"- {col}: {_fmt(soma)} | {_fmt(media)} | {faixa}")
+    return linhas
+
+
+def medida_principal(df, numericas, cubo=None):
+    """Medida usada para ranquear as dimensões (a de maior soma absoluta)"""
+    candidatas = [m for m in numericas if cubo is None or m in cubo.medidas]
+    if not candidatas:
+        return None
+    if cubo is not None:
+        return max(candidatas, key=lambda m: abs(cubo.total(m)))
+    return df[candidatas].abs().sum().idxmax()
+
+
+def secao_dimensoes(df, categoricas, medida=None, cubo=None, top_k=5):
+    criterio = f"participação em {medida}" if medida else "frequência"
+    linhas = [f"DIMENSÕES (top {top_k} por {criterio}):"]
+    for col in categoricas:
+        if medida is not None and cubo is not None and cubo.possui(col) and medida in cubo.medidas:
+            valores = cubo.agregar(col, medida)
+        elif medida is not None:
+            valores = df.groupby(col, observed=True)[medida].sum()
+        else:
+            valores = df[col].value_counts()
+        total = valores.sum()
+        if len(valores) == 0 or not total:
+            continue
+        maiores = valores.nlargest(top_k)
+        partes = ', '.join(f"{rotulo} {v / total:.0%}" for rotulo, v in maiores.items())
+        linhas.append(f"- {col} ({len(valores)} valores): {partes}")
+    return linhas
+
+
+def secao_correlacoes(df, numericas, cubo=None, n_pares=5, limiar=0.3):
+    if len(numericas) < 2:
+        return []
+    pares = matriz_do_dataset(df, cubo, numericas, spearman=False).pares_mais_fortes(numericas, n_pares, limiar)
+    if pares.empty:
+        return []
+    return ["CORRELAÇÕES MAIS FORTES:"] + [f"- {a} ~ {b}: {r:+.2f}" for (a, b), r in pares.items()]
+
+
+def _quartis(df, numericas, estatisticas=None, esbocos=None):
+    """{coluna: (q1, q3)} dos esboços ou das estatísticas; do df só para as demais"""
+    quartis = {c: tuple(esbocos.quantis[c].quantis([0.25, 0.75])) for c in _com_esboco(numericas, esbocos)}
+    if estatisticas is not None and {'25%', '75%'} <= set(estatisticas.index):
+        quartis.update({c: (estatisticas.loc['25%', c], estatisticas.loc['75%', c])
+                        for c in numericas if c not in quartis and c in estatisticas.columns})
+    faltando = [c for c in numericas if c not in quartis]
+    if faltando:
+        tabela = df[faltando].quantile([0.25, 0.75])
+        quartis.update({c: tuple(tabela[c]) for c in faltando})
+    return quartis
+
+
+def secao_anomalias(df, numericas, estatisticas=None, esbocos=None):
+    linhas = []
+    quartis = _quartis(df, numericas, estatisticas, esbocos)
+    for col in df.columns:
+        nulos = df[col].isna().mean()
+        partes = []
+        if col in numericas:
+            q1, q3 = quartis[col]
+            iqr = q3 - q1
+            if iqr > 0:
+                fora = ((df[col] < q1 - 1.5 * iqr) | (df[col] > q3 + 1.5 * iqr)).mean()
+                if fora > 0:
+                    partes.append(f"{fora:.1%} fora de 1,5×IQR")
+        if nulos > 0:
+            partes.append(f"{nulos:.1%} nulos")
+        if partes:
+            linhas.append(f"- {col}: {'; '.join(partes)}")
+    return ["ANOMALIAS:"] + linhas if linhas else []
+
+
+def amostra_estratificada(df, coluna, n, seed=42):
+    """n registros com todos os estratos representados, proporcionalmente ao tamanho
+
+    Com mais estratos que n, só os n maiores entram.
+    """
+    if coluna is None:
+        return df.sample(min(n, len(df)), random_state=seed)
+    rng = np.random.default_rng(seed)
+    grupos = df.groupby(coluna, observed=True).indices
+    tamanhos = pd.Series({k: len(v) for k, v in grupos.items()})
+    if len(tamanhos) > n:
+        # Mais estratos que registros: um de cada um dos n maiores
+        tamanhos = tamanhos.nlargest(n)
+    # Um representante por estrato; o restante dividido pelos maiores restos
+    ideal = tamanhos / tamanhos.sum() * max(0, n - len(tamanhos))
+    cotas = 1 + np.floor(ideal).astype(int)
+    restantes = max(0, n - cotas.sum())
+    # isin: estratos booleanos ou inteiros são rótulos (com [] ou .loc, True/False viram máscara)
+    maiores_restos = (ideal - np.floor(ideal)).sort_values(ascending=False).index[:restantes]
+    cotas += cotas.index.isin(maiores_restos)
+    posicoes = [rng.choice(grupos[k], min(c, tamanhos.loc[k]), replace=False) for k, c in cotas.items()]
+    return df.iloc[np.sort(np.concatenate(posicoes))] if posicoes else df.head(0)
+
+
+def _coluna_estrato(df, categoricas, cubo=None):
+    preferidas = [d for d in (cubo.dimensoes if cubo is not None else []) if d in categoricas]
+    for col in preferidas + categoricas:
+        if 2 <= df[col].nunique() <= 20:
+            return col
+    return None
+
+
+def secao_amostra(df, categoricas, cubo=None, n=8, seed=42):
+    colunas = [c for c in df.columns if not _eh_identificador(df[c])]
+    estrato = _coluna_estrato(df, categoricas, cubo)
+    amostra = amostra_estratificada(df, estrato, n, seed)[colunas]
+    texto = amostra.to_csv(index=False, float_format='%.4g').strip().split('\n')
+    titulo = f"AMOSTRA ESTRATIFICADA POR {estrato} (CSV):" if estrato else "AMOSTRA ALEATÓRIA (CSV):"
+    return [titulo] + [linha[:300] for linha in texto]
+
+
+def montar_contexto(df, cubo=None, estatisticas=None, n_registros=None, orcamento_tokens=1500,
+                    top_k=5, tamanho_amostra=8, seed=42, esbocos=None):
+    """Texto de contexto do dataset que cabe em orcamento_tokens"""
+    numericas, categoricas = _colunas(df)
+    if n_registros is None:
+        n_registros = cubo.n_registros if cubo is not None else len(df)
+    medida = medida_principal(df, numericas, cubo)
+
+    # Em ordem de prioridade; seções que não cabem inteiras entram linha a linha
+    secoes = [
+        secao_visao_geral(df, n_registros, numericas, categoricas),
+        secao_metricas(df, numericas, cubo, estatisticas, esbocos),
+        secao_dimensoes(df, categoricas, medida, cubo, top_k),
+        secao_correlacoes(df, numericas, cubo),
+        secao_anomalias(df, numericas, estatisticas, esbocos),
+        secao_amostra(df, categoricas, cubo, tamanho_amostra, seed)
+    ]
+
+    linhas, usados = [], 0
+    # Seção vazia não gasta o separador
+    for secao in filter(None, secoes):
+        for i, linha in enumerate(secao):
+            custo = estimar_tokens(linha) + 1
+            if usados + custo > orcamento_tokens:
+                # Não deixa um título de seção sozinho no final
+                if i == 1:
+                    linhas.pop()
+                return '\n'.join(linhas)
+            linhas.append(linha)
+            usados += custo
+        linhas.append('')
+        usados += 1
+    return '\n'.join(linhas).rstrip()
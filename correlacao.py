@@ -0,0 +1,162 @@
+"""
+Motor de correlação incremental do DataInsight AI
+Acumula, bloco a bloco, contagens, somas, somas de quadrados e de produtos
+cruzados de cada par de colunas (só sobre as linhas em que ambas têm
+valor, como o DataFrame.corr do pandas). Qualquer submatriz de Pearson sai
+dessas somas sem reler os dados. O Spearman é aproximado pela mesma
+conta sobre os postos estimados por uma grade de quantis.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Pontos da grade de quantis usada para estimar os postos (Spearman)
+PONTOS_QUANTIS = 1001
+# Linhas processadas por vez (limita as matrizes temporárias)
+TAMANHO_BLOCO = 200_000
+
+
+def _cdf_por_grade(amostra, pontos=PONTOS_QUANTIS):
+    """(valores, posto médio em [0, 1]) para interpolar postos; empates ficam com a média"""
+    amostra = amostra[~np.isnan(amostra)]
+    if len(amostra) == 0:
+        return np.array([0.0]), np.array([0.5])
+    grade = np.quantile(amostra, np.linspace(0, 1, pontos))
+    valores, inverso = np.unique(grade, return_inverse=True)
+    postos = np.bincount(inverso, weights=np.linspace(0, 1, pontos)) / np.bincount(inverso)
+    return valores, postos
+
+
+class _Somas:
+    """Somas por par de colunas, deslocadas por uma referência para estabilidade numérica"""
+
+    def __init__(self, k):
+        self.deslocamento = None
+        self.n = np.zeros((k, k))
+        self.s = np.zeros((k, k))   # s[i, j]: soma de x_i onde x_i e x_j existem
+        self.q = np.zeros((k, k))   # q[i, j]: soma de x_i² onde x_i e x_j existem
+        self.p = np.zeros((k, k))   # p[i, j]: soma de x_i·x_j
+
+    def atualizar(self, x):
+        if self.deslocamento is None:
+            # Próximo da média: as somas de quadrados não perdem precisão; coluna sem
+            # nenhum valor no bloco fica com deslocamento 0 (nanmean avisaria "empty slice")
+            contagem = np.count_nonzero(~np.isnan(x), axis=0)
+            soma = np.nansum(x, axis=0)
+            self.deslocamento = np.divide(soma, contagem, out=np.zeros(x.shape[1]), where=contagem > 0)
+        validos = ~np.isnan(x)
+        m = validos.astype(float)
+        x0 = np.where(validos, x - self.deslocamento, 0.0)
+        self.n += m.T @ m
+        self.s += x0.T @ m
+        self.q += (x0 ** 2).T @ m
+        self.p += x0.T @ x0
+
+    def correlacao(self, indices):
+        ix = np.ix_(indices, indices)
+        n, s, q, p = self.n[ix], self.s[ix], self.q[ix], self.p[ix]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = p - s * s.T / n
+            var_i = q - s ** 2 / n
+            r = cov / np.sqrt(var_i * var_i.T)
+        r[n < 2] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+
+class MatrizCorrelacao:
+    """Correlações de Pearson (e Spearman aproximado) atualizáveis bloco a bloco"""
+
+    def __init__(self, colunas, spearman=True, pontos_quantis=PONTOS_QUANTIS):
+        self.colunas = list(colunas)
+        self.spearman = spearman
+        self.pontos_quantis = pontos_quantis
+        self.n_registros = 0
+        self._posicao = {c: i for i, c in enumerate(self.colunas)}
+        self._pearson = _Somas(len(self.colunas))
+        self._postos = _Somas(len(self.colunas)) if spearman else None
+        self._grades = None
+
+    @classmethod
+    def de_dataframe(cls, df, colunas=None, spearman=True):
+        """Matriz de um DataFrame em memória"""
+        if colunas is None:
+            colunas = df.select_dtypes(include=[np.number]).columns
+        return cls(colunas, spearman).atualizar(df)
+
+    def _matriz(self, bloco):
+        x = np.full((len(bloco), len(self.colunas)), np.nan)
+        for i, col in enumerate(self.colunas):
+            if col in bloco.columns:
+                x[:, i] = pd.to_numeric(bloco[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        return x
+
+    def definir_grades(self, amostra):
+        """Fixa as grades de quantis do Spearman (por padrão, as do primeiro bloco)"""
+        x = self._matriz(amostra)
+        self._grades = [_cdf_por_grade(x[:, i], self.pontos_quantis) for i in range(len(self.colunas))]
+
+    def atualizar(self, bloco, seed=42):
+        """Incorpora um bloco (DataFrame) às somas"""
+        if bloco is None or len(bloco) == 0:
+            return self
+        self.n_registros += len(bloco)
+        if self.spearman and self._grades is None:
+            # Grade de quantis de uma amostra do primeiro bloco inteiro
+            amostra = bloco if len(bloco) <= TAMANHO_BLOCO else bloco.sample(TAMANHO_BLOCO, random_state=seed)
+            self.definir_grades(amostra)
+        for inicio in range(0, len(bloco), TAMANHO_BLOCO):
+            x = self._matriz(bloco.iloc[inicio:inicio + TAMANHO_BLOCO])
+            self._pearson.atualizar(x)
+            if self.spearman:
+                self._postos.atualizar(self._postos_estimados(x))
+        return self
+
+    def _postos_estimados(self, x):
+        postos = np.full_like(x, np.nan)
+        for i, (valores, cdf) in enumerate(self._grades):
+            validos = ~np.isnan(x[:, i])
+            postos[validos, i] = np.interp(x[validos, i], valores, cdf)
+        return postos
+
+    def _indices(self, colunas):
+        if colunas is None:
+            return list(self.colunas), list(range(len(self.colunas)))
+        colunas = [c for c in colunas if c in self._posicao]
+        return colunas, [self._posicao[c] for c in colunas]
+
+    def pearson(self, colunas=None):
+        """Submatriz de Pearson para as colunas pedidas (todas por padrão)"""
+        colunas, indices = self._indices(colunas)
+        return pd.DataFrame(self._pearson.correlacao(indices), index=colunas, columns=colunas)
+
+    def spearman_aproximado(self, colunas=None):
+        """Submatriz de Spearman estimada pelos postos da grade de quantis"""
+        if not self.spearman:
+            raise ValueError("Matriz criada com spearman=False")
+        colunas, indices = self._indices(colunas)
+        return pd.DataFrame(self._postos.correlacao(indices), index=colunas, columns=colunas)
+
+    def par(self, coluna_a, coluna_b, metodo='pearson'):
+        """Correlação de um único par"""
+        matriz = self.pearson([coluna_a, coluna_b]) if metodo == 'pearson' else \
+            self.spearman_aproximado([coluna_a, coluna_b])
+        return matriz.iloc[0, 1]
+
+    def pares_mais_fortes(self, colunas=None, n=5, limiar=0.0, metodo='pearson'):
+        """Série (a, b) -> r dos pares de maior |r|, sem repetir (a, b)/(b, a)"""
+        matriz = self.pearson(colunas) if metodo == 'pearson' else self.spearman_aproximado(colunas)
+        superior = np.triu(np.ones(matriz.shape, dtype=bool), k=1)
+        pares = matriz.where(superior).stack()
+        pares = pares[pares.abs() >= limiar]
+        return pares.reindex(pares.abs().sort_values(ascending=False).index)[:n]
+
+
+def matriz_do_dataset(df, cubo=None, colunas=None, spearman=True):
+    """Matriz acumulada pelo cubo quando cobre as colunas; senão calculada do DataFrame"""
+    if colunas is None:
+        colunas = list(df.select_dtypes(include=[np.number]).columns)
+    # getattr: cubos gravados no cache de datasets antes da matriz não a têm
+    matriz = getattr(cubo, 'correlacao', None)
+    if matriz is not None and all(c in matriz.colunas for c in colunas):
+        return matriz
+    return MatrizCorrelacao.de_dataframe(df, colunas, spearman)
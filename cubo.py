@@ -0,0 +1,171 @@
+"""
+Cubo OLAP pré-agregado para o dashboard do DataInsight AI
+Guarda soma, contagem, mínimo e máximo das medidas numéricas por dimensão
+e por pares de dimensões, além das somas que dão a matriz de correlação
+das medidas. Construído uma vez por dataset (ou bloco a bloco
+na ingestão) e consultado pelo dashboard, gráficos e relatórios no lugar
+de novos groupby sobre o DataFrame inteiro.
+"""
+
+import numpy as np
+import pandas as pd
+
+from correlacao import MatrizCorrelacao
+
+DIMENSOES_PADRAO = ['regiao', 'produto', 'vendedor', 'categoria', 'mes', 'canal']
+
+PARES_PADRAO = [
+    ('regiao', 'categoria'),
+    ('regiao', 'produto'),
+    ('categoria', 'produto'),
+    ('regiao', 'mes'),
+    ('categoria', 'mes')
+]
+
+FUNCOES = ('sum', 'count', 'min', 'max')
+
+# Como combinar cada função ao juntar dois cubos parciais
+_COMBINACAO = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+
+class CuboOLAP:
+    """Agregados das medidas por dimensão, mescláveis entre blocos"""
+
+    def __init__(self, dimensoes, medidas, pares=()):
+        self.dimensoes = list(dimensoes)
+        self.medidas = list(medidas)
+        self.pares = [tuple(par) for par in pares]
+        self.n_registros = 0
+        self._tabelas = {}
+        self._totais = None
+        self.correlacao = MatrizCorrelacao(self.medidas)
+        # Valores não numéricos encontrados nas medidas (descartados como ausentes)
+        self.nao_numericos = {}
+
+    @classmethod
+    def construir(cls, df, dimensoes=None, medidas=None, pares=None):
+        """Cria o cubo a partir de um DataFrame, usando as dimensões presentes"""
+        cubo = cls.para_colunas(df.columns, df.select_dtypes(include=[np.number]).columns,
+                                dimensoes, medidas, pares)
+        return cubo.atualizar(df)
+
+    @classmethod
+    def para_colunas(cls, colunas, colunas_numericas, dimensoes=None, medidas=None, pares=None):
+        """Cria um cubo vazio para um schema (usado na ingestão em blocos)"""
+        colunas = list(colunas)
+        dimensoes = [d for d in (dimensoes or DIMENSOES_PADRAO) if d in colunas]
+        if medidas is None:
+            medidas = [c for c in colunas_numericas if c != 'id']
+        pares = [p for p in (pares if pares is not None else PARES_PADRAO)
+                 if all(d in dimensoes for d in p)]
+        return cls(dimensoes, medidas, pares)
+
+    def _chaves(self):
+        return [(d,) for d in self.dimensoes] + self.pares
+
+    def atualizar(self, bloco):
+        """Incorpora um bloco de registros ao cubo"""
+        if bloco is None or bloco.empty:
+            return self
+
+        medidas = [m for m in self.medidas if m in bloco.columns]
+        bloco = self._medidas_numericas(bloco, medidas)
+        self.n_registros += len(bloco)
+
+        self.correlacao.atualizar(bloco)
+
+        totais = bloco[medidas].agg(list(FUNCOES)).T
+        self._totais = totais if self._totais is None else self._combinar(
+            pd.concat([self._totais, totais]), nivel=0
+        )
+
+        for chave in self._chaves():
+            if not all(d in bloco.columns for d in chave):
+                continue
+            parcial = bloco.groupby(list(chave), observed=True)[medidas].agg(list(FUNCOES))
+            atual = self._tabelas.get(chave)
+            if atual is None:
+                self._tabelas[chave] = parcial
+            else:
+                self._tabelas[chave] = self._combinar(pd.concat([atual, parcial]),
+                                                      nivel=list(range(len(chave))))
+        return self
+
+    def _medidas_numericas(self, bloco, medidas):
+        """Bloco com as medidas convertidas para número quando o tipo mudou (ex.: 'N/A' no meio
+        do arquivo); os valores que não são números viram ausentes e são contados"""
+        convertidas = {}
+        for m in medidas:
+            if pd.api.types.is_numeric_dtype(bloco[m]) or pd.api.types.is_bool_dtype(bloco[m]):
+                continue
+            numeros = pd.to_numeric(bloco[m], errors='coerce')
+            perdidos = int((numeros.isna() & bloco[m].notna()).sum())
+            if perdidos:
+                self.nao_numericos[m] = self.nao_numericos.get(m, 0) + perdidos
+            convertidas[m] = numeros
+        return bloco.assign(**convertidas) if convertidas else bloco
+
+    @staticmethod
+    def _combinar(tabela, nivel):
+        """Junta linhas repetidas de agregados parciais"""
+        regras = {col: _COMBINACAO[col[-1] if isinstance(col, tuple) else col] for col in tabela.columns}
+        return tabela.groupby(level=nivel, observed=True, sort=False).agg(regras)
+
+    def _tabela(self, dimensoes):
+        if isinstance(dimensoes, str):
+            dimensoes = (dimensoes,)
+        chave = tuple(dimensoes)
+        if chave not in self._tabelas and len(chave) == 2 and chave[::-1] in self._tabelas:
+            return self._tabelas[chave[::-1]].swaplevel().sort_index()
+        if chave not in self._tabelas:
+            raise KeyError(f"Dimensões {chave} não pré-agregadas no cubo")
+        return self._tabelas[chave]
+
+    def possui(self, dimensoes):
+        """Indica se a combinação de dimensões está pré-agregada"""
+        try:
+            self._tabela(dimensoes)
+            return True
+        except KeyError:
+            return False
+
+    def agregar(self, dimensoes, medida, func='sum'):
+        """Agregado de uma medida por dimensão(ões); func em sum/count/min/max/mean"""
+        tabela = self._tabela(dimensoes)
+        if func == 'mean':
+            serie = tabela[(medida, 'sum')] / tabela[(medida, 'count')]
+        else:
+            serie = tabela[(medida, func)]
+        return serie.rename(medida)
+
+    def tabela(self, dimensoes, medidas, func='sum'):
+        """DataFrame com várias medidas agregadas pela mesma função"""
+        return pd.DataFrame({m: self.agregar(dimensoes, m, func) for m in medidas})
+
+    def top(self, dimensao, medida, func='sum'):
+        """Rótulo e valor do maior agregado (idxmax e max em uma só consulta)
+
+        Cubo vazio ou dimensão sem grupos com valor: (None, nan).
+        """
+        if self.n_registros == 0:
+            return None, np.nan
+        serie = self.agregar(dimensao, medida, func).dropna()
+        if serie.empty:
+            return None, np.nan
+        rotulo = serie.idxmax()
+        return rotulo, serie.loc[rotulo]
+
+    def maiores(self, dimensao, medida, n, func='sum'):
+        """Os n maiores agregados de uma dimensão"""
+        return self.agregar(dimensao, medida, func).nlargest(n)
+
+    def total(self, medida, func='sum'):
+        """Agregado de uma medida sobre todo o dataset"""
+        if self._totais is None or medida not in self._totais.index:
+            return np.nan
+        if func == 'mean':
+            return self._totais.loc[medida, 'sum'] / self._totais.loc[medida, 'count']
+        return self._totais.loc[medida, func]
+
+    def media(self, medida):
+        return self.total(medida, 'mean')
@@ -3,102 +3,13 @@ Script para gerar dados de exemplo para o DataInsight AI
 Execute: python dados_exemplo.py
 """
 
-import pandas as pd
-import numpy as np
 from datetime import datetime
+from gerador_dados import gerar_dados_vendas
 
 def criar_dados_vendas():
     """Cria dataset de vendas para demonstração"""
-    np.random.seed(42)
-    
-    # Configurações
-    n_records = 500
-    
-    # Listas de dados
-    vendedores = [
-        'João Silva', 'Maria Santos', 'Pedro Costa', 'Ana Lima', 
-        'Carlos Rocha', 'Lucia Ferreira', 'Roberto Alves', 'Fernanda Dias',
-        'Marcos Oliveira', 'Patricia Souza', 'Ricardo Mendes', 'Juliana Castro'
-    ]
-    
-    produtos = [
-        'Smartphone Pro', 'Laptop Gamer', 'Tablet Ultra', 'Smartwatch Fit',
-        'Fones Bluetooth', 'Camera Digital', 'Console Game', 'Monitor 4K',
-        'Teclado Mecânico', 'Mouse Gamer', 'SSD 1TB', 'Placa de Vídeo'
-    ]
-    
-    regioes = ['Norte', 'Sul', 'Leste', 'Oeste', 'Centro']
-    
-    meses = [
-        'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
-        'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
-    ]
-    
-    categorias = ['Eletrônicos', 'Informática', 'Games', 'Acessórios', 'Mobile']
-    
-    canais = ['Online', 'Loja Física', 'Marketplace', 'Telefone', 'App Mobile']
-    
-    # Gerar dados
-    data = []
-    
-    for i in range(n_records):
-        # Categoria influencia preço
-        categoria = np.random.choice(categorias)
-        
-        if categoria == 'Eletrônicos':
-            vendas_base = np.random.normal(25000, 8000)
-        elif categoria == 'Informática':
-            vendas_base = np.random.normal(35000, 12000)
-        elif categoria == 'Games':
-            vendas_base = np.random.normal(15000, 5000)
-        elif categoria == 'Mobile':
-            vendas_base = np.random.normal(20000, 7000)
-        else:  # Acessórios
-            vendas_base = np.random.normal(8000, 3000)
-        
-        vendas = max(1000, int(vendas_base))
-        custo = int(vendas * np.random.uniform(0.4, 0.7))
-        lucro = vendas - custo
-        margem = (lucro / vendas) * 100
-        
-        # Satisfação correlacionada com margem
-        if margem > 40:
-            satisfacao = np.random.choice([4, 5], p=[0.3, 0.7])
-        elif margem > 25:
-            satisfacao = np.random.choice([3, 4, 5], p=[0.2, 0.5, 0.3])
-        else:
-            satisfacao = np.random.choice([1, 2, 3], p=[0.3, 0.4, 0.3])
-        
-        # Tempo de entrega baseado no canal
-        canal = np.random.choice(canais)
-        if canal == 'Online':
-            tempo_entrega = np.random.randint(1, 7)
-        elif canal == 'Loja Física':
-            tempo_entrega = 0  # Retirada imediata
-        else:
-            tempo_entrega = np.random.randint(2, 15)
-        
-        data.append({
-            'id': i + 1,
-            'vendas': vendas,
-            'custo': custo,
-            'lucro': lucro,
-            'margem': round(margem, 2),
-            'regiao': np.random.choice(regioes),
-            'produto': np.random.choice(produtos),
-            'categoria': categoria,
-            'mes': np.random.choice(meses),
-            'vendedor': np.random.choice(vendedores),
-            'canal': canal,
-            'satisfacao': satisfacao,
-            'quantidade': np.random.randint(1, 50),
-            'desconto': round(np.random.uniform(0, 0.30), 3),
-            'tempo_entrega': tempo_entrega,
-            'data_venda': np.random.choice(pd.date_range('2024-01-01', '2024-12-31', freq='D')).strftime('%Y-%m-%d')
-        })
-    
-    # Criar DataFrame
-    df = pd.DataFrame(data)
+    # Gerar dados (vetorizado, mesmo gerador usado pelos apps)
+    df = gerar_dados_vendas(n_registros=500, perfil='exemplo', seed=42)
     
     # Salvar arquivo
     filename = f'dados_vendas_exemplo_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
@@ -112,10 +23,10 @@ def criar_dados_vendas():
     print(f"- Satisfação média: {df['satisfacao'].mean():.1f}")
     
     print(f"\n📈 Por categoria:")
-    print(df.groupby('categoria')['vendas'].sum().sort_values(ascending=False))
+    print(df.groupby('categoria', observed=True)['vendas'].sum().sort_values(ascending=False))
     
     print(f"\n🌍 Por região:")
-    print(df.groupby('regiao')['vendas'].sum().sort_values(ascending=False))
+    print(df.groupby('regiao', observed=True)['vendas'].sum().sort_values(ascending=False))
     
     return df
 
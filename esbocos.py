@@ -0,0 +1,271 @@
+"""
+Esboços aproximados e mescláveis para estatísticas de datasets enormes
+KLL para quantis, HyperLogLog para contagem de distintos e momentos (Chan)
+para contagem, média, desvio, mínimo e máximo. Todos são atualizados bloco
+a bloco na ingestão e podem ser combinados entre blocos ou processos; cada
+resultado aproximado vem com o seu limite de erro.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Momentos:
+    """Contagem, média, M2, mínimo e máximo combináveis (fórmula de Chan)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype='float64')
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return self
+        parcial = Momentos()
+        parcial.count = len(valores)
+        parcial.mean = valores.mean()
+        parcial.m2 = ((valores - parcial.mean) ** 2).sum()
+        parcial.min, parcial.max = valores.min(), valores.max()
+        return self.combinar(parcial)
+
+    def combinar(self, outro):
+        if outro.count == 0:
+            return self
+        n = self.count + outro.count
+        delta = outro.mean - self.mean
+        self.mean += delta * outro.count / n
+        self.m2 += outro.m2 + delta ** 2 * self.count * outro.count / n
+        self.count = n
+        self.min = min(self.min, outro.min)
+        self.max = max(self.max, outro.max)
+        return self
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+
+class EsbocoKLL:
+    """Esboço KLL de quantis: memória O(k·log n) e erro de posto ~1/k"""
+
+    def __init__(self, k=200, seed=42):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def erro_posto(self):
+        """Erro normalizado de posto (99% de confiança, constantes empíricas do KLL)"""
+        return 2.296 / self.k ** 0.9723
+
+    def _capacidade(self, nivel):
+        # Níveis mais baixos guardam menos itens: capacidade decai 2/3 por nível
+        profundidade = len(self._niveis) - 1 - nivel
+        return max(2, int(np.ceil(self.k * (2 / 3) ** profundidade)))
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self._niveis):
+            itens = self._niveis[nivel]
+            if len(itens) > self._capacidade(nivel):
+                if nivel + 1 == len(self._niveis):
+                    self._niveis.append(np.empty(0))
+                itens = np.sort(itens)
+                # Número par de itens compactados; o que sobra fica no nível
+                sobra = itens[-1:] if len(itens) % 2 else itens[:0]
+                pares = itens[:len(itens) - len(sobra)]
+                promovidos = pares[self._rng.integers(2)::2]
+                self._niveis[nivel + 1] = np.concatenate([self._niveis[nivel + 1], promovidos])
+                self._niveis[nivel] = sobra
+                # Um novo nível muda as capacidades: recomeça a verificação
+                nivel = 0
+                continue
+            nivel += 1
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype='float64')
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return self
+        self.n += len(valores)
+        self.min = min(self.min, valores.min())
+        self.max = max(self.max, valores.max())
+        nivel = 0
+        if len(valores) > self.k:
+            # Lote grande: ordena uma vez e promove direto ao nível em que cabe,
+            # equivalente a compactar o lote ordenado várias vezes seguidas
+            nivel = int(np.log2(len(valores) / self.k))
+            passo = 2 ** nivel
+            valores = np.sort(valores)[self._rng.integers(passo)::passo]
+            while len(self._niveis) <= nivel:
+                self._niveis.append(np.empty(0))
+        self._niveis[nivel] = np.concatenate([self._niveis[nivel], valores])
+        self._compactar()
+        return self
+
+    def combinar(self, outro):
+        while len(self._niveis) < len(outro._niveis):
+            self._niveis.append(np.empty(0))
+        for nivel, itens in enumerate(outro._niveis):
+            self._niveis[nivel] = np.concatenate([self._niveis[nivel], itens])
+        self.n += outro.n
+        self.min = min(self.min, outro.min)
+        self.max = max(self.max, outro.max)
+        self._compactar()
+        return self
+
+    def quantis(self, qs):
+        """Quantis aproximados (extremos exatos)"""
+        qs = np.atleast_1d(np.asarray(qs, dtype='float64'))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        valores = np.concatenate(self._niveis)
+        pesos = np.concatenate([np.full(len(itens), 2.0 ** nivel) for nivel, itens in enumerate(self._niveis)])
+        ordem = np.argsort(valores, kind='stable')
+        valores, acumulado = valores[ordem], np.cumsum(pesos[ordem])
+        posicoes = np.searchsorted(acumulado, qs * acumulado[-1], side='left')
+        resultado = valores[np.minimum(posicoes, len(valores) - 1)]
+        resultado[qs <= 0] = self.min
+        resultado[qs >= 1] = self.max
+        return resultado
+
+    @property
+    def itens_guardados(self):
+        return sum(len(itens) for itens in self._niveis)
+
+
+def _comprimento_em_bits(valores):
+    """bit_length de cada uint64 (exato: frexp sobre metades de 32 bits)"""
+    alto = (valores >> np.uint64(32)).astype('float64')
+    baixo = (valores & np.uint64(0xFFFFFFFF)).astype('float64')
+    return np.where(alto > 0, 32 + np.frexp(alto)[1], np.frexp(baixo)[1])
+
+
+class HyperLogLog:
+    """Contagem aproximada de distintos em 2^p registradores (erro relativo ~1,04/√2^p)"""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.m = 1 << p
+        self.registradores = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def erro_relativo(self):
+        return 1.04 / np.sqrt(self.m)
+
+    def atualizar(self, serie):
+        """Incorpora os valores não nulos de uma Series (hash do próprio pandas)"""
+        serie = pd.Series(serie).dropna()
+        if serie.empty:
+            return self
+        return self.atualizar_hashes(pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64))
+
+    def atualizar_hashes(self, hashes):
+        """Incorpora hashes de 64 bits já calculados"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return self
+        bits_restantes = 64 - self.p
+        indices = (hashes >> np.uint64(bits_restantes)).astype(np.int64)
+        resto = hashes & np.uint64((1 << bits_restantes) - 1)
+        # Posição do primeiro bit 1 nos bits restantes (zeros à esquerda + 1)
+        postos = (bits_restantes - _comprimento_em_bits(resto) + 1).astype(np.int64)
+        # Máximo por registrador via histograma (registrador, posto); np.maximum.at é bem mais lento
+        presentes = np.bincount(indices * 64 + postos, minlength=self.m * 64).reshape(self.m, 64) > 0
+        maximos = (presentes * np.arange(64, dtype=np.uint8)).max(axis=1)
+        np.maximum(self.registradores, maximos, out=self.registradores)
+        return self
+
+    def combinar(self, outro):
+        np.maximum(self.registradores, outro.registradores, out=self.registradores)
+        return self
+
+    def estimativa(self):
+        alfa = 0.7213 / (1 + 1.079 / self.m)
+        bruta = alfa * self.m ** 2 / np.sum(2.0 ** -self.registradores.astype('float64'))
+        vazios = int(np.count_nonzero(self.registradores == 0))
+        # Poucos distintos: contagem linear é mais precisa
+        if bruta <= 2.5 * self.m and vazios > 0:
+            return self.m * np.log(self.m / vazios)
+        return bruta
+
+
+class EsbocosDataset:
+    """Momentos e KLL por coluna numérica e HyperLogLog por coluna"""
+
+    QUANTIS = [0.25, 0.5, 0.75]
+
+    def __init__(self, k=200, p=12):
+        self.k = k
+        self.p = p
+        self.n_registros = 0
+        self.momentos = {}
+        self.quantis = {}
+        self.distintos = {}
+
+    @classmethod
+    def de_dataframe(cls, df, tamanho_bloco=500_000, **kwargs):
+        esbocos = cls(**kwargs)
+        for inicio in range(0, len(df), tamanho_bloco):
+            esbocos.atualizar(df.iloc[inicio:inicio + tamanho_bloco])
+        return esbocos
+
+    def atualizar(self, bloco):
+        """Incorpora um bloco (DataFrame)"""
+        if bloco is None or bloco.empty:
+            return self
+        self.n_registros += len(bloco)
+        # Coluna que já tem momentos continua numérica mesmo se o bloco vier como texto
+        # (ex.: 'N/A' no meio do arquivo); o que não for número vira ausente, como no cubo
+        numericas = set(bloco.select_dtypes(include=[np.number]).columns) | set(self.momentos)
+        for col in bloco.columns:
+            self.distintos.setdefault(col, HyperLogLog(self.p)).atualizar(bloco[col])
+            if col in numericas:
+                valores = pd.to_numeric(bloco[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+                self.momentos.setdefault(col, Momentos()).atualizar(valores)
+                self.quantis.setdefault(col, EsbocoKLL(self.k)).atualizar(valores)
+        return self
+
+    def combinar(self, outro):
+        """Junta os esboços de outro bloco/processo a estes"""
+        self.n_registros += outro.n_registros
+        for nome, destino, fabrica in [('momentos', self.momentos, Momentos),
+                                       ('quantis', self.quantis, lambda: EsbocoKLL(self.k)),
+                                       ('distintos', self.distintos, lambda: HyperLogLog(self.p))]:
+            for col, esboco in getattr(outro, nome).items():
+                destino.setdefault(col, fabrica()).combinar(esboco)
+        return self
+
+    @property
+    def erro_quantis(self):
+        return EsbocoKLL(self.k).erro_posto
+
+    @property
+    def erro_distintos(self):
+        return HyperLogLog(self.p).erro_relativo
+
+    def describe(self, colunas=None):
+        """Tabela no formato de DataFrame.describe(); quartis aproximados pelo KLL"""
+        colunas = [c for c in (colunas if colunas is not None else self.momentos) if c in self.momentos]
+        linhas = {}
+        for col in colunas:
+            m = self.momentos[col]
+            quartis = self.quantis[col].quantis(self.QUANTIS)
+            linhas[col] = [m.count, m.mean, m.std, m.min, *quartis, m.max]
+        return pd.DataFrame(linhas, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def n_distintos(self):
+        """Série coluna -> número estimado de valores distintos"""
+        return pd.Series({col: int(round(h.estimativa())) for col, h in self.distintos.items()}, dtype='int64')
+
+    def nota_erro(self):
+        """Texto curto com os limites de erro das estimativas"""
+        return (f"Quartis com erro de posto ≤ {self.erro_quantis:.1%} (KLL, k={self.k}); "
+                f"distintos com erro relativo ~{self.erro_distintos:.1%} (HyperLogLog, 2^{self.p} registradores)")
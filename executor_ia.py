@@ -0,0 +1,106 @@
+"""
+Executor concorrente de análises do Gemini para o DataInsight AI
+Roda várias análises em paralelo (pool de threads) respeitando um limite de
+concorrência, um limitador de taxa (token bucket) e repetindo com espera
+exponencial quando a API devolve erro de cota.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    ERROS_DE_COTA = (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)
+except ImportError:
+    ERROS_DE_COTA = ()
+
+
+def eh_erro_de_cota(erro):
+    """Indica se o erro é de cota/limite de requisições (HTTP 429)"""
+    if ERROS_DE_COTA and isinstance(erro, ERROS_DE_COTA):
+        return True
+    texto = str(erro).lower()
+    return '429' in texto or 'quota' in texto or 'resource exhausted' in texto
+
+
+class LimitadorTaxa:
+    """Token bucket: até `capacidade` requisições seguidas, repostas a `taxa_por_minuto`"""
+
+    def __init__(self, taxa_por_minuto, capacidade=None, relogio=time.monotonic, dormir=time.sleep):
+        self.taxa_por_segundo = taxa_por_minuto / 60.0
+        self.capacidade = capacidade or max(1, int(taxa_por_minuto // 6))
+        self._fichas = float(self.capacidade)
+        self._relogio = relogio
+        self._dormir = dormir
+        self._ultimo = relogio()
+        self._trava = threading.Lock()
+
+    def _repor(self):
+        agora = self._relogio()
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa_por_segundo)
+        self._ultimo = agora
+
+    def adquirir(self):
+        """Bloqueia até haver uma ficha disponível e a consome"""
+        while True:
+            with self._trava:
+                self._repor()
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.taxa_por_segundo
+            self._dormir(espera)
+
+
+def com_retentativas(funcao, tentativas=4, espera_inicial=2.0, fator=2.0, limitador=None, dormir=time.sleep):
+    """Executa funcao(); em erro de cota espera (exponencial com jitter) e tenta de novo"""
+    for tentativa in range(tentativas):
+        if limitador is not None:
+            limitador.adquirir()
+        try:
+            return funcao()
+        except Exception as erro:
+            if not eh_erro_de_cota(erro) or tentativa == tentativas - 1:
+                raise
+            espera = espera_inicial * fator ** tentativa
+            dormir(espera * random.uniform(0.8, 1.2))
+
+
+class ExecutorIA:
+    """Pool de threads para análises independentes do Gemini"""
+
+    def __init__(self, max_concorrencia=4, requisicoes_por_minuto=15, tentativas=4, espera_inicial=2.0):
+        self.max_concorrencia = max_concorrencia
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.limitador = LimitadorTaxa(requisicoes_por_minuto) if requisicoes_por_minuto else None
+        self._pool = ThreadPoolExecutor(max_workers=max_concorrencia, thread_name_prefix='gemini')
+
+    def submeter(self, funcao):
+        """Agenda funcao() com limite de taxa e retentativas; devolve o Future"""
+        return self._pool.submit(
+            com_retentativas, funcao, self.tentativas, self.espera_inicial, limitador=self.limitador
+        )
+
+    def executar(self, tarefas, ao_concluir=None):
+        """Roda {nome: funcao} em paralelo e devolve {nome: resultado ou exceção}
+
+        ao_concluir(nome, resultado, concluidas, total) é chamado na thread de
+        quem executa, à medida que cada tarefa termina.
+        """
+        futuros = {self.submeter(funcao): nome for nome, funcao in tarefas.items()}
+        resultados = {}
+        for concluidas, futuro in enumerate(as_completed(futuros), start=1):
+            nome = futuros[futuro]
+            try:
+                resultados[nome] = futuro.result()
+            except Exception as erro:
+                resultados[nome] = erro
+            if ao_concluir is not None:
+                ao_concluir(nome, resultados[nome], concluidas, len(futuros))
+        return resultados
+
+    def encerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
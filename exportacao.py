@@ -0,0 +1,218 @@
+"""
+Exportação em blocos do DataInsight AI
+Escreve CSV e JSON pedaço a pedaço em um arquivo temporário, opcionalmente
+comprimido (gzip ou zstd), com buffer limitado ao tamanho do bloco, e
+aplica as opções do Centro de Exportação: índice, formato de data e
+separador decimal. O Excel é gravado em modo write-only do openpyxl
+(memória constante), dividindo os dados em abas no limite de linhas;
+Parquet e Feather vão direto para o arquivo, sem passar por bytes em memória.
+"""
+
+import gzip
+import math
+import os
+import tempfile
+import time
+
+from formatos import exportar_feather, exportar_parquet
+
+# zstd vem do pyarrow (já usado nos formatos colunares), quando disponível
+ZSTD_AVAILABLE = False
+try:
+    import pyarrow as pa
+    ZSTD_AVAILABLE = pa.Codec.is_available('zstd')
+except ImportError:
+    pass
+
+# openpyxl é opcional: sem ele, o Excel fica indisponível
+OPENPYXL_AVAILABLE = False
+try:
+    from openpyxl import Workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    pass
+
+TAMANHO_BLOCO = 100_000
+
+# Arquivos gerados pelo Centro de Exportação (apagados por idade em limpar_exportacoes_antigas)
+DIRETORIO_EXPORTACOES = os.path.join(tempfile.gettempdir(), 'datainsight_exportacoes')
+
+# Formatos colunares, gravados de uma vez pelo pyarrow (com a compressão do próprio formato)
+FORMATOS_BINARIOS = ('parquet', 'feather')
+
+FORMATOS_DATA = {
+    'ISO (YYYY-MM-DD)': '%Y-%m-%d',
+    'BR (DD/MM/YYYY)': '%d/%m/%Y',
+    'US (MM/DD/YYYY)': '%m/%d/%Y'
+}
+
+EXTENSOES_COMPRESSAO = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Limite de linhas por aba do Excel, contando o cabeçalho
+EXCEL_MAX_LINHAS = 1_048_576
+
+
+def compressoes_disponiveis():
+    return [None, 'gzip'] + (['zstd'] if ZSTD_AVAILABLE else [])
+
+
+def abrir_destino(caminho, compressao=None):
+    """Arquivo binário de escrita, comprimido conforme `compressao`"""
+    if compressao is None:
+        return open(caminho, 'wb')
+    if compressao == 'gzip':
+        # Nível 3: ~2,5x mais rápido que o 6 e arquivo só ~10% maior em texto tabular
+        return gzip.open(caminho, 'wb', compresslevel=3)
+    if compressao == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ImportError("Compressão zstd requer pyarrow com suporte a zstd (pip install pyarrow)")
+        return pa.CompressedOutputStream(caminho, 'zstd')
+    raise ValueError(f"Compressão não suportada: {compressao}")
+
+
+def _formatar_datas(bloco, formato_data):
+    """Datas como texto no formato pedido (JSON só conhece epoch/ISO)"""
+    colunas = bloco.select_dtypes(include=['datetime', 'datetimetz']).columns
+    if formato_data is None or len(colunas) == 0:
+        return bloco
+    bloco = bloco.copy()
+    for col in colunas:
+        bloco[col] = bloco[col].dt.strftime(formato_data)
+    return bloco
+
+
+def escrever_csv(df, destino, incluir_indice=False, formato_data=None, decimal='.',
+                 tamanho_bloco=TAMANHO_BLOCO):
+    """Escreve df em CSV no arquivo binário `destino`, um bloco por vez"""
+    # Com vírgula decimal, o separador de campos passa a ser ';' (padrão brasileiro)
+    separador = ';' if decimal == ',' else ','
+    for inicio in range(0, max(len(df), 1), tamanho_bloco):
+        bloco = df.iloc[inicio:inicio + tamanho_bloco]
+        texto = bloco.to_csv(index=incluir_indice, header=inicio == 0, sep=separador,
+                             decimal=decimal, date_format=formato_data)
+        destino.write(texto.encode('utf-8'))
+
+
+def escrever_json(df, destino, incluir_indice=False, formato_data=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Escreve df como array JSON de registros, um bloco por vez (números sempre com ponto)"""
+    destino.write(b'[')
+    for inicio in range(0, len(df), tamanho_bloco):
+        bloco = df.iloc[inicio:inicio + tamanho_bloco]
+        if incluir_indice:
+            bloco = bloco.reset_index()
+        texto = _formatar_datas(bloco, formato_data).to_json(orient='records', indent=2, date_format='iso')
+        # Cada bloco é um array completo: remove os colchetes e emenda com vírgula
+        miolo = texto.strip()[1:-1].strip('\n')
+        if miolo:
+            destino.write((',\n' if inicio else '\n').encode('utf-8') + miolo.encode('utf-8'))
+    destino.write(b'\n]' if len(df) else b']')
+
+
+def _linhas_excel(bloco):
+    """Linhas do bloco como tuplas de objetos Python; ausentes viram células vazias"""
+    objetos = bloco.astype(object)
+    return objetos.where(bloco.notna(), None).itertuples(index=False, name=None)
+
+
+def escrever_excel(df, caminho, estatisticas=None, analise_ia=None, incluir_indice=False,
+                   tamanho_bloco=TAMANHO_BLOCO, max_linhas=EXCEL_MAX_LINHAS):
+    """Grava o workbook em modo write-only (memória constante); devolve o número de abas de dados
+
+    Os dados vão para 'Dados', 'Dados_2', ... com no máximo max_linhas por aba;
+    depois vêm as abas 'Estatísticas' e 'Análise_IA', quando informadas.
+    """
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("openpyxl é necessário para exportar Excel (pip install openpyxl)")
+
+    livro = Workbook(write_only=True)
+    cabecalho = [str(c) for c in (df.head(0).reset_index() if incluir_indice else df).columns]
+    por_aba = max_linhas - 1
+    n_abas = max(1, math.ceil(len(df) / por_aba))
+    for aba in range(n_abas):
+        planilha = livro.create_sheet('Dados' if aba == 0 else f'Dados_{aba + 1}')
+        planilha.append(cabecalho)
+        fim = min(len(df), (aba + 1) * por_aba)
+        for inicio in range(aba * por_aba, fim, tamanho_bloco):
+            bloco = df.iloc[inicio:min(inicio + tamanho_bloco, fim)]
+            for linha in _linhas_excel(bloco.reset_index() if incluir_indice else bloco):
+                planilha.append(linha)
+
+    if estatisticas is not None and not estatisticas.empty:
+        planilha = livro.create_sheet('Estatísticas')
+        planilha.append([''] + [str(c) for c in estatisticas.columns])
+        for rotulo, linha in zip(estatisticas.index, _linhas_excel(estatisticas)):
+            planilha.append([str(rotulo), *linha])
+
+    if analise_ia:
+        planilha = livro.create_sheet('Análise_IA')
+        planilha.append(['Análise_IA'])
+        planilha.append([analise_ia])
+
+    livro.save(caminho)
+    return n_abas
+
+
+def exportar_em_arquivo(df, formato, compressao=None, incluir_indice=False, formato_data=None, decimal='.',
+                        tamanho_bloco=TAMANHO_BLOCO, estatisticas=None, analise_ia=None):
+    """Exporta df ('csv', 'json', 'xlsx', 'parquet' ou 'feather') para um arquivo temporário;
+    devolve (caminho, estatísticas)
+
+    O xlsx já é um zip e os formatos colunares têm compressão própria: a
+    compressão é ignorada, assim como o formato de data e o separador decimal
+    (o Excel formata conforme a localidade; Parquet e Feather guardam tipos).
+    """
+    if formato in ('xlsx',) + FORMATOS_BINARIOS:
+        compressao = None
+    os.makedirs(DIRETORIO_EXPORTACOES, exist_ok=True)
+    descritor, caminho = tempfile.mkstemp(prefix='datainsight_', suffix=f".{formato}{EXTENSOES_COMPRESSAO[compressao]}",
+                                          dir=DIRETORIO_EXPORTACOES)
+    os.close(descritor)
+    inicio = time.perf_counter()
+    extras = {}
+    try:
+        if formato == 'xlsx':
+            extras['abas'] = escrever_excel(df, caminho, estatisticas, analise_ia, incluir_indice, tamanho_bloco)
+        elif formato == 'parquet':
+            exportar_parquet(df, index=incluir_indice, destino=caminho)
+        elif formato == 'feather':
+            exportar_feather(df, destino=caminho, index=incluir_indice)
+        else:
+            with abrir_destino(caminho, compressao) as destino:
+                if formato == 'csv':
+                    escrever_csv(df, destino, incluir_indice, formato_data, decimal, tamanho_bloco)
+                elif formato == 'json':
+                    escrever_json(df, destino, incluir_indice, formato_data, tamanho_bloco)
+                else:
+                    raise ValueError(f"Formato de exportação não suportado: {formato}")
+    except Exception:
+        os.remove(caminho)
+        raise
+    segundos = time.perf_counter() - inicio
+    return caminho, {'registros': len(df), 'bytes': os.path.getsize(caminho), 'segundos': segundos,
+                     'registros_por_s': len(df) / segundos if segundos > 0 else float('inf'), **extras}
+
+
+def remover_arquivo(caminho):
+    """Apaga um arquivo exportado anteriormente, se ainda existir"""
+    if caminho and os.path.exists(caminho):
+        os.remove(caminho)
+
+
+def limpar_exportacoes_antigas(idade_maxima_s, diretorio=None):
+    """Apaga exportações mais antigas que idade_maxima_s (de sessões encerradas ou abandonadas);
+    devolve quantas foram removidas"""
+    diretorio = diretorio or DIRETORIO_EXPORTACOES
+    if not os.path.isdir(diretorio):
+        return 0
+    limite = time.time() - idade_maxima_s
+    removidos = 0
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        try:
+            if nome.startswith('datainsight_') and os.path.getmtime(caminho) < limite:
+                os.remove(caminho)
+                removidos += 1
+        except OSError:
+            # Removido por outro processo ou em uso: fica para a próxima limpeza
+            pass
+    return removidos
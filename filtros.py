@@ -0,0 +1,233 @@
+"""
+Motor de filtros do Explorador do DataInsight AI
+Mantém os agregados dos dados filtrados de forma incremental: parciais por
+categoria para o filtro categórico e índices ordenados com somas acumuladas
+para o filtro de faixa numérica, sem refazer máscaras sobre o DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _codificar(serie):
+    """Códigos inteiros não negativos e rótulos de uma coluna (NaN vira um rótulo próprio)"""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy().astype('int64')
+        rotulos = list(serie.cat.categories)
+        if (codigos < 0).any():
+            codigos[codigos < 0] = len(rotulos)
+            rotulos.append(np.nan)
+        return codigos, pd.Index(rotulos, dtype=object)
+    codigos, rotulos = pd.factorize(serie, use_na_sentinel=False)
+    return codigos.astype('int64'), pd.Index(rotulos, dtype=object)
+
+
+def _acumular(matriz):
+    """Somas acumuladas com uma linha de zeros no início"""
+    acumulado = np.zeros((len(matriz) + 1, matriz.shape[1]))
+    np.cumsum(matriz, axis=0, out=acumulado[1:])
+    return acumulado
+
+
+class MotorFiltros:
+    """Filtro categórico + faixa numérica com agregados mantidos incrementalmente"""
+
+    def __init__(self, df, medidas=None):
+        self.df = df
+        if medidas is None:
+            medidas = [c for c in df.select_dtypes(include=[np.number]).columns if c != 'id']
+        self.medidas = [m for m in medidas if m in df.columns]
+        # Medidas sem NaN para que as somas coincidam com Series.sum()
+        self._valores = np.column_stack(
+            [np.nan_to_num(df[m].to_numpy(dtype='float64')) for m in self.medidas]
+        ) if self.medidas else np.zeros((len(df), 0))
+
+        self._codigos = {}
+        self._parciais = {}
+        self._ordens = {}
+        self._ordens_por_categoria = {}
+
+        self.coluna_categoria = None
+        self.categorias = None
+        self.coluna_faixa = None
+        self.faixa = None
+        self._contagem = len(df)
+        self._somas = self._valores.sum(axis=0)
+
+    # Estruturas pré-computadas (construídas na primeira vez que cada coluna é usada)
+
+    def _codigos_de(self, coluna):
+        if coluna not in self._codigos:
+            self._codigos[coluna] = _codificar(self.df[coluna])
+        return self._codigos[coluna]
+
+    def _parciais_de(self, coluna):
+        """Contagem e somas das medidas por categoria"""
+        if coluna not in self._parciais:
+            codigos, rotulos = self._codigos_de(coluna)
+            k = len(rotulos)
+            contagens = np.bincount(codigos, minlength=k)
+            somas = np.column_stack(
+                [np.bincount(codigos, weights=self._valores[:, i], minlength=k)
+                 for i in range(len(self.medidas))]
+            ) if self.medidas else np.zeros((k, 0))
+            self._parciais[coluna] = (contagens, somas)
+        return self._parciais[coluna]
+
+    def _ordem_de(self, coluna):
+        """Posições ordenadas pelo valor da coluna, valores ordenados e somas acumuladas"""
+        if coluna not in self._ordens:
+            valores = self.df[coluna].to_numpy(dtype='float64')
+            ordem = np.argsort(valores, kind='stable')
+            self._ordens[coluna] = (ordem, valores[ordem], _acumular(self._valores[ordem]))
+        return self._ordens[coluna]
+
+    def _ordem_por_categoria(self, coluna_categoria, coluna):
+        """Índice ordenado por (categoria, valor) com os limites de cada categoria"""
+        chave = (coluna_categoria, coluna)
+        if chave not in self._ordens_por_categoria:
+            codigos, rotulos = self._codigos_de(coluna_categoria)
+            valores = self.df[coluna].to_numpy(dtype='float64')
+            ordem = np.lexsort((valores, codigos))
+            limites = np.searchsorted(codigos[ordem], np.arange(len(rotulos) + 1))
+            self._ordens_por_categoria[chave] = (
+                ordem, valores[ordem], _acumular(self._valores[ordem]), limites
+            )
+        return self._ordens_por_categoria[chave]
+
+    # Contribuição de cada parte do filtro
+
+    def _intervalo(self, valores_ordenados, inicio, fim):
+        minimo, maximo = self.faixa
+        esquerda = inicio + np.searchsorted(valores_ordenados[inicio:fim], minimo, side='left')
+        direita = inicio + np.searchsorted(valores_ordenados[inicio:fim], maximo, side='right')
+        return esquerda, direita
+
+    def _contribuicao(self, codigos):
+        """Contagem e somas das categorias indicadas dentro da faixa atual"""
+        if self.coluna_faixa is None:
+            contagens, somas = self._parciais_de(self.coluna_categoria)
+            return int(contagens[codigos].sum()), somas[codigos].sum(axis=0)
+
+        _, valores, acumulado, limites = self._ordem_por_categoria(self.coluna_categoria, self.coluna_faixa)
+        contagem = 0
+        somas = np.zeros(len(self.medidas))
+        for codigo in codigos:
+            esquerda, direita = self._intervalo(valores, limites[codigo], limites[codigo + 1])
+            contagem += int(direita - esquerda)
+            somas += acumulado[direita] - acumulado[esquerda]
+        return contagem, somas
+
+    def _recalcular(self):
+        if self.coluna_categoria is not None:
+            self._contagem, self._somas = self._contribuicao(sorted(self.categorias))
+        elif self.coluna_faixa is not None:
+            _, valores, acumulado = self._ordem_de(self.coluna_faixa)
+            esquerda, direita = self._intervalo(valores, 0, len(valores))
+            self._contagem = int(direita - esquerda)
+            self._somas = acumulado[direita] - acumulado[esquerda]
+        else:
+            self._contagem = len(self.df)
+            self._somas = self._valores.sum(axis=0)
+
+    # API pública
+
+    def definir_categorias(self, coluna, valores):
+        """Filtra a coluna pelos valores indicados; None remove o filtro categórico"""
+        if coluna is None or valores is None:
+            if self.coluna_categoria is not None:
+                self.coluna_categoria, self.categorias = None, None
+                self._recalcular()
+            return self
+
+        codigos, rotulos = self._codigos_de(coluna)
+        indices = rotulos.get_indexer(pd.Index(list(valores), dtype=object))
+        novas = set(int(i) for i in indices if i >= 0)
+
+        if coluna != self.coluna_categoria:
+            self.coluna_categoria, self.categorias = coluna, novas
+            self._recalcular()
+            return self
+
+        # Mesma coluna: só soma/subtrai as categorias que entraram/saíram
+        adicionadas = sorted(novas - self.categorias)
+        removidas = sorted(self.categorias - novas)
+        if adicionadas:
+            contagem, somas = self._contribuicao(adicionadas)
+            self._contagem += contagem
+            self._somas = self._somas + somas
+        if removidas:
+            contagem, somas = self._contribuicao(removidas)
+            self._contagem -= contagem
+            self._somas = self._somas - somas
+        self.categorias = novas
+        return self
+
+    def definir_faixa(self, coluna, minimo=None, maximo=None):
+        """Mantém apenas registros com minimo <= coluna <= maximo; coluna None remove o filtro"""
+        nova = None if coluna is None else (float(minimo), float(maximo))
+        if coluna != self.coluna_faixa or nova != self.faixa:
+            self.coluna_faixa, self.faixa = coluna, nova
+            self._recalcular()
+        return self
+
+    @property
+    def ativo(self):
+        return self.coluna_categoria is not None or self.coluna_faixa is not None
+
+    @property
+    def n_registros(self):
+        return self._contagem
+
+    def soma(self, medida):
+        """Soma da medida nos registros filtrados"""
+        return self._somas[self.medidas.index(medida)]
+
+    def posicoes(self):
+        """Posições (em ordem crescente) dos registros que passam pelos filtros"""
+        if self.coluna_faixa is None:
+            if self.coluna_categoria is None:
+                return np.arange(len(self.df))
+            codigos, _ = self._codigos_de(self.coluna_categoria)
+            return np.flatnonzero(np.isin(codigos, sorted(self.categorias)))
+
+        if self.coluna_categoria is None:
+            ordem, valores, _ = self._ordem_de(self.coluna_faixa)
+            esquerda, direita = self._intervalo(valores, 0, len(valores))
+            return np.sort(ordem[esquerda:direita])
+
+        ordem, valores, _, limites = self._ordem_por_categoria(self.coluna_categoria, self.coluna_faixa)
+        partes = []
+        for codigo in sorted(self.categorias):
+            esquerda, direita = self._intervalo(valores, limites[codigo], limites[codigo + 1])
+            partes.append(ordem[esquerda:direita])
+        return np.sort(np.concatenate(partes)) if partes else np.empty(0, dtype='int64')
+
+    def filtrar(self):
+        """DataFrame filtrado (o próprio DataFrame quando não há filtros)"""
+        if not self.ativo:
+            return self.df
+        return self.df.iloc[self.posicoes()]
+
+    def agregar(self, dimensao, medida):
+        """Soma da medida por valor da dimensão nos registros filtrados"""
+        codigos, rotulos = self._codigos_de(dimensao)
+        i = self.medidas.index(medida)
+        if self.coluna_faixa is None and self.coluna_categoria in (None, dimensao):
+            contagens, somas = self._parciais_de(dimensao)
+            presentes = contagens > 0
+            if self.coluna_categoria == dimensao:
+                presentes &= np.isin(np.arange(len(rotulos)), sorted(self.categorias))
+        else:
+            posicoes = self.posicoes()
+            contagens = np.bincount(codigos[posicoes], minlength=len(rotulos))
+            somas = np.bincount(codigos[posicoes], weights=self._valores[posicoes, i],
+                                minlength=len(rotulos))[:, None]
+            i = 0
+            presentes = contagens > 0
+        serie = pd.Series(somas[presentes, i], index=pd.Index(rotulos[presentes], name=dimensao), name=medida)
+        # Mesma convenção do groupby: sem o grupo NaN e rótulos ordenados
+        serie = serie[serie.index.notna()]
+        if isinstance(self.df[dimensao].dtype, pd.CategoricalDtype):
+            return serie
+        return serie.sort_index()
@@ -0,0 +1,136 @@
+"""
+Formatos colunares (Parquet / Feather / Arrow IPC) do DataInsight AI
+Leitura com projeção de colunas e filtragem por row group / record batch,
+e exportação binária para os downloads do Centro de Exportação.
+"""
+
+import io
+import os
+
+# pyarrow é opcional: sem ele, apenas CSV, Excel e JSON ficam disponíveis
+PYARROW_AVAILABLE = False
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pass
+
+# Extensões reconhecidas por formato
+EXTENSOES = {
+    '.csv': 'csv',
+    '.xlsx': 'xlsx',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'arrow',
+    '.ipc': 'arrow'
+}
+
+FORMATOS_COLUNARES = ('parquet', 'feather', 'arrow')
+
+
+def formato_do_arquivo(nome):
+    """Identifica o formato pelo nome do arquivo"""
+    extensao = os.path.splitext(nome.lower())[1]
+    formato = EXTENSOES.get(extensao)
+    if formato is None:
+        raise ValueError(f"Formato não suportado: '{extensao or nome}'")
+    return formato
+
+
+def _exigir_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow é necessário para arquivos Parquet/Feather/Arrow (pip install pyarrow)")
+
+
+def _rebobinar(fonte):
+    if hasattr(fonte, 'seek'):
+        fonte.seek(0)
+
+
+def colunas_disponiveis(fonte, formato):
+    """Lê apenas o schema do arquivo colunar e devolve os nomes das colunas"""
+    _exigir_pyarrow()
+    _rebobinar(fonte)
+    if formato == 'parquet':
+        nomes = pq.read_schema(fonte).names
+    else:
+        nomes = ipc.open_file(fonte).schema.names
+    _rebobinar(fonte)
+    return [nome for nome in nomes if not nome.startswith('__index_level_')]
+
+
+def interpretar_valor(texto):
+    """Converte o valor digitado em filtro para int, float ou texto"""
+    for tipo in (int, float):
+        try:
+            return tipo(texto)
+        except ValueError:
+            continue
+    return texto
+
+
+def _expressao_filtros(filtros):
+    """Converte filtros no formato [(coluna, op, valor), ...] em expressão do pyarrow"""
+    if not filtros:
+        return None
+    return pq.filters_to_expression(filtros)
+
+
+def ler_colunar(fonte, formato, colunas=None, filtros=None):
+    """Lê Parquet/Feather/Arrow lendo só as colunas e os blocos necessários
+
+    filtros segue a convenção do pyarrow: [('regiao', '==', 'Norte'), ('vendas', '>', 1000)].
+    No Parquet, row groups cujas estatísticas não satisfazem o filtro nem são lidos;
+    no Feather/Arrow IPC, o filtro é aplicado record batch a record batch.
+    """
+    _exigir_pyarrow()
+    _rebobinar(fonte)
+
+    if formato == 'parquet':
+        tabela = pq.read_table(fonte, columns=colunas, filters=filtros or None)
+    elif formato in ('feather', 'arrow'):
+        expressao = _expressao_filtros(filtros)
+        leitor = ipc.open_file(fonte)
+        lotes = []
+        for i in range(leitor.num_record_batches):
+            lote = leitor.get_batch(i)
+            if expressao is not None:
+                lote = pa.Table.from_batches([lote]).filter(expressao)
+            else:
+                lote = pa.Table.from_batches([lote])
+            if colunas is not None:
+                lote = lote.select(colunas)
+            lotes.append(lote)
+        if lotes:
+            tabela = pa.concat_tables(lotes)
+        else:
+            schema = leitor.schema if colunas is None else pa.schema([leitor.schema.field(c) for c in colunas])
+            tabela = schema.empty_table()
+    else:
+        raise ValueError(f"Formato não colunar: '{formato}'")
+
+    return tabela.to_pandas()
+
+
+def exportar_parquet(df, index=False, compressao='zstd', destino=None):
+    """Serializa o DataFrame em Parquet no destino (caminho); sem destino, devolve os bytes"""
+    _exigir_pyarrow()
+    buffer = io.BytesIO() if destino is None else destino
+    df.to_parquet(buffer, index=index, compression=compressao)
+    return buffer.getvalue() if destino is None else None
+
+
+def exportar_feather(df, compressao='lz4', destino=None, index=False):
+    """Serializa o DataFrame em Feather v2 (Arrow IPC) no destino (caminho); sem destino, devolve os bytes"""
+    _exigir_pyarrow()
+    buffer = io.BytesIO() if destino is None else destino
+    tabela = pa.Table.from_pandas(df, preserve_index=index)
+    feather.write_feather(tabela, buffer, compression=compressao)
+    return buffer.getvalue() if destino is None else None
@@ -0,0 +1,337 @@
+"""
+Gerador vetorizado de dados de vendas sintéticos para o DataInsight AI
+Compartilhado por app.py, app_graficos_robustos.py e dados_exemplo.py.
+Escala para dezenas de milhões de registros gerando em blocos com NumPy.
+
+Execute: python gerador_dados.py 10000000 --perfil app --saida vendas.parquet
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+MESES_CURTOS = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+# Perfis: cada um reproduz o schema e as regras de um dos geradores originais
+PERFIS = {
+    # app.py
+    'app': {
+        'vendedores': [
+            'João Silva', 'Maria Santos', 'Pedro Costa', 'Ana Lima', 'Carlos Rocha',
+            'Lucia Ferreira', 'Roberto Alves', 'Fernanda Dias', 'Marcos Oliveira',
+            'Patricia Souza', 'Ricardo Mendes', 'Juliana Castro', 'Gabriel Torres',
+            'Camila Ribeiro', 'Diego Martins', 'Beatriz Gomes'
+        ],
+        'produtos': [
+            'iPhone 15 Pro', 'MacBook Air M2', 'iPad Pro', 'Apple Watch Ultra',
+            'Samsung Galaxy S24', 'Dell XPS 13', 'Surface Pro 9', 'PlayStation 5',
+            'Xbox Series X', 'Nintendo Switch', 'AirPods Pro', 'Sony WH-1000XM5',
+            'Canon EOS R6', 'GoPro Hero 12', 'Tesla Model Y', 'Drone DJI Mini 4'
+        ],
+        'regioes': ['Norte', 'Sul', 'Leste', 'Oeste', 'Centro'],
+        'meses': MESES_CURTOS,
+        'canais': ['Online', 'Loja Física', 'Marketplace', 'App Mobile', 'Telefone'],
+        # categoria -> (distribuição, parâmetro 1, parâmetro 2)
+        'categorias': {
+            'Eletrônicos': ('normal', 45000, 15000),
+            'Informática': ('normal', 35000, 12000),
+            'Games': ('normal', 25000, 8000),
+            'Acessórios': ('normal', 15000, 5000),
+            'Automotivo': ('normal', 85000, 25000)
+        },
+        'vendas_minima': 2000,
+        'fator_custo': (0.35, 0.65),
+        # (margem acima de, valores, probabilidades), avaliadas em ordem
+        'satisfacao': [
+            (45, [4, 5], [0.2, 0.8]),
+            (30, [3, 4, 5], [0.1, 0.4, 0.5]),
+            (15, [2, 3, 4], [0.2, 0.5, 0.3]),
+            (-np.inf, [1, 2, 3], [0.4, 0.4, 0.2])
+        ],
+        # (vendas acima de, limite superior exclusivo da quantidade)
+        'quantidade': [(50000, 5), (20000, 15), (-np.inf, 50)],
+        'sazonalidade': {},
+        'desconto_maximo': 0.35,
+        'tempo_entrega': (1, 21),
+        'avaliacao': True,
+        'idade_cliente': (18, 70),
+        'extras': {},
+        'data_venda': False,
+        'derivadas': ['ticket_medio', 'roi', 'score_cliente']
+    },
+    # app_graficos_robustos.py
+    'robusto': {
+        'vendedores': [
+            'João Silva', 'Maria Santos', 'Pedro Costa', 'Ana Lima', 'Carlos Rocha',
+            'Lucia Ferreira', 'Roberto Alves', 'Fernanda Dias', 'Marcos Oliveira',
+            'Patricia Souza', 'Ricardo Mendes', 'Juliana Castro', 'Gabriel Torres',
+            'Camila Ribeiro', 'Diego Martins', 'Beatriz Gomes', 'Leonardo Pereira',
+            'Isabela Cardoso', 'Thiago Barbosa', 'Natalia Ramos'
+        ],
+        'produtos': [
+            'iPhone 15 Pro Max', 'MacBook Pro M3', 'iPad Air', 'Apple Watch Ultra 2',
+            'Samsung Galaxy S24 Ultra', 'Dell XPS 15', 'Surface Pro 10', 'PlayStation 5',
+            'Xbox Series X', 'Nintendo Switch OLED', 'AirPods Pro 2', 'Sony WH-1000XM5',
+            'Canon EOS R6 Mark II', 'GoPro Hero 12', 'Tesla Model 3', 'Drone DJI Air 3',
+            'Monitor LG 4K', 'Teclado Mecânico', 'Mouse Gamer', 'Webcam 4K'
+        ],
+        'regioes': ['Norte', 'Sul', 'Leste', 'Oeste', 'Centro', 'Nordeste'],
+        'meses': MESES_CURTOS,
+        'canais': ['Online', 'Loja Física', 'Marketplace', 'App Mobile', 'Telefone', 'WhatsApp'],
+        'categorias': {
+            'Eletrônicos': ('lognormal', 10.5, 0.8),
+            'Informática': ('lognormal', 10.2, 0.7),
+            'Games': ('lognormal', 9.8, 0.6),
+            'Acessórios': ('lognormal', 8.8, 0.4),
+            'Automotivo': ('lognormal', 11.2, 1.0),
+            'Casa': ('lognormal', 9.5, 0.5)
+        },
+        'vendas_minima': 1000,
+        'fator_custo': (0.30, 0.70),
+        'satisfacao': [
+            (50, [4, 5], [0.2, 0.8]),
+            (35, [3, 4, 5], [0.1, 0.3, 0.6]),
+            (20, [2, 3, 4], [0.2, 0.5, 0.3]),
+            (-np.inf, [1, 2, 3], [0.4, 0.4, 0.2])
+        ],
+        'quantidade': [(80000, 3), (30000, 8), (10000, 20), (-np.inf, 100)],
+        # Black Friday e Natal em alta, início do ano em baixa (aplicado após o lucro)
+        'sazonalidade': {
+            'Nov': (1.2, 1.8), 'Dez': (1.2, 1.8),
+            'Jan': (0.7, 0.9), 'Fev': (0.7, 0.9)
+        },
+        'desconto_maximo': 0.40,
+        'tempo_entrega': (1, 30),
+        'avaliacao': True,
+        'idade_cliente': (18, 75),
+        'extras': {
+            'cidade': (['São Paulo', 'Rio de Janeiro', 'Belo Horizonte', 'Salvador', 'Brasília',
+                        'Fortaleza', 'Manaus', 'Curitiba', 'Recife', 'Porto Alegre'], None),
+            'forma_pagamento': (['Cartão Crédito', 'Cartão Débito', 'PIX', 'Boleto', 'Dinheiro'],
+                                [0.4, 0.2, 0.25, 0.1, 0.05])
+        },
+        'data_venda': False,
+        'derivadas': ['ticket_medio', 'roi', 'score_cliente', 'vendas_por_dia', 'eficiencia']
+    },
+    # dados_exemplo.py
+    'exemplo': {
+        'vendedores': [
+            'João Silva', 'Maria Santos', 'Pedro Costa', 'Ana Lima',
+            'Carlos Rocha', 'Lucia Ferreira', 'Roberto Alves', 'Fernanda Dias',
+            'Marcos Oliveira', 'Patricia Souza', 'Ricardo Mendes', 'Juliana Castro'
+        ],
+        'produtos': [
+            'Smartphone Pro', 'Laptop Gamer', 'Tablet Ultra', 'Smartwatch Fit',
+            'Fones Bluetooth', 'Camera Digital', 'Console Game', 'Monitor 4K',
+            'Teclado Mecânico', 'Mouse Gamer', 'SSD 1TB', 'Placa de Vídeo'
+        ],
+        'regioes': ['Norte', 'Sul', 'Leste', 'Oeste', 'Centro'],
+        'meses': [
+            'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+            'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
+        ],
+        'canais': ['Online', 'Loja Física', 'Marketplace', 'Telefone', 'App Mobile'],
+        'categorias': {
+            'Eletrônicos': ('normal', 25000, 8000),
+            'Informática': ('normal', 35000, 12000),
+            'Games': ('normal', 15000, 5000),
+            'Acessórios': ('normal', 8000, 3000),
+            'Mobile': ('normal', 20000, 7000)
+        },
+        'vendas_minima': 1000,
+        'fator_custo': (0.4, 0.7),
+        'satisfacao': [
+            (40, [4, 5], [0.3, 0.7]),
+            (25, [3, 4, 5], [0.2, 0.5, 0.3]),
+            (-np.inf, [1, 2, 3], [0.3, 0.4, 0.3])
+        ],
+        'quantidade': [(-np.inf, 50)],
+        'sazonalidade': {},
+        'desconto_maximo': 0.30,
+        # Tempo de entrega por canal; Loja Física é retirada imediata
+        'tempo_entrega': {'Online': (1, 7), 'Loja Física': (0, 1), None: (2, 15)},
+        'avaliacao': False,
+        'idade_cliente': None,
+        'extras': {},
+        'data_venda': ('2024-01-01', '2024-12-31'),
+        'derivadas': []
+    }
+}
+
+
+def _escolher(rng, valores, n, p=None):
+    """Sorteio vetorizado que devolve Categorical (evita milhões de objetos str)"""
+    codigos = rng.choice(len(valores), size=n, p=p)
+    return pd.Categorical.from_codes(codigos, categories=list(dict.fromkeys(valores)))
+
+
+def _por_faixa(rng, referencia, faixas, sortear):
+    """Aplica regras do tipo 'acima de limiar' em ordem, sem loop por registro"""
+    resultado = np.empty(len(referencia), dtype=np.int64)
+    pendente = np.ones(len(referencia), dtype=bool)
+    for limiar, *parametros in faixas:
+        mascara = pendente & (referencia > limiar)
+        if mascara.any():
+            resultado[mascara] = sortear(mascara.sum(), *parametros)
+        pendente &= ~mascara
+    return resultado
+
+
+def _gerar_bloco(rng, n, perfil, id_inicial):
+    """Gera um bloco de n registros do perfil"""
+    nomes_categorias = list(perfil['categorias'])
+    cod_categoria = rng.integers(len(nomes_categorias), size=n)
+    distribuicoes = [perfil['categorias'][c] for c in nomes_categorias]
+
+    # Vendas conforme a distribuição de cada categoria
+    p1 = np.array([d[1] for d in distribuicoes])[cod_categoria]
+    p2 = np.array([d[2] for d in distribuicoes])[cod_categoria]
+    lognormal = np.array([d[0] == 'lognormal' for d in distribuicoes])[cod_categoria]
+    vendas_base = np.where(lognormal, rng.lognormal(p1, p2), rng.normal(p1, p2))
+    vendas = np.maximum(perfil['vendas_minima'], vendas_base.astype(np.int64))
+
+    custo = (vendas * rng.uniform(*perfil['fator_custo'], size=n)).astype(np.int64)
+    lucro = vendas - custo
+    margem = lucro / vendas * 100
+
+    satisfacao = _por_faixa(
+        rng, margem, perfil['satisfacao'],
+        lambda k, valores, p: rng.choice(valores, size=k, p=p)
+    )
+    quantidade = _por_faixa(
+        rng, vendas, perfil['quantidade'],
+        lambda k, limite: rng.integers(1, limite, size=k)
+    )
+
+    cod_mes = rng.integers(len(perfil['meses']), size=n)
+    for mes, (baixo, alto) in perfil['sazonalidade'].items():
+        mascara = cod_mes == perfil['meses'].index(mes)
+        vendas[mascara] = (vendas[mascara] * rng.uniform(baixo, alto, size=mascara.sum())).astype(np.int64)
+
+    canal = _escolher(rng, perfil['canais'], n)
+    if isinstance(perfil['tempo_entrega'], dict):
+        faixas = perfil['tempo_entrega']
+        padrao = faixas[None]
+        baixo = np.full(n, padrao[0])
+        alto = np.full(n, padrao[1])
+        for nome, (b, a) in faixas.items():
+            if nome is not None:
+                mascara = np.asarray(canal == nome)
+                baixo[mascara] = b
+                alto[mascara] = a
+        tempo_entrega = rng.integers(baixo, alto)
+    else:
+        tempo_entrega = rng.integers(*perfil['tempo_entrega'], size=n)
+
+    colunas = {
+        'id': np.arange(id_inicial, id_inicial + n),
+        'vendas': vendas,
+        'custo': custo,
+        'lucro': lucro,
+        'margem': margem.round(2),
+        'regiao': _escolher(rng, perfil['regioes'], n),
+        'produto': _escolher(rng, perfil['produtos'], n),
+        'categoria': pd.Categorical.from_codes(cod_categoria, categories=nomes_categorias),
+        'mes': pd.Categorical.from_codes(cod_mes, categories=perfil['meses']),
+        'vendedor': _escolher(rng, perfil['vendedores'], n),
+        'canal': canal,
+        'satisfacao': satisfacao,
+        'quantidade': quantidade,
+        'desconto': rng.uniform(0, perfil['desconto_maximo'], size=n).round(3),
+        'tempo_entrega': tempo_entrega
+    }
+    if perfil['avaliacao']:
+        colunas['avaliacao'] = rng.uniform(1, 5, size=n).round(1)
+    if perfil['idade_cliente'] is not None:
+        colunas['idade_cliente'] = rng.integers(*perfil['idade_cliente'], size=n)
+        colunas['genero'] = _escolher(rng, ['M', 'F'], n, p=[0.52, 0.48])
+    for nome, (valores, p) in perfil['extras'].items():
+        colunas[nome] = _escolher(rng, valores, n, p=p)
+    if perfil['data_venda']:
+        dias = pd.date_range(*perfil['data_venda'], freq='D').strftime('%Y-%m-%d')
+        colunas['data_venda'] = _escolher(rng, list(dias), n)
+
+    df = pd.DataFrame(colunas)
+
+    # Colunas calculadas
+    derivadas = perfil['derivadas']
+    if 'ticket_medio' in derivadas:
+        df['ticket_medio'] = df['vendas'] / df['quantidade']
+    if 'roi' in derivadas:
+        df['roi'] = (df['lucro'] / df['custo']) * 100
+    if 'score_cliente' in derivadas:
+        df['score_cliente'] = (df['satisfacao'] * 0.4 + df['avaliacao'] * 0.6).round(1)
+    if 'vendas_por_dia' in derivadas:
+        df['vendas_por_dia'] = df['vendas'] / df['tempo_entrega']
+    if 'eficiencia' in derivadas:
+        df['eficiencia'] = (df['vendas'] / (df['tempo_entrega'] + 1)).round(2)
+
+    return df
+
+
+def gerar_blocos(n_registros, perfil='app', tamanho_bloco=1_000_000, seed=42):
+    """Gera os registros em blocos reprodutíveis de até tamanho_bloco linhas"""
+    config_perfil = PERFIS[perfil]
+    n_blocos = max(1, -(-n_registros // tamanho_bloco))
+    sementes = np.random.SeedSequence(seed).spawn(n_blocos)
+    for i, semente in enumerate(sementes):
+        inicio = i * tamanho_bloco
+        n = min(tamanho_bloco, n_registros - inicio)
+        if n <= 0:
+            break
+        yield _gerar_bloco(np.random.default_rng(semente), n, config_perfil, id_inicial=inicio + 1)
+
+
+def gerar_dados_vendas(n_registros=300, perfil='app', seed=42):
+    """Gera um DataFrame de vendas sintético em memória"""
+    blocos = list(gerar_blocos(n_registros, perfil=perfil, seed=seed))
+    if len(blocos) == 1:
+        return blocos[0]
+    return pd.concat(blocos, ignore_index=True)
+
+
+def salvar_dados(caminho, n_registros, perfil='app', tamanho_bloco=1_000_000, seed=42):
+    """Grava o dataset direto em CSV ou Parquet, bloco a bloco, sem materializá-lo"""
+    formato = os.path.splitext(caminho)[1].lower()
+    if formato not in ('.csv', '.parquet'):
+        raise ValueError(f"Formato não suportado: '{formato}' (use .csv ou .parquet)")
+
+    escritor = None
+    total = 0
+    try:
+        for i, bloco in enumerate(gerar_blocos(n_registros, perfil, tamanho_bloco, seed)):
+            if formato == '.csv':
+                bloco.to_csv(caminho, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                # As categorias vêm de listas fixas do perfil, então o schema é o mesmo em todos os blocos
+                tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(caminho, tabela.schema, compression='zstd')
+                escritor.write_table(tabela)
+            total += len(bloco)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera dados de vendas sintéticos para o DataInsight AI")
+    parser.add_argument('registros', type=int, help="Número de registros a gerar")
+    parser.add_argument('--perfil', choices=sorted(PERFIS), default='app')
+    parser.add_argument('--saida', default='dados_vendas_sinteticos.csv', help="Arquivo .csv ou .parquet")
+    parser.add_argument('--bloco', type=int, default=1_000_000, help="Registros por bloco")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"🚀 Gerando {args.registros:,} registros (perfil '{args.perfil}')...")
+    inicio = time.perf_counter()
+    total = salvar_dados(args.saida, args.registros, args.perfil, args.bloco, args.seed)
+    duracao = time.perf_counter() - inicio
+    print(f"✅ {total:,} registros gravados em '{args.saida}' em {duracao:.1f}s "
+          f"({total / max(duracao, 1e-9):,.0f} registros/s)")
@@ -0,0 +1,281 @@
+"""
+Gráficos avançados do DataInsight AI
+Um construtor por gráfico, sem depender do Streamlit: cada um recebe o
+DataFrame, o cubo OLAP e seus parâmetros e devolve a figura Plotly (ou None
+quando o dataset não tem as colunas necessárias).
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from correlacao import matriz_do_dataset
+from graficos_estatisticas import (estatisticas_caixa, estatisticas_caixa_por_grupo, histograma, trace_histograma,
+                                   traces_caixa)
+from graficos_lod import GRADE_DENSIDADE, LIMITE_SVG, LIMITE_WEBGL, figura_densidade, modo_dispersao
+
+MESES_ORDEM = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+LAYOUT_PADRAO = dict(
+    height=500,
+    title_x=0.5,
+    title_font_size=20,
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(size=12)
+)
+
+
+def _tem(df, *colunas):
+    return all(col in df.columns for col in colunas)
+
+
+def grafico_vendas_regiao(df, cubo):
+    """Barras de vendas por região, coloridas pelo lucro"""
+    if not _tem(df, 'vendas', 'regiao'):
+        return None
+    vendas_regiao = cubo.tabela('regiao', ['vendas', 'lucro', 'quantidade']).reset_index()
+
+    fig = px.bar(
+        vendas_regiao,
+        x='regiao',
+        y='vendas',
+        color='lucro',
+        title='📊 Vendas e Lucro por Região',
+        text='vendas',
+        color_continuous_scale='Viridis',
+        hover_data=['lucro', 'quantidade']
+    )
+    fig.update_traces(
+        texttemplate='R$ %{text:,.0f}',
+        textposition='outside',
+        marker_line_color='white',
+        marker_line_width=2
+    )
+    fig.update_layout(**LAYOUT_PADRAO, showlegend=True, coloraxis_colorbar=dict(title="Lucro (R$)"))
+    return fig
+
+
+def grafico_distribuicao_categoria(df, cubo):
+    """Rosca com a participação de cada categoria nas vendas"""
+    if not _tem(df, 'categoria', 'vendas'):
+        return None
+    categoria_vendas = cubo.agregar('categoria', 'vendas').reset_index()
+
+    fig = px.pie(
+        categoria_vendas,
+        values='vendas',
+        names='categoria',
+        title='🥧 Distribuição de Vendas por Categoria',
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        hole=0.4
+    )
+    fig.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>Vendas: R$ %{value:,.0f}<br>Percentual: %{percent}<extra></extra>',
+        pull=[0.1 if i == 0 else 0 for i in range(len(categoria_vendas))]
+    )
+    fig.update_layout(**LAYOUT_PADRAO)
+    return fig
+
+
+def grafico_tendencia_temporal(df, cubo):
+    """Vendas e lucro mês a mês, em dois eixos"""
+    if not _tem(df, 'vendas', 'mes'):
+        return None
+    vendas_mes = cubo.tabela('mes', ['vendas', 'lucro', 'quantidade']).reindex(
+        MESES_ORDEM, fill_value=0
+    ).rename_axis('mes').reset_index()
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=vendas_mes['mes'],
+        y=vendas_mes['vendas'],
+        mode='lines+markers',
+        name='Vendas',
+        line=dict(color='#667eea', width=4),
+        marker=dict(size=10, symbol='circle'),
+        hovertemplate='<b>Vendas</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
+    ))
+    fig.add_trace(go.Scatter(
+        x=vendas_mes['mes'],
+        y=vendas_mes['lucro'],
+        mode='lines+markers',
+        name='Lucro',
+        line=dict(color='#f093fb', width=4),
+        marker=dict(size=10, symbol='diamond'),
+        yaxis='y2',
+        hovertemplate='<b>Lucro</b><br>Mês: %{x}<br>Valor: R$ %{y:,.0f}<extra></extra>'
+    ))
+    fig.update_layout(
+        **LAYOUT_PADRAO,
+        title='📈 Tendência de Vendas e Lucro por Mês',
+        xaxis_title='Mês',
+        yaxis_title='Vendas (R$)',
+        yaxis2=dict(title='Lucro (R$)', overlaying='y', side='right'),
+        hovermode='x unified',
+        legend=dict(x=0.02, y=0.98)
+    )
+    return fig
+
+
+def grafico_vendas_satisfacao(df, cubo, limite_svg=LIMITE_SVG, limite_webgl=LIMITE_WEBGL,
+                              grade=GRADE_DENSIDADE):
+    """Dispersão de vendas × satisfação por região (WebGL ou densidade em datasets grandes)"""
+    if not _tem(df, 'vendas', 'satisfacao'):
+        return None
+    modo = modo_dispersao(len(df), limite_svg, limite_webgl)
+    if modo == 'densidade':
+        fig = figura_densidade(df['satisfacao'], df['vendas'], '💫 Relação: Vendas × Satisfação',
+                               'Satisfação (1-5)', 'Vendas (R$)', grade)
+        fig.update_layout(**LAYOUT_PADRAO)
+        return fig
+
+    fig = px.scatter(
+        df,
+        x='satisfacao',
+        y='vendas',
+        color='regiao',
+        size='lucro',
+        title='💫 Relação: Vendas × Satisfação × Região',
+        hover_data=['produto', 'categoria', 'margem'],
+        color_discrete_sequence=px.colors.qualitative.Bold,
+        size_max=30,
+        render_mode='webgl' if modo == 'webgl' else 'svg'
+    )
+    fig.update_traces(
+        marker=dict(line=dict(width=1, color='white')),
+        hovertemplate='<b>%{hovertext}</b><br>Satisfação: %{x}<br>Vendas: R$ %{y:,.0f}<br>Região: %{marker.color}<extra></extra>'
+    )
+    fig.update_layout(
+        **LAYOUT_PADRAO,
+        xaxis=dict(title='Satisfação (1-5)', gridcolor='lightgray'),
+        yaxis=dict(title='Vendas (R$)', gridcolor='lightgray')
+    )
+    return fig
+
+
+def grafico_distribuicao_vendas(df, cubo, nbins=25):
+    """Histograma das vendas com box plot marginal, binados no servidor"""
+    if not _tem(df, 'vendas'):
+        return None
+    bordas, contagens = histograma(df['vendas'], nbins)
+    caixa = estatisticas_caixa(df['vendas'])
+
+    # Mesma disposição do marginal='box' do Plotly Express; sem valores, só o histograma
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.26, 0.74], vertical_spacing=0.03)
+    if caixa is not None:
+        caixa['label'] = 'vendas'
+        for trace in traces_caixa([caixa], cor='#4facfe', horizontal=True, hoverinfo='x'):
+            fig.add_trace(trace, row=1, col=1)
+    fig.add_trace(trace_histograma(
+        bordas, contagens,
+        marker=dict(color='#4facfe', line=dict(width=1, color='white')),
+        hovertemplate='<b>Faixa de Vendas</b><br>R$ %{customdata[0]:,.0f} – %{customdata[1]:,.0f}'
+                      '<br>Quantidade: %{y}<extra></extra>'
+    ), row=2, col=1)
+    fig.update_layout(**LAYOUT_PADRAO, title='📊 Distribuição de Vendas', showlegend=False, bargap=0)
+    fig.update_xaxes(title='Vendas (R$)', gridcolor='lightgray', row=2, col=1)
+    fig.update_yaxes(title='Frequência', gridcolor='lightgray', row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    return fig
+
+
+def grafico_vendas_produto(df, cubo, top_n=8):
+    """Box plot das vendas dos top_n produtos, por categoria, com quartis pré-calculados"""
+    if not _tem(df, 'vendas', 'produto'):
+        return None
+    # Pegar apenas os maiores produtos para melhor visualização
+    top_produtos = cubo.maiores('produto', 'vendas', top_n).index
+    df_top = df[df['produto'].isin(top_produtos)]
+    cores = px.colors.qualitative.Pastel
+
+    fig = go.Figure()
+    if 'categoria' in df_top.columns:
+        categorias = [c for c in pd.unique(df_top['categoria']) if pd.notna(c)]
+        for i, categoria in enumerate(categorias):
+            grupo = df_top[df_top['categoria'] == categoria]
+            for trace in traces_caixa(estatisticas_caixa_por_grupo(grupo, 'produto', 'vendas'),
+                                      nome=str(categoria), cor=cores[i % len(cores)]):
+                fig.add_trace(trace)
+    else:
+        fig.add_traces(traces_caixa(estatisticas_caixa_por_grupo(df_top, 'produto', 'vendas'), cor=cores[0]))
+    fig.update_traces(
+        hovertemplate='<b>%{x}</b><br>Vendas: R$ %{y:,.0f}<extra>%{fullData.name}</extra>',
+        selector=dict(type='box')
+    )
+    fig.update_layout(
+        **LAYOUT_PADRAO,
+        title=f'📦 Distribuição de Vendas por Produto (Top {top_n})',
+        boxmode='group',
+        scattermode='group',
+        scattergap=0.3,
+        legend_title_text='categoria',
+        xaxis=dict(title='Produto', tickangle=45, categoryorder='array', categoryarray=list(top_produtos)),
+        yaxis=dict(title='Vendas (R$)', gridcolor='lightgray')
+    )
+    return fig
+
+
+def grafico_correlacao(df, cubo, colunas=('vendas', 'lucro', 'margem', 'satisfacao', 'quantidade', 'desconto')):
+    """Heatmap de correlação entre as métricas disponíveis"""
+    if len(df.select_dtypes(include=[np.number]).columns) < 3:
+        return None
+    disponiveis = [col for col in colunas if col in df.columns]
+    if len(disponiveis) < 3:
+        return None
+    # Submatriz das somas acumuladas no cubo (todo o dataset, sem reler os dados)
+    corr_matrix = matriz_do_dataset(df, cubo, disponiveis, spearman=False).pearson(disponiveis)
+
+    fig = px.imshow(
+        corr_matrix,
+        title='🔥 Matriz de Correlação',
+        color_continuous_scale='RdBu',
+        aspect='auto',
+        text_auto=True
+    )
+    fig.update_layout(**LAYOUT_PADRAO)
+    return fig
+
+
+def grafico_top_vendedores(df, cubo, top_n=10):
+    """Funil dos top_n vendedores"""
+    if not _tem(df, 'vendedor', 'vendas'):
+        return None
+    top_vendedores = cubo.maiores('vendedor', 'vendas', top_n).reset_index()
+
+    fig = go.Figure(go.Funnel(
+        y=top_vendedores['vendedor'],
+        x=top_vendedores['vendas'],
+        textinfo="value+percent initial",
+        hovertemplate='<b>%{y}</b><br>Vendas: R$ %{x:,.0f}<extra></extra>',
+        marker=dict(
+            color=px.colors.sequential.Viridis,
+            line=dict(width=2, color='white')
+        )
+    ))
+    fig.update_layout(**LAYOUT_PADRAO, title=f'🏆 Top {top_n} Vendedores')
+    return fig
+
+
+# Ordem de exibição: id -> (construtor, parâmetros)
+GRAFICOS = {
+    'vendas_regiao': (grafico_vendas_regiao, {}),
+    'distribuicao_categoria': (grafico_distribuicao_categoria, {}),
+    'tendencia_temporal': (grafico_tendencia_temporal, {}),
+    'vendas_satisfacao': (grafico_vendas_satisfacao, {'limite_svg': LIMITE_SVG, 'limite_webgl': LIMITE_WEBGL,
+                                                      'grade': GRADE_DENSIDADE}),
+    'distribuicao_vendas': (grafico_distribuicao_vendas, {'nbins': 25}),
+    'vendas_produto': (grafico_vendas_produto, {'top_n': 8}),
+    'correlacao': (grafico_correlacao, {}),
+    'top_vendedores': (grafico_top_vendedores, {'top_n': 10}),
+}
+
+
+def construir_grafico(grafico, df, cubo, parametros=None):
+    """Figura do gráfico `grafico` com os parâmetros padrão sobrepostos por `parametros`"""
+    construtor, padrao = GRAFICOS[grafico]
+    return construtor(df, cubo, **dict(padrao, **(parametros or {})))
@@ -0,0 +1,102 @@
+"""
+Cache de figuras Plotly do DataInsight AI
+Guarda cada figura já serializada em JSON, endereçada pela versão do
+dataset, pelo gráfico e pelos seus parâmetros. O total de bytes é limitado
+e as figuras menos usadas são descartadas primeiro (LRU). Uma única
+instância atende todas as sessões do processo.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+# Marca gráficos que não se aplicam ao dataset (o construtor devolveu None)
+_SEM_FIGURA = ''
+
+
+def chave_figura(versao_dataset, grafico, parametros=None):
+    """Chave da figura: versão do dataset + id do gráfico + parâmetros"""
+    partes = json.dumps(
+        {'dataset': versao_dataset, 'grafico': grafico, 'parametros': parametros or {}},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(partes.encode('utf-8')).hexdigest()
+
+
+class CacheFiguras:
+    """LRU em memória de figuras serializadas, limitado por total de bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.faltas = 0
+        self._figuras = OrderedDict()
+        self._trava = threading.Lock()
+        # Uma trava por chave: sessões pedindo a mesma figura esperam uma única construção
+        self._construindo = {}
+
+    def __len__(self):
+        return len(self._figuras)
+
+    def __contains__(self, chave):
+        return chave in self._figuras
+
+    def obter(self, chave):
+        """JSON da figura (ou '' se o gráfico não se aplica); None se ausente"""
+        with self._trava:
+            texto = self._figuras.get(chave)
+            if texto is None:
+                self.faltas += 1
+                return None
+            self._figuras.move_to_end(chave)
+            self.acertos += 1
+            return texto
+
+    def guardar(self, chave, texto):
+        """Guarda o JSON e descarta as figuras menos usadas além do limite"""
+        tamanho = len(texto)
+        with self._trava:
+            if chave in self._figuras:
+                self.bytes_usados -= len(self._figuras.pop(chave))
+            if tamanho > self.max_bytes:
+                return
+            self._figuras[chave] = texto
+            self.bytes_usados += tamanho
+            while self.bytes_usados > self.max_bytes:
+                _, descartado = self._figuras.popitem(last=False)
+                self.bytes_usados -= len(descartado)
+
+    def obter_ou_criar(self, chave, construir):
+        """JSON da figura, chamando construir() (figura ou None) só na primeira vez"""
+        texto = self.obter(chave)
+        if texto is not None:
+            return texto
+        with self._trava:
+            trava_chave = self._construindo.setdefault(chave, threading.Lock())
+        with trava_chave:
+            with self._trava:
+                texto = self._figuras.get(chave)
+            if texto is None:
+                figura = construir()
+                texto = _SEM_FIGURA if figura is None else figura.to_json()
+                self.guardar(chave, texto)
+        with self._trava:
+            self._construindo.pop(chave, None)
+        return texto
+
+    def limpar(self):
+        with self._trava:
+            self._figuras.clear()
+            self.bytes_usados = 0
+
+
+def carregar_figura(texto):
+    """Figura Plotly a partir do JSON guardado (None se o gráfico não se aplica)"""
+    if not texto:
+        return None
+    # O JSON saiu de uma figura já validada; revalidar custa mais que construí-la
+    return go.Figure(json.loads(texto), _validate=False)
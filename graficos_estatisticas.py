@@ -0,0 +1,124 @@
+"""
+Estatísticas pré-calculadas para histogramas e box plots do DataInsight AI
+Bins e quartis são calculados aqui com NumPy/pandas e os gráficos recebem só
+o resumo: o tamanho da figura depende do número de bins e de grupos, não
+do número de linhas. As estatísticas de caixa seguem o formato aceito por
+matplotlib.axes.Axes.bxp (q1, med, q3, whislo, whishi, mean, fliers,
+label), para servirem também aos fallbacks estáticos.
+"""
+
+import numpy as np
+import pandas as pd
+
+# As estatísticas não dependem do Plotly; só os traces
+try:
+    import plotly.graph_objects as go
+    PLOTLY_AVAILABLE = True
+except ImportError:
+    PLOTLY_AVAILABLE = False
+
+# Outliers enviados por caixa (amostra aleatória quando houver mais)
+MAX_OUTLIERS = 100
+
+
+def histograma(valores, nbins=25):
+    """(bordas, contagens) de nbins faixas iguais, ignorando NaN"""
+    valores = np.asarray(valores, dtype=float)
+    valores = valores[~np.isnan(valores)]
+    if len(valores) == 0:
+        return np.array([0.0, 1.0]), np.array([0])
+    contagens, bordas = np.histogram(valores, bins=nbins)
+    return bordas, contagens
+
+
+def estatisticas_caixa_por_grupo(df, grupos, valor, max_outliers=MAX_OUTLIERS, seed=42):
+    """Lista de estatísticas de caixa por grupo (bigodes a 1,5×IQR, como o Plotly)"""
+    grupos = [grupos] if isinstance(grupos, str) else list(grupos)
+    dados = df[grupos + [valor]].dropna(subset=[valor])
+    agrupado = dados.groupby(grupos if len(grupos) > 1 else grupos[0], observed=True, sort=False)
+    codigos = agrupado.ngroup().to_numpy()
+    v = dados[valor].to_numpy(dtype=float)
+
+    # Um quantil por vez: unstack reordenaria os grupos em relação a ngroup()
+    medias = agrupado[valor].mean()
+    q1, med, q3 = (agrupado[valor].quantile(q).to_numpy() for q in [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+
+    # Bigodes: valores mais extremos dentro das cercas; o resto é outlier
+    dentro = (v >= (q1 - 1.5 * iqr)[codigos]) & (v <= (q3 + 1.5 * iqr)[codigos])
+    bigode_inf = pd.Series(v[dentro]).groupby(codigos[dentro]).min()
+    bigode_sup = pd.Series(v[dentro]).groupby(codigos[dentro]).max()
+
+    rng = np.random.default_rng(seed)
+    fora = np.flatnonzero(~dentro)
+    fora_por_grupo = pd.Series(fora).groupby(codigos[fora]).apply(np.asarray)
+
+    estatisticas = []
+    for g, rotulo in enumerate(medias.index):
+        posicoes = fora_por_grupo.get(g, np.array([], dtype=np.int64))
+        if len(posicoes) > max_outliers:
+            posicoes = np.sort(rng.choice(posicoes, max_outliers, replace=False))
+        estatisticas.append({
+            'label': rotulo,
+            'q1': q1[g], 'med': med[g], 'q3': q3[g], 'mean': medias.iloc[g],
+            'whislo': bigode_inf[g], 'whishi': bigode_sup[g],
+            'fliers': v[posicoes]
+        })
+    return estatisticas
+
+
+def estatisticas_caixa(valores, max_outliers=MAX_OUTLIERS, seed=42):
+    """Estatísticas de caixa de uma única série; None quando não há valores (vazia ou só NaN)"""
+    serie = pd.Series(np.asarray(valores, dtype=float), name='valor')
+    caixas = estatisticas_caixa_por_grupo(serie.to_frame().assign(grupo=''), 'grupo', 'valor',
+                                          max_outliers, seed)
+    return caixas[0] if caixas else None
+
+
+def trace_histograma(bordas, contagens, **kwargs):
+    """Barras do histograma já binado (uma barra por faixa, sem espaço entre elas)"""
+    return go.Bar(
+        x=(bordas[1:] + bordas[:-1]) / 2,
+        y=contagens,
+        width=np.diff(bordas),
+        customdata=np.column_stack([bordas[:-1], bordas[1:]]),
+        **kwargs
+    )
+
+
+def traces_caixa(estatisticas, nome=None, cor=None, horizontal=False, **kwargs):
+    """Box plot pré-calculado (uma caixa por grupo) e os outliers amostrados
+
+    Com layout boxmode='group' e scattermode='group', os outliers acompanham
+    o deslocamento da caixa de mesmo nome (offsetgroup).
+    """
+    rotulos = [e['label'] for e in estatisticas]
+    eixo_categoria = 'y' if horizontal else 'x'
+    caixa = go.Box(
+        **{eixo_categoria: rotulos},
+        q1=[e['q1'] for e in estatisticas],
+        median=[e['med'] for e in estatisticas],
+        q3=[e['q3'] for e in estatisticas],
+        lowerfence=[e['whislo'] for e in estatisticas],
+        upperfence=[e['whishi'] for e in estatisticas],
+        mean=[e['mean'] for e in estatisticas],
+        orientation='h' if horizontal else 'v',
+        name=nome,
+        marker_color=cor,
+        legendgroup=nome,
+        offsetgroup=nome,
+        **kwargs
+    )
+    valores = np.concatenate([e['fliers'] for e in estatisticas]) if estatisticas else np.array([])
+    categorias = np.repeat(rotulos, [len(e['fliers']) for e in estatisticas])
+    pontos = go.Scatter(
+        **{eixo_categoria: categorias, ('x' if horizontal else 'y'): valores},
+        mode='markers',
+        marker=dict(color=cor, size=4, opacity=0.6),
+        name=nome,
+        legendgroup=nome,
+        offsetgroup=nome,
+        showlegend=False,
+        hoverinfo='skip' if len(valores) == 0 else None
+    )
+    return [caixa, pontos]
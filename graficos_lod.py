@@ -0,0 +1,131 @@
+"""
+Nível de detalhe (LOD) dos gráficos do DataInsight AI
+Mantém limitado o volume enviado ao navegador, qualquer que seja o tamanho
+do dataset: dispersões passam para WebGL acima de alguns milhares de pontos
+e, acima de um teto, viram um mapa de densidade (binagem 2D feita aqui, não
+no navegador). Séries de linha longas (diárias, brutas) podem ser reduzidas
+por LTTB ou min-max; os gráficos de linha atuais já vêm agregados por mês.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Pontos por gráfico de dispersão até os quais cada modo é usado
+LIMITE_SVG = 5_000
+LIMITE_WEBGL = 50_000
+# Pontos por série de linha enviados ao navegador
+MAX_PONTOS_LINHA = 2_000
+# Células por eixo no mapa de densidade
+GRADE_DENSIDADE = 80
+
+
+def modo_dispersao(n_pontos, limite_svg=LIMITE_SVG, limite_webgl=LIMITE_WEBGL):
+    """'svg', 'webgl' ou 'densidade' conforme o número de pontos"""
+    if n_pontos <= limite_svg:
+        return 'svg'
+    if n_pontos <= limite_webgl:
+        return 'webgl'
+    return 'densidade'
+
+
+def lttb(x, y, n_saida):
+    """Índices escolhidos pelo Largest-Triangle-Three-Buckets (x crescente)
+
+    Preserva a forma visual da série: em cada balde fica o ponto que forma
+    o maior triângulo com o ponto escolhido no balde anterior e a média do
+    balde seguinte. Primeiro e último pontos são sempre mantidos.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+    bordas = np.linspace(1, n - 1, n_saida - 1).astype(int)
+    indices = np.empty(n_saida, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_saida - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        prox_fim = bordas[i + 2] if i + 2 < len(bordas) else n
+        media_x = x[fim:prox_fim].mean() if prox_fim > fim else x[-1]
+        media_y = y[fim:prox_fim].mean() if prox_fim > fim else y[-1]
+        # Área (sem o fator 1/2) do triângulo anterior–candidato–média seguinte
+        areas = np.abs((x[anterior] - media_x) * (y[inicio:fim] - y[anterior]) -
+                       (x[anterior] - x[inicio:fim]) * (media_y - y[anterior]))
+        anterior = inicio + int(np.argmax(areas))
+        indices[i + 1] = anterior
+    return indices
+
+
+def minmax(y, n_baldes):
+    """Índices do mínimo e do máximo de cada balde, em ordem (preserva picos)"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * n_baldes >= n:
+        return np.arange(n)
+    balde = np.arange(n) * n_baldes // n
+    ordem = np.lexsort((y, balde))
+    inicios = np.searchsorted(balde[ordem], np.arange(n_baldes))
+    fins = np.append(inicios[1:], n) - 1
+    return np.unique(np.concatenate([ordem[inicios], ordem[fins]]))
+
+
+def reduzir_linha(x, y, max_pontos=MAX_PONTOS_LINHA, metodo='lttb'):
+    """(x, y) com no máximo max_pontos pontos
+
+    x não numérico (meses, rótulos) é tratado pela posição.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= max_pontos:
+        return x, y
+    if metodo == 'minmax':
+        indices = minmax(y, max_pontos // 2)
+    else:
+        posicoes = x if np.issubdtype(x.dtype, np.number) else np.arange(len(x))
+        indices = lttb(posicoes, y, max_pontos)
+    return x[indices], y[indices]
+
+
+def _bordas(valores, grade):
+    """Bordas da binagem; valores discretos (ex.: notas 1-5) ganham uma célula cada"""
+    distintos = np.unique(valores)
+    if len(distintos) <= grade:
+        meios = (distintos[1:] + distintos[:-1]) / 2
+        passo = (distintos[-1] - distintos[0]) / max(len(distintos) - 1, 1) or 1.0
+        return np.concatenate([[distintos[0] - passo / 2], meios, [distintos[-1] + passo / 2]])
+    return np.linspace(distintos[0], distintos[-1], grade + 1)
+
+
+def densidade_2d(x, y, grade=GRADE_DENSIDADE):
+    """(centros_x, centros_y, contagens[y, x]) da binagem 2D, sem NaN"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    validos = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[validos], y[validos]
+    bordas_x, bordas_y = _bordas(x, grade), _bordas(y, grade)
+    contagens, _, _ = np.histogram2d(x, y, bins=[bordas_x, bordas_y])
+    centros_x = (bordas_x[1:] + bordas_x[:-1]) / 2
+    centros_y = (bordas_y[1:] + bordas_y[:-1]) / 2
+    return centros_x, centros_y, contagens.T
+
+
+def figura_densidade(x, y, titulo, titulo_x, titulo_y, grade=GRADE_DENSIDADE):
+    """Mapa de densidade com o tamanho limitado pela grade, não pelo número de pontos"""
+    centros_x, centros_y, contagens = densidade_2d(x, y, grade)
+    # Células vazias ficam transparentes
+    z = np.where(contagens > 0, contagens, np.nan)
+    fig = go.Figure(go.Heatmap(
+        x=centros_x,
+        y=centros_y,
+        z=z,
+        colorscale='Viridis',
+        colorbar=dict(title='Registros'),
+        hovertemplate=f'{titulo_x}: %{{x:,.2f}}<br>{titulo_y}: %{{y:,.0f}}<br>Registros: %{{z:,.0f}}<extra></extra>'
+    ))
+    fig.update_layout(
+        title=f"{titulo} (densidade de {int(contagens.sum()):,} registros)",
+        xaxis=dict(title=titulo_x),
+        yaxis=dict(title=titulo_y)
+    )
+    return fig
@@ -0,0 +1,39 @@
+"""
+Construção paralela de gráficos do DataInsight AI
+Cada gráfico é uma tarefa independente executada em um pool de threads; o
+chamador é avisado a cada tarefa concluída (para a barra de progresso) e
+recebe o tempo de construção de cada gráfico.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def executar_graficos(tarefas, max_trabalhadores=None, ao_concluir=None):
+    """Roda {nome: construir} em paralelo
+
+    Devolve ({nome: resultado ou exceção}, {nome: segundos}). ao_concluir(nome,
+    resultado, segundos, concluidas, total) é chamado na thread de quem
+    executa, à medida que cada gráfico fica pronto.
+    """
+    if not tarefas:
+        return {}, {}
+    max_trabalhadores = max_trabalhadores or min(len(tarefas), os.cpu_count() or 1)
+
+    def cronometrar(construir):
+        inicio = time.perf_counter()
+        try:
+            return construir(), time.perf_counter() - inicio
+        except Exception as erro:
+            return erro, time.perf_counter() - inicio
+
+    resultados, tempos = {}, {}
+    with ThreadPoolExecutor(max_workers=max_trabalhadores, thread_name_prefix='graficos') as pool:
+        futuros = {pool.submit(cronometrar, construir): nome for nome, construir in tarefas.items()}
+        for concluidas, futuro in enumerate(as_completed(futuros), start=1):
+            nome = futuros[futuro]
+            resultados[nome], tempos[nome] = futuro.result()
+            if ao_concluir is not None:
+                ao_concluir(nome, resultados[nome], tempos[nome], concluidas, len(futuros))
+    return resultados, tempos
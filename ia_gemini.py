@@ -0,0 +1,213 @@
+"""
+Integração com o Google Gemini para o DataInsight AI
+Monta os prompts a partir do dataset, chama o modelo com a configuração de
+GEMINI_CONFIG (com geração em streaming quando há quem consuma os trechos)
+e usa o cache de respostas quando disponível. Não depende do Streamlit,
+para poder ser usado fora da interface.
+"""
+
+import threading
+import time
+from functools import partial
+
+import google.generativeai as genai
+
+from cache_ia import chave_resposta
+from config import GEMINI_CONFIG
+from contexto_prompt import montar_contexto
+from executor_ia import eh_erro_de_cota
+
+# Templates dos prompts (a versão do texto faz parte da chave do cache)
+PROMPT_PERGUNTA = """\
+🤖 ANALISTA DE DADOS ESPECIALISTA
+
+PERGUNTA ESPECÍFICA: {pergunta}
+
+📊 CONTEXTO DOS DADOS:
+{contexto}
+
+🎯 INSTRUÇÕES:
+• Responda em português brasileiro
+• Seja específico e use dados reais
+• Forneça insights acionáveis
+• Use emojis para destacar pontos importantes
+• Máximo 400 palavras
+"""
+
+PROMPT_ANALISE = """\
+🤖 CONSULTOR DE NEGÓCIOS ESPECIALISTA EM DADOS
+
+📊 ANÁLISE COMPLETA DO DATASET
+
+📈 RESUMO ESTATÍSTICO DO DATASET:
+{contexto}
+
+🎯 FORNEÇA UMA ANÁLISE ESTRUTURADA:
+
+1. 📊 VISÃO GERAL DO NEGÓCIO
+• Performance geral das vendas
+• Principais características do dataset
+
+2. 🔍 INSIGHTS ESTRATÉGICOS (Top 3)
+• Descobertas mais importantes
+• Padrões identificados nos dados
+
+3. ⚠️ PONTOS DE ATENÇÃO
+• Problemas ou riscos identificados
+• Áreas que precisam de melhoria
+
+4. 🚀 RECOMENDAÇÕES PRÁTICAS (Top 3)
+• Ações específicas para melhorar resultados
+• Estratégias baseadas nos dados
+
+5. 📈 PRÓXIMOS PASSOS
+• Sugestões para análises futuras
+• KPIs para monitorar
+
+Use emojis, seja específico com números reais e forneça insights acionáveis.
+Máximo 600 palavras.
+"""
+
+PERGUNTA_INSIGHTS_RAPIDOS = "Dê 3 insights rápidos e práticos sobre estes dados"
+
+# Perguntas sugeridas no consultor (podem ser pré-calculadas em lote)
+SUGESTOES_PERGUNTAS = [
+    "Quais são as 3 principais oportunidades de crescimento?",
+    "Como posso aumentar a margem de lucro em 20%?",
+    "Que produtos devo focar para maximizar vendas?",
+    "Quais regiões têm maior potencial inexplorado?",
+    "Como melhorar a satisfação do cliente?",
+    "Que estratégias de pricing recomendam?",
+    "Quais vendedores precisam de treinamento?",
+    "Como otimizar o mix de produtos?",
+    "Que tendências sazonais identificam?",
+    "Como reduzir custos operacionais?"
+]
+
+# Parâmetros de GEMINI_CONFIG repassados como generation_config
+PARAMETROS_GERACAO = ('temperature', 'top_p', 'top_k', 'max_output_tokens')
+
+
+def montar_prompt(df, pergunta=None, cubo=None, estatisticas=None, config=GEMINI_CONFIG, contexto=None,
+                  esbocos=None):
+    """Devolve (template, prompt) para a análise completa ou para uma pergunta
+
+    contexto já montado (texto ou função que o devolve) evita recalculá-lo a partir do df.
+    """
+    template = PROMPT_PERGUNTA if pergunta else PROMPT_ANALISE
+    if callable(contexto):
+        contexto = contexto()
+    if contexto is None:
+        contexto = montar_contexto(df, cubo=cubo, estatisticas=estatisticas, esbocos=esbocos,
+                                   orcamento_tokens=config.get('prompt_token_budget', 1500))
+    return template, template.format(pergunta=pergunta, contexto=contexto)
+
+
+def _contexto_compartilhado(df, cubo=None, estatisticas=None, config=GEMINI_CONFIG, esbocos=None):
+    """Função que monta o contexto na primeira chamada e o reaproveita nas seguintes (inclusive entre threads)"""
+    trava, montado = threading.Lock(), []
+
+    def obter():
+        with trava:
+            if not montado:
+                montado.append(montar_contexto(df, cubo=cubo, estatisticas=estatisticas, esbocos=esbocos,
+                                               orcamento_tokens=config.get('prompt_token_budget', 1500)))
+        return montado[0]
+    return obter
+
+
+def configurar(api_key, config=GEMINI_CONFIG):
+    """Configura a API; com api_endpoint usa transporte REST nesse endereço (ex.: servidor falso local)"""
+    if config.get('api_endpoint'):
+        genai.configure(api_key=api_key, transport='rest',
+                        client_options={'api_endpoint': config['api_endpoint']})
+    else:
+        genai.configure(api_key=api_key)
+
+
+def criar_modelo(config=GEMINI_CONFIG):
+    """Modelo Gemini com os parâmetros de geração da configuração"""
+    geracao = {k: config[k] for k in PARAMETROS_GERACAO if k in config}
+    return genai.GenerativeModel(config['model'], generation_config=geracao)
+
+
+def _gerar(modelo, prompt, ao_receber, metricas):
+    """Gera a resposta, em streaming se houver callback; cai para a chamada bloqueante se falhar"""
+    inicio = time.perf_counter()
+    if ao_receber is not None:
+        partes = []
+        try:
+            for trecho in modelo.generate_content(prompt, stream=True):
+                texto = trecho.text
+                if not texto:
+                    continue
+                if not partes:
+                    metricas['primeiro_trecho_s'] = time.perf_counter() - inicio
+                partes.append(texto)
+                ao_receber(''.join(partes))
+        except Exception as erro:
+            # Streaming indisponível: só repete pela chamada bloqueante se nada chegou; erro de
+            # cota sobe (outra chamada gastaria mais uma requisição da cota)
+            if partes or eh_erro_de_cota(erro):
+                raise
+        else:
+            metricas['origem'] = 'streaming'
+            metricas['total_s'] = time.perf_counter() - inicio
+            # Stream só com trechos vazios: o primeiro "trecho" é o fim da resposta
+            metricas.setdefault('primeiro_trecho_s', metricas['total_s'])
+            return ''.join(partes)
+
+    resposta = modelo.generate_content(prompt).text
+    metricas['origem'] = 'bloqueante'
+    metricas['total_s'] = time.perf_counter() - inicio
+    metricas.setdefault('primeiro_trecho_s', metricas['total_s'])
+    return resposta
+
+
+def analisar(df, pergunta=None, cache=None, impressao=None, config=GEMINI_CONFIG,
+             ao_receber=None, metricas=None, cubo=None, estatisticas=None, somente_cache=False, contexto=None,
+             esbocos=None):
+    """Resposta do Gemini para o dataset; consulta e alimenta o cache se houver
+
+    ao_receber(texto_parcial) é chamado a cada trecho gerado. Se metricas for
+    um dicionário, recebe a origem da resposta (cache/streaming/bloqueante),
+    o tempo até o primeiro trecho e a latência total, em segundos. Com
+    somente_cache (modo offline), devolve None em vez de chamar a API.
+    contexto (texto ou função) substitui o contexto montado a partir do df.
+    """
+    metricas = {} if metricas is None else metricas
+    chave = None
+    if cache is not None and impressao is not None:
+        template = PROMPT_PERGUNTA if pergunta else PROMPT_ANALISE
+        chave = chave_resposta(impressao, template, pergunta, config)
+        inicio = time.perf_counter()
+        resposta = cache.obter(chave)
+        if resposta is not None:
+            metricas['origem'] = 'cache'
+            metricas['primeiro_trecho_s'] = metricas['total_s'] = time.perf_counter() - inicio
+            return resposta
+    if somente_cache:
+        metricas['origem'] = 'ausente'
+        return None
+
+    _, prompt = montar_prompt(df, pergunta, cubo, estatisticas, config, contexto, esbocos)
+    resposta = _gerar(criar_modelo(config), prompt, ao_receber, metricas)
+    if chave is not None:
+        cache.guardar(chave, resposta)
+    return resposta
+
+
+def tarefas_analises(df, cache=None, impressao=None, config=GEMINI_CONFIG, sugestoes=SUGESTOES_PERGUNTAS,
+                     cubo=None, estatisticas=None, esbocos=None):
+    """{pergunta: função} para a análise completa (None), os insights rápidos e as sugestões
+
+    O contexto do dataset é o mesmo em todos os prompts: montado uma vez, só se
+    alguma resposta não estiver no cache.
+    """
+    perguntas = [None, PERGUNTA_INSIGHTS_RAPIDOS] + [p for p in sugestoes if p]
+    contexto = _contexto_compartilhado(df, cubo, estatisticas, config, esbocos)
+    return {
+        pergunta: partial(analisar, df, pergunta, cache=cache, impressao=impressao, config=config,
+                          contexto=contexto)
+        for pergunta in perguntas
+    }
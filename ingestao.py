@@ -0,0 +1,166 @@
+"""
+Ingestão em blocos (out-of-core) para o DataInsight AI
+Lê arquivos grandes em pedaços limitados, acumulando os agregados do
+dashboard, os esboços das estatísticas, o perfil de qualidade e apenas uma
+amostra para o Explorador.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cubo import DIMENSOES_PADRAO, CuboOLAP
+from esbocos import EsbocosDataset
+from formatos import FORMATOS_COLUNARES, ler_colunar
+from leitura_json import iterar_blocos_json, ler_json
+from planilhas import iterar_blocos_excel, ler_excel
+from qualidade import PerfilQualidade
+
+
+class ResumoIngestao:
+    """Acumula agregados do dataset bloco a bloco, sem materializar o arquivo inteiro"""
+
+    # Muda quando o conteúdo guardado muda (invalida resumos antigos no cache em disco)
+    VERSAO = 5
+
+    def __init__(self, dimensoes=None, tamanho_amostra=100000, seed=42):
+        self.dimensoes = list(dimensoes) if dimensoes is not None else list(DIMENSOES_PADRAO)
+        self.tamanho_amostra = tamanho_amostra
+        self.total_registros = 0
+        self.total_blocos = 0
+        self.colunas = []
+        self.cubo = None
+        self.esbocos = EsbocosDataset()
+        self.perfil = PerfilQualidade()
+        self._amostra = None
+        self._chaves_amostra = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def atualizar(self, bloco):
+        """Incorpora um bloco (DataFrame) aos agregados"""
+        if bloco is None or bloco.empty:
+            return self
+
+        for col in bloco.columns:
+            if col not in self.colunas:
+                self.colunas.append(col)
+
+        inicio = self.total_registros
+        self.total_registros += len(bloco)
+        self.total_blocos += 1
+
+        # Ausentes, duplicatas, distintos e memória
+        self.perfil.atualizar(bloco)
+
+        numeric_cols = bloco.select_dtypes(include=[np.number]).columns
+        self.esbocos.atualizar(bloco)
+        if self.cubo is None:
+            self.cubo = CuboOLAP.para_colunas(bloco.columns, numeric_cols, dimensoes=self.dimensoes)
+        self.cubo.atualizar(bloco)
+        self._atualizar_amostra(bloco, inicio)
+        return self
+
+    def _atualizar_amostra(self, bloco, inicio):
+        """Amostragem uniforme por chaves aleatórias (bottom-k), com memória limitada"""
+        if self.tamanho_amostra <= 0:
+            return
+        chaves = self._rng.random(len(bloco))
+        if self._amostra is not None and len(self._amostra) >= self.tamanho_amostra:
+            limite = self._chaves_amostra.max()
+            selecionados = chaves < limite
+            if not selecionados.any():
+                return
+            bloco = bloco[selecionados]
+            chaves = chaves[selecionados]
+            posicoes = np.flatnonzero(selecionados) + inicio
+        else:
+            posicoes = np.arange(len(bloco)) + inicio
+
+        novo = bloco.copy()
+        novo.index = pd.Index(posicoes)
+        if self._amostra is None:
+            amostra, todas_chaves = novo, chaves
+        else:
+            amostra = pd.concat([self._amostra, novo])
+            todas_chaves = np.concatenate([self._chaves_amostra, chaves])
+
+        if len(amostra) > self.tamanho_amostra:
+            manter = np.argpartition(todas_chaves, self.tamanho_amostra - 1)[:self.tamanho_amostra]
+            amostra = amostra.iloc[manter]
+            todas_chaves = todas_chaves[manter]
+
+        self._amostra = amostra
+        self._chaves_amostra = todas_chaves
+
+    @property
+    def amostra(self):
+        """Amostra limitada, na ordem original do arquivo"""
+        if self._amostra is None:
+            return pd.DataFrame(columns=self.colunas)
+        return self._amostra.sort_index().reset_index(drop=True)
+
+    @property
+    def amostrado(self):
+        """Indica se a amostra não contém todos os registros"""
+        return self.total_registros > len(self._chaves_amostra)
+
+    def estatisticas(self):
+        """Tabela no formato de DataFrame.describe(); quartis estimados pelo esboço KLL"""
+        if not self.esbocos.momentos:
+            return pd.DataFrame()
+        return self.esbocos.describe()
+
+    @property
+    def nulos(self):
+        """Valores ausentes por coluna"""
+        return self.perfil.nulos
+
+    def memoria_estimada_mb(self):
+        """Memória que o dataset completo ocuparia se fosse carregado de uma vez"""
+        return self.perfil.memoria_mb
+
+
+def iterar_blocos_csv(fonte, tamanho_bloco=100000, encoding='utf-8', **kwargs):
+    """Itera sobre um CSV em blocos de tamanho limitado"""
+    return pd.read_csv(fonte, encoding=encoding, chunksize=tamanho_bloco, **kwargs)
+
+
+def ingerir_blocos(blocos, dimensoes=None, tamanho_amostra=100000, ao_progredir=None):
+    """Consome um iterador de blocos e devolve o ResumoIngestao preenchido"""
+    resumo = ResumoIngestao(dimensoes=dimensoes, tamanho_amostra=tamanho_amostra)
+    for bloco in blocos:
+        resumo.atualizar(bloco)
+        if ao_progredir is not None:
+            ao_progredir(resumo)
+    return resumo
+
+
+def carregar_arquivo(fonte, formato, tamanho_mb, colunas=None, filtros=None, aba=None, limite_streaming_mb=50,
+                     tamanho_bloco=100000, tamanho_amostra=100000, ao_progredir=None):
+    """Lê um arquivo (enviado ou em disco) no formato indicado; devolve (df, resumo)
+
+    CSV, Excel e JSON acima de limite_streaming_mb são lidos em blocos: df é a
+    amostra do ResumoIngestao. Nos demais casos o arquivo é lido inteiro e
+    resumo é None.
+    """
+    if tamanho_mb > limite_streaming_mb and formato in ('csv', 'xlsx', 'json', 'jsonl'):
+        # Arquivo grande: leitura em blocos, mantendo só agregados e uma amostra
+        if formato == 'csv':
+            blocos = iterar_blocos_csv(fonte, tamanho_bloco=tamanho_bloco)
+        elif formato == 'xlsx':
+            blocos = iterar_blocos_excel(fonte, aba=aba, colunas=colunas, tamanho_bloco=tamanho_bloco)
+        else:
+            blocos = iterar_blocos_json(fonte, tamanho_bloco=tamanho_bloco, linhas=formato == 'jsonl' or None)
+        resumo = ingerir_blocos(blocos, tamanho_amostra=tamanho_amostra, ao_progredir=ao_progredir)
+        return resumo.amostra, resumo
+
+    if formato == 'csv':
+        df = pd.read_csv(fonte, encoding='utf-8')
+    elif formato == 'xlsx':
+        df = ler_excel(fonte, aba=aba, colunas=colunas, tamanho_bloco=tamanho_bloco)
+    elif formato in ('json', 'jsonl'):
+        df = ler_json(fonte, tamanho_bloco=tamanho_bloco, linhas=formato == 'jsonl' or None)
+    elif formato in FORMATOS_COLUNARES:
+        df = ler_colunar(fonte, formato, colunas=colunas, filtros=filtros)
+    else:
+        raise ValueError(f"Formato não suportado: {formato}")
+    return df, None
@@ -0,0 +1,192 @@
+"""
+Leitura de JSON em blocos para o DataInsight AI
+JSON Lines (NDJSON) é lido em lotes de linhas; arrays de registros (o
+formato gerado pelo Centro de Exportação) são decodificados em pedaços,
+sem carregar o documento inteiro. Datas em ISO 8601 viram datetime e os
+tipos decididos no primeiro bloco valem para os seguintes (enquanto os
+valores continuarem sendo datas). Outras formas
+de JSON caem no pd.read_json.
+"""
+
+import io
+import json
+import re
+import warnings
+
+import pandas as pd
+
+# Caracteres de texto lidos por vez
+TAMANHO_LEITURA = 8 * 1024**2
+
+_BRANCOS = '\ufeff \t\r\n'
+_SEPARADORES = re.compile(r'[\s,]*')
+_DATA_ISO = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$')
+
+
+def _abrir_texto(fonte):
+    """(texto, fechar): leitor de texto UTF-8 sobre um caminho ou arquivo binário"""
+    if isinstance(fonte, str) or hasattr(fonte, '__fspath__'):
+        arquivo = open(fonte, 'r', encoding='utf-8')
+        return arquivo, arquivo.close
+    if hasattr(fonte, 'seek'):
+        fonte.seek(0)
+    if isinstance(fonte, io.TextIOBase):
+        return fonte, lambda: None
+    texto = io.TextIOWrapper(fonte, encoding='utf-8')
+    # detach: devolve o arquivo do chamador sem fechá-lo
+    return texto, texto.detach
+
+
+def _colunas_data(bloco):
+    """Colunas de texto cujos valores (amostra) são todos datas ISO 8601"""
+    colunas = []
+    for col in bloco.select_dtypes(include='object').columns:
+        amostra = bloco[col].dropna().head(100)
+        if len(amostra) and all(isinstance(v, str) and _DATA_ISO.match(v) for v in amostra):
+            colunas.append(col)
+    return colunas
+
+
+class _Tipagem:
+    """Converte as datas de cada bloco com a decisão tomada no primeiro
+
+    Sem coerção: se um bloco tiver um valor que não é data, a coluna deixa de
+    ser convertida dali em diante (fica como texto) e um aviso é emitido, em
+    vez de o valor virar NaT em silêncio.
+    """
+
+    def __init__(self):
+        self.datas = None
+        self.registros = 0
+
+    def __call__(self, registros):
+        bloco = pd.DataFrame.from_records(registros)
+        if self.datas is None:
+            self.datas = _colunas_data(bloco)
+        for col in list(self.datas):
+            if col not in bloco.columns:
+                continue
+            try:
+                bloco[col] = pd.to_datetime(bloco[col], format='ISO8601')
+            except (ValueError, TypeError):
+                self.datas.remove(col)
+                warnings.warn(f"Coluna '{col}': valores que não são datas ISO 8601 a partir do registro "
+                              f"{self.registros + 1:,}; mantida como texto daqui em diante")
+        self.registros += len(bloco)
+        return bloco
+
+
+def _blocos_de_linhas(texto, inicio, tamanho_bloco, tipar):
+    """JSON Lines: cada pedaço de linhas completas é decodificado de uma vez, como um array"""
+    resto, lote = '', []
+    pedaco = inicio
+    while pedaco:
+        pedaco = resto + pedaco
+        corte = pedaco.rfind('\n') + 1
+        resto = pedaco[corte:]
+        linhas = [linha for linha in pedaco[:corte].split('\n') if linha.strip()]
+        if linhas:
+            lote.extend(json.loads('[' + ','.join(linhas) + ']'))
+        while len(lote) >= tamanho_bloco:
+            yield tipar(lote[:tamanho_bloco])
+            lote = lote[tamanho_bloco:]
+        pedaco = texto.read(TAMANHO_LEITURA)
+    if resto.strip():
+        lote.append(json.loads(resto))
+    if lote:
+        yield tipar(lote)
+
+
+def _blocos_de_array(texto, buffer, tamanho_bloco, tipar):
+    """Array de registros: decodifica em massa até o último '}' do buffer; se o corte cair
+    dentro de um registro (objetos aninhados), decodifica um registro por vez"""
+    decodificador = json.JSONDecoder()
+    pos, em_massa, lote = 0, True, []
+    while True:
+        pos = _SEPARADORES.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == ']':
+            break
+        registros = None
+        if pos < len(buffer):
+            corte = buffer.rfind('}', pos) + 1
+            if em_massa and corte:
+                try:
+                    registros = json.loads('[' + buffer[pos:corte] + ']')
+                    pos = corte
+                except ValueError:
+                    em_massa = False
+            if registros is None:
+                try:
+                    registro, pos = decodificador.raw_decode(buffer, pos)
+                    registros = [registro]
+                except ValueError:
+                    pass
+        if registros is None:
+            # Registro incompleto no fim do buffer: lê mais
+            mais = texto.read(TAMANHO_LEITURA)
+            if not mais:
+                raise ValueError("JSON incompleto ou inválido: array de registros sem ']' final")
+            buffer, pos, em_massa = buffer[pos:] + mais, 0, True
+            continue
+        if registros and not isinstance(registros[0], dict):
+            raise ValueError("O array JSON não contém registros (objetos)")
+        lote.extend(registros)
+        while len(lote) >= tamanho_bloco:
+            yield tipar(lote[:tamanho_bloco])
+            lote = lote[tamanho_bloco:]
+    if lote:
+        yield tipar(lote)
+
+
+def _formato(inicio):
+    """'linhas', 'array' ou None (outra forma de JSON) pelo começo do texto"""
+    inicio = inicio.lstrip(_BRANCOS)
+    if inicio.startswith('['):
+        return 'array'
+    if not inicio.startswith('{'):
+        return None
+    try:
+        primeiro, fim = json.JSONDecoder().raw_decode(inicio)
+    except ValueError:
+        # Primeiro objeto maior que o pedaço lido: objeto único (orient='columns' etc.)
+        return None
+    if inicio[fim:].lstrip(' \t\r\n').startswith('{'):
+        return 'linhas'
+    # Um só objeto: é um registro se todos os valores forem escalares
+    return 'linhas' if not any(isinstance(v, (dict, list)) for v in primeiro.values()) else None
+
+
+def iterar_blocos_json(fonte, tamanho_bloco=100000, linhas=None):
+    """Itera sobre um JSON (linhas ou array de registros) em DataFrames de até tamanho_bloco registros
+
+    linhas=None detecta o formato pelo conteúdo; True força JSON Lines.
+    """
+    texto, fechar = _abrir_texto(fonte)
+    try:
+        inicio = texto.read(TAMANHO_LEITURA)
+        formato = 'linhas' if linhas else _formato(inicio)
+        tipar = _Tipagem()
+        corpo = inicio.lstrip(_BRANCOS)[1:]
+        if formato == 'linhas':
+            yield from _blocos_de_linhas(texto, inicio, tamanho_bloco, tipar)
+        elif formato == 'array' and corpo[_SEPARADORES.match(corpo).end():][:1] in ('{', ']'):
+            # Array de registros (orient='records'), o formato do Centro de Exportação
+            yield from _blocos_de_array(texto, corpo, tamanho_bloco, tipar)
+        else:
+            # orient='columns'/'index'/'split'/'values': o pandas precisa do documento inteiro
+            yield from _fatiar(pd.read_json(io.StringIO(inicio + texto.read())), tamanho_bloco)
+    finally:
+        fechar()
+
+
+def _fatiar(df, tamanho_bloco):
+    for inicio in range(0, max(len(df), 1), tamanho_bloco):
+        yield df.iloc[inicio:inicio + tamanho_bloco]
+
+
+def ler_json(fonte, tamanho_bloco=100000, linhas=None):
+    """Lê um JSON inteiro montando-o bloco a bloco"""
+    blocos = list(iterar_blocos_json(fonte, tamanho_bloco, linhas))
+    if not blocos:
+        return pd.DataFrame()
+    return pd.concat(blocos, ignore_index=True) if len(blocos) > 1 else blocos[0]
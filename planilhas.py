@@ -0,0 +1,581 @@
+"""
+Leitura de planilhas Excel (.xlsx) em blocos para o DataInsight AI
+Lê o XML da aba em pedaços, direto do zip e sem criar um objeto por célula:
+as células de cada pedaço são extraídas por expressão regular e convertidas
+em colunas tipadas com numpy. A aba e as colunas são escolhidas antes da
+leitura. Arquivos com estrutura inesperada caem no modo read-only do openpyxl.
+"""
+
+import html
+import itertools
+import posixpath
+import re
+import warnings
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+# openpyxl é opcional: usado só como alternativa para arquivos fora do padrão
+OPENPYXL_AVAILABLE = False
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    pass
+
+# Bytes de XML processados por vez
+TAMANHO_PEDACO = 8 * 1024**2
+
+# Formatos numéricos internos do Excel que representam datas/horas
+_FORMATOS_DATA_INTERNOS = set(range(14, 23)) | set(range(27, 37)) | set(range(45, 48)) | set(range(50, 59))
+
+_ORIGENS_DATA = {False: '1899-12-30', True: '1904-01-01'}
+
+
+class EstruturaNaoSuportada(ValueError):
+    """O XML da aba não segue o formato esperado pelo leitor rápido"""
+
+
+def _local(tag):
+    """Nome da tag/atributo sem o namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _atributo(elemento, nome):
+    for chave, valor in elemento.attrib.items():
+        if _local(chave) == nome:
+            return valor
+    return None
+
+
+def _eh_formato_data(codigo):
+    """Formato personalizado com dia/mês/ano/hora (ignorando textos entre aspas e [cores])"""
+    codigo = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.', '', codigo.lower())
+    return bool(re.search(r'[dmyhs]', codigo)) and 'general' not in codigo
+
+
+def _coluna_para_indice(letras):
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + (ord(letra) - 64)
+    return indice - 1
+
+
+class PastaExcel:
+    """Metadados de um .xlsx: abas, textos compartilhados e estilos de data"""
+
+    def __init__(self, fonte):
+        self._zip = zipfile.ZipFile(fonte)
+        self._nomes = set(self._zip.namelist())
+        caminho_pasta = self._alvo_documento()
+        pasta = self._xml(caminho_pasta)
+        relacoes = self._relacoes(caminho_pasta)
+
+        self.abas = {}
+        self.data1904 = False
+        for elemento in pasta.iter():
+            nome = _local(elemento.tag)
+            if nome == 'workbookPr':
+                self.data1904 = (elemento.get('date1904') or '').lower() in ('1', 'true')
+            elif nome == 'sheet':
+                alvo = relacoes.get(_atributo(elemento, 'id'))
+                if alvo is not None:
+                    self.abas[elemento.get('name')] = alvo
+
+        self._pasta_base = posixpath.dirname(caminho_pasta)
+        self._textos = None
+        self._lidos = []
+        self._iter_textos = None
+        self._estilos_data = None
+
+    def _xml(self, caminho):
+        with self._zip.open(caminho) as arquivo:
+            return ET.parse(arquivo).getroot()
+
+    def _relacoes(self, caminho):
+        """{id: caminho no zip} das relações de um componente"""
+        base, nome = posixpath.split(caminho)
+        caminho_rels = posixpath.join(base, '_rels', nome + '.rels')
+        if caminho_rels not in self._nomes:
+            return {}
+        relacoes = {}
+        for elemento in self._xml(caminho_rels):
+            alvo = elemento.get('Target', '')
+            if alvo.startswith('/'):
+                alvo = alvo[1:]
+            else:
+                alvo = posixpath.normpath(posixpath.join(base, alvo))
+            relacoes[elemento.get('Id')] = alvo
+        return relacoes
+
+    def _alvo_documento(self):
+        for alvo in self._relacoes('.rels' if '_rels/.rels' not in self._nomes else '/.rels').values():
+            if alvo.endswith('.xml') and alvo in self._nomes and 'workbook' in alvo:
+                return alvo
+        return 'xl/workbook.xml'
+
+    def _gerar_textos(self):
+        """Percorre sharedStrings.xml devolvendo um texto por vez"""
+        caminho = posixpath.join(self._pasta_base, 'sharedStrings.xml')
+        if caminho not in self._nomes:
+            return
+        with self._zip.open(caminho) as arquivo:
+            for _, elemento in ET.iterparse(arquivo):
+                if _local(elemento.tag) != 'si':
+                    continue
+                # Texto simples (<t>) ou formatado (<r><t>), sem a fonética (<rPh>)
+                partes = []
+                for filho in elemento:
+                    nome = _local(filho.tag)
+                    if nome == 't':
+                        partes.append(filho.text or '')
+                    elif nome == 'r':
+                        partes.extend(t.text or '' for t in filho if _local(t.tag) == 't')
+                yield ''.join(partes)
+                elemento.clear()
+
+    def _ler_textos(self, quantidade=None):
+        """Lê os textos compartilhados até ter `quantidade` (todos, se None)"""
+        if self._iter_textos is None:
+            self._iter_textos = self._gerar_textos()
+        falta = None if quantidade is None else max(0, quantidade - len(self._lidos))
+        self._lidos.extend(itertools.islice(self._iter_textos, falta))
+
+    @property
+    def textos(self):
+        """Textos compartilhados (sharedStrings.xml), carregados na primeira leitura"""
+        if self._textos is None:
+            self._ler_textos()
+            self._textos = np.array(self._lidos, dtype=object)
+        return self._textos
+
+    def textos_iniciais(self, indices):
+        """Textos dos índices pedidos lendo só o começo do sharedStrings.xml (usado no cabeçalho)"""
+        if self._textos is not None:
+            return self._textos[indices]
+        if len(indices):
+            self._ler_textos(int(indices.max()) + 1)
+        lidos = np.array(self._lidos, dtype=object)
+        return lidos[indices]
+
+    @property
+    def estilos_data(self):
+        """Vetor booleano: o estilo de célula i formata datas?"""
+        if self._estilos_data is None:
+            caminho = posixpath.join(self._pasta_base, 'styles.xml')
+            datas = []
+            if caminho in self._nomes:
+                estilos = self._xml(caminho)
+                personalizados = {}
+                for elemento in estilos.iter():
+                    if _local(elemento.tag) == 'numFmt':
+                        personalizados[int(elemento.get('numFmtId'))] = elemento.get('formatCode', '')
+                for bloco in estilos:
+                    if _local(bloco.tag) != 'cellXfs':
+                        continue
+                    for xf in bloco:
+                        formato = int(xf.get('numFmtId', 0))
+                        datas.append(formato in _FORMATOS_DATA_INTERNOS or
+                                     (formato in personalizados and _eh_formato_data(personalizados[formato])))
+            self._estilos_data = np.array(datas + [False], dtype=bool)
+        return self._estilos_data
+
+    def caminho_aba(self, aba=None):
+        if aba is None:
+            return next(iter(self.abas.values()))
+        if aba not in self.abas:
+            raise ValueError(f"Aba '{aba}' não encontrada. Disponíveis: {', '.join(self.abas)}")
+        return self.abas[aba]
+
+    def abrir_aba(self, aba=None):
+        return self._zip.open(self.caminho_aba(aba))
+
+    def fechar(self):
+        if self._iter_textos is not None:
+            self._iter_textos.close()
+        self._zip.close()
+
+
+def _expressoes(prefixo):
+    """Regex das células para o prefixo de namespace usado na aba ('' ou 'x:')
+
+    A rápida cobre o caso comum (atributos na ordem r, s, t; valor em <v> ou
+    texto inline simples); a geral aceita atributos em qualquer ordem,
+    fórmulas e texto inline formatado, e é usada nos pedaços em que a rápida
+    não reconhece todas as células.
+    """
+    p = re.escape(prefixo)
+    rapida = re.compile(
+        '<' + p + r'c r="([A-Z]+)(\d+)"(?: s="(\d+)")?(?: t="(\w+)")?([^>]*?)'
+        '(?:/>|>(?:<' + p + 'v>([^<]*)</' + p + 'v>|<' + p + 'is><' + p + 't>([^<]*)</' + p + 't></' + p + 'is>)?'
+        '</' + p + 'c>)'
+    )
+    geral = re.compile(
+        '<' + p + r'c(?=[\s/>])'
+        r'(?:(?=[^>]*?\sr="([A-Z]+)(\d+)"))?'
+        r'(?:(?=[^>]*?\ss="(\d+)"))?'
+        r'(?:(?=[^>]*?\st="(\w+)"))?'
+        '[^>]*?(?:/>|>'
+        '(?:<' + p + r'f\b[^>]*?(?:/>|>.*?</' + p + 'f>))?'
+        '(?:<' + p + 'v>(.*?)</' + p + 'v>|<' + p + r'v\s*/>|<' + p + 'is>(.*?)</' + p + 'is>)?'
+        '</' + p + 'c>)',
+        re.S
+    )
+    texto_inline = re.compile('<' + p + r't(?:\s[^>]*)?>(.*?)</' + p + 't>', re.S)
+    return rapida, geral, texto_inline
+
+
+def _texto(valor):
+    return html.unescape(valor) if '&' in valor else valor
+
+
+def _para_datas(numeros, pasta):
+    # Fração do dia arredondada ao milissegundo, como no openpyxl (evita 00:59:59.999999)
+    dias = np.floor(numeros)
+    milis = dias.astype('int64') * 86_400_000 + np.round((numeros - dias) * 86_400_000).astype('int64')
+    return pd.to_datetime(milis, unit='ms', origin=_ORIGENS_DATA[pasta.data1904]).to_numpy()
+
+
+def _converter_coluna(tipos, valores, estilos, pasta, cabecalho=False):
+    """Valores de uma coluna (texto do XML) -> array tipado, com o tipo mais simples possível
+
+    No cabeçalho, os textos compartilhados são lidos só até o maior índice usado.
+    """
+    n = len(valores)
+    # Células sem valor (ex.: <c t="inlineStr"/>) são ausentes; só o texto compartilhado pode ser ''
+    vazios = (valores == '') & (tipos != 's')
+    numericos = ((tipos == '') | (tipos == 'n')) & ~vazios
+    n_numericos = int(numericos.sum())
+    if n_numericos:
+        numeros = np.fromiter(map(float, valores[numericos]), np.float64, n_numericos)
+        datas = pasta.estilos_data[np.minimum(estilos[numericos], len(pasta.estilos_data) - 1)]
+        if n_numericos == n:
+            # Coluna só de números (ou só de datas): vetor nativo
+            if datas.all():
+                return _para_datas(numeros, pasta)
+            if np.all(np.mod(numeros, 1) == 0) and np.all(np.abs(numeros) < 2**53):
+                return numeros.astype('int64')
+            return numeros
+
+    resultado = np.full(n, np.nan, dtype=object)
+    if n_numericos:
+        convertidos = numeros.astype(object)
+        if datas.any():
+            convertidos[datas] = list(pd.DatetimeIndex(_para_datas(numeros[datas], pasta)))
+        resultado[numericos] = convertidos
+    compartilhados = tipos == 's'
+    if compartilhados.any():
+        indices = valores[compartilhados].astype('U').astype(np.int64)
+        resultado[compartilhados] = pasta.textos_iniciais(indices) if cabecalho else pasta.textos[indices]
+    for tipo, converter in (('str', _texto), ('inlineStr', _texto), ('b', lambda v: v == '1'),
+                            ('d', lambda v: pd.Timestamp(v))):
+        mascara = (tipos == tipo) & ~vazios
+        if mascara.any():
+            resultado[mascara] = [converter(v) for v in valores[mascara]]
+
+    # Só números, só datas ou só booleanos (com ou sem vazios): tipo nativo, como no pandas
+    cheios = resultado[pd.notna(resultado)]
+    if len(cheios) and all(isinstance(v, float) for v in cheios):
+        return pd.to_numeric(pd.Series(resultado)).to_numpy()
+    if len(cheios) and all(isinstance(v, pd.Timestamp) for v in cheios):
+        return pd.to_datetime(pd.Series(resultado)).to_numpy()
+    if len(cheios) == n and n and all(isinstance(v, bool) for v in cheios):
+        return resultado.astype(bool)
+    return resultado
+
+
+class _LeitorAba:
+    """Percorre o XML de uma aba em pedaços e devolve DataFrames de linhas completas"""
+
+    def __init__(self, pasta, aba=None, tamanho_pedaco=TAMANHO_PEDACO):
+        self.pasta = pasta
+        self.tamanho_pedaco = tamanho_pedaco
+        self._arquivo = pasta.abrir_aba(aba)
+        self._resto = b''
+        self._fim = False
+        # Colunas declaradas em <dimension> (None se ausente)
+        self.largura = None
+        inicio = self._ate_sheetdata()
+        prefixo = re.match(rb'<(\w+:)?sheetData', inicio).group(1) or b''
+        self._prefixo = prefixo.decode()
+        self._rapida, self._geral, self._texto_inline = _expressoes(self._prefixo)
+        self._inicios = ['<' + self._prefixo + 'c' + fim for fim in (' ', '>', '/>')]
+        self._fim_linha = b'</' + prefixo + b'row>'
+        self._fim_dados = b'</' + prefixo + b'sheetData>'
+
+    def _ate_sheetdata(self):
+        """Descarta o cabeçalho da aba até a tag <sheetData>"""
+        padrao = re.compile(rb'<(\w+:)?sheetData\b[^>]*?(/?)>')
+        buffer = b''
+        while True:
+            pedaco = self._arquivo.read(self.tamanho_pedaco)
+            buffer += pedaco
+            encontrado = padrao.search(buffer)
+            if encontrado:
+                dimensao = re.search(rb'<(?:\w+:)?dimension\s+ref="(?:[A-Z]+\d+:)?([A-Z]+)\d+"',
+                                     buffer[:encontrado.start()])
+                if dimensao:
+                    self.largura = _coluna_para_indice(dimensao.group(1).decode()) + 1
+                self._resto = buffer[encontrado.end():]
+                # <sheetData/>: aba vazia
+                self._fim = encontrado.group(2) == b'/'
+                return encontrado.group(0)
+            if not pedaco:
+                raise EstruturaNaoSuportada("Tag <sheetData> não encontrada")
+
+    def pedacos(self):
+        """Gera blocos de XML contendo apenas linhas completas"""
+        while not self._fim:
+            pedaco = self._arquivo.read(self.tamanho_pedaco)
+            buffer = self._resto + pedaco
+            fim_dados = buffer.find(self._fim_dados)
+            if fim_dados >= 0:
+                self._fim = True
+                yield buffer[:fim_dados]
+                return
+            corte = buffer.rfind(self._fim_linha)
+            if not pedaco:
+                self._fim = True
+                yield buffer
+                return
+            if corte < 0:
+                self._resto = buffer
+                continue
+            corte += len(self._fim_linha)
+            self._resto = buffer[corte:]
+            yield buffer[:corte]
+
+    def celulas(self, xml):
+        """(linhas, colunas, estilos, tipos, valores) das células de um bloco de XML"""
+        # Os cortes caem sempre depois de </row>, então cada pedaço é UTF-8 válido
+        xml = xml.decode('utf-8')
+        total = sum(xml.count(inicio) for inicio in self._inicios)
+        if not total:
+            return None
+        encontradas = self._rapida.findall(xml)
+        campos = list(zip(*encontradas)) if len(encontradas) == total else None
+        if campos and not any(' s=' in r or ' t=' in r or ' r=' in r for r in set(campos[4])):
+            letras, linhas, estilos, tipos, _, valores, inlines = campos
+            valores = np.array(valores, dtype=object)
+            tipos = np.array(tipos)
+            em_linha = tipos == 'inlineStr'
+            if em_linha.any():
+                valores[em_linha] = np.array(inlines, dtype=object)[em_linha]
+        else:
+            encontradas = self._geral.findall(xml)
+            if len(encontradas) != total:
+                raise EstruturaNaoSuportada("Células em formato não reconhecido")
+            letras, linhas, estilos, tipos, valores, inlines = zip(*encontradas)
+            tipos = np.array(tipos)
+            valores = np.array([''.join(self._texto_inline.findall(i)) if t == 'inlineStr' else v
+                                for t, v, i in zip(tipos, valores, inlines)], dtype=object)
+        if '' in letras:
+            # Sem o atributo r a posição da célula é implícita: o leitor rápido não trata
+            raise EstruturaNaoSuportada("Células sem referência (atributo r)")
+        n = len(letras)
+        indices = {letra: _coluna_para_indice(letra) for letra in set(letras)}
+        colunas = np.fromiter(map(indices.__getitem__, letras), np.int64, n)
+        estilos = (np.fromiter((int(e or 0) for e in estilos), np.int64, n) if any(estilos)
+                   else np.zeros(n, np.int64))
+        return np.fromiter(map(int, linhas), np.int64, n), colunas, estilos, tipos, valores
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+def _nomes_colunas(valores):
+    """Nomes do cabeçalho como o pandas faz: vazios viram 'Unnamed: i', repetidos ganham '.1'"""
+    nomes, vistos = [], {}
+    for i, valor in enumerate(valores):
+        if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+            nome = f'Unnamed: {i}'
+        elif isinstance(valor, float) and valor.is_integer():
+            nome = str(int(valor))
+        else:
+            nome = str(valor)
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f'{nome}.{vistos[nome]}'
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    return nomes
+
+
+def _concatenar(partes):
+    """Junta os trechos lidos de um bloco, sem os vazios"""
+    partes = [p for p in partes if len(p)] or partes[:1]
+    return pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
+
+
+def abas_excel(fonte):
+    """Nomes das abas, na ordem do arquivo"""
+    pasta = PastaExcel(fonte)
+    try:
+        return list(pasta.abas)
+    finally:
+        pasta.fechar()
+        if hasattr(fonte, 'seek'):
+            fonte.seek(0)
+
+
+def _iterar_blocos_rapido(fonte, aba, colunas, tamanho_bloco, apenas_cabecalho=False):
+    pasta = PastaExcel(fonte)
+    # Para o cabeçalho basta a primeira linha: pedaços pequenos
+    leitor = _LeitorAba(pasta, aba, 64 * 1024 if apenas_cabecalho else TAMANHO_PEDACO)
+    try:
+        cabecalho, indices, primeira = None, None, None
+        partes, acumuladas, descartadas = [], 0, 0
+        # Tipo de cada coluna já visto com valores: coluna sem células num trecho usa o mesmo
+        tipos_vistos = {}
+        for xml in leitor.pedacos():
+            celulas = leitor.celulas(xml)
+            if celulas is None:
+                continue
+            linhas, cols, estilos, tipos, valores = celulas
+
+            if cabecalho is None:
+                primeira = linhas.min()
+                no_cabecalho = linhas == primeira
+                ordem = np.argsort(cols[no_cabecalho])
+                posicoes = np.flatnonzero(no_cabecalho)[ordem]
+                # Largura da <dimension> da aba (a mesma que o pandas usa) ou da linha de cabeçalho,
+                # igual para todos os blocos
+                largura = max(leitor.largura or 0, cols[no_cabecalho].max() + 1)
+                valores_cabecalho = np.full(largura, np.nan, dtype=object)
+                valores_cabecalho[cols[posicoes]] = _converter_coluna(
+                    tipos[posicoes], valores[posicoes], estilos[posicoes], pasta, cabecalho=True
+                )
+                nomes = _nomes_colunas(list(valores_cabecalho))
+                if apenas_cabecalho:
+                    yield nomes
+                    return
+                if colunas is None:
+                    indices = list(range(len(nomes)))
+                else:
+                    faltando = [c for c in colunas if c not in nomes]
+                    if faltando:
+                        raise ValueError(f"Colunas não encontradas: {', '.join(map(str, faltando))}")
+                    indices = [nomes.index(c) for c in colunas]
+                cabecalho = [nomes[i] for i in indices]
+                proxima = primeira + 1
+                manter = ~no_cabecalho
+                linhas, cols, estilos, tipos, valores = (linhas[manter], cols[manter], estilos[manter],
+                                                         tipos[manter], valores[manter])
+                if len(linhas) == 0:
+                    continue
+
+            # Células além da largura (dimensão declarada errada) ficam de fora em todos os blocos
+            descartadas += int((cols >= largura).sum())
+            # Linhas vazias no meio da aba viram registros vazios, como no pandas
+            ultima = linhas.max()
+            n = ultima - proxima + 1
+            dados = {}
+            for indice, nome in zip(indices, cabecalho):
+                mascara = cols == indice
+                posicoes = linhas[mascara] - proxima
+                coluna = _converter_coluna(tipos[mascara], valores[mascara], estilos[mascara], pasta)
+                if len(coluna):
+                    tipos_vistos.setdefault(nome, coluna.dtype)
+                else:
+                    # Sem nenhuma célula: ausentes do tipo da coluna (float, como no pandas, se ainda não visto)
+                    visto = tipos_vistos.get(nome, np.dtype('float64'))
+                    coluna = np.empty(0, dtype=visto if visto.kind in 'MO' else 'float64')
+                if len(posicoes) == n:
+                    completa = coluna
+                elif coluna.dtype.kind in 'fi':
+                    completa = np.full(n, np.nan)
+                    completa[posicoes] = coluna
+                elif coluna.dtype.kind == 'M':
+                    completa = np.full(n, np.datetime64('NaT'), dtype=coluna.dtype)
+                    completa[posicoes] = coluna
+                else:
+                    completa = np.full(n, np.nan, dtype=object)
+                    completa[posicoes] = coluna
+                dados[nome] = completa
+            proxima = ultima + 1
+            partes.append(pd.DataFrame(dados, columns=cabecalho))
+            acumuladas += n
+
+            while acumuladas >= tamanho_bloco:
+                bloco = _concatenar(partes)
+                yield bloco.iloc[:tamanho_bloco].reset_index(drop=True)
+                resto = bloco.iloc[tamanho_bloco:]
+                partes, acumuladas = ([resto], len(resto)) if len(resto) else ([], 0)
+
+        if apenas_cabecalho and cabecalho is None:
+            yield []
+            return
+        if descartadas:
+            warnings.warn(f"{descartadas} células além das {largura} colunas do cabeçalho foram ignoradas")
+        if partes:
+            yield _concatenar(partes)
+    finally:
+        leitor.fechar()
+        pasta.fechar()
+
+
+def _iterar_blocos_openpyxl(fonte, aba, colunas, tamanho_bloco, apenas_cabecalho=False):
+    """Alternativa lenta, mas tolerante: modo read-only do openpyxl, linha a linha"""
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("openpyxl é necessário para ler esta planilha (pip install openpyxl)")
+    livro = load_workbook(fonte, read_only=True, data_only=True, keep_links=False)
+    try:
+        planilha = livro[aba] if aba is not None else livro.worksheets[0]
+        linhas = planilha.iter_rows(values_only=True)
+        nomes = _nomes_colunas(next(linhas, ()))
+        if apenas_cabecalho:
+            yield nomes
+            return
+        indices = list(range(len(nomes))) if colunas is None else [nomes.index(c) for c in colunas]
+        cabecalho = [nomes[i] for i in indices]
+        lote = []
+        for linha in linhas:
+            # Vazios como NaN, igual ao leitor rápido e ao pandas
+            lote.append([linha[i] if i < len(linha) and linha[i] is not None else np.nan for i in indices])
+            if len(lote) == tamanho_bloco:
+                yield pd.DataFrame.from_records(lote, columns=cabecalho)
+                lote = []
+        if lote:
+            yield pd.DataFrame.from_records(lote, columns=cabecalho)
+    finally:
+        livro.close()
+
+
+def _com_alternativa(fonte, aba, colunas, tamanho_bloco, apenas_cabecalho=False):
+    """Leitor rápido; se a estrutura não for reconhecida antes do primeiro bloco, usa o openpyxl"""
+    entregues = 0
+    try:
+        for resultado in _iterar_blocos_rapido(fonte, aba, colunas, tamanho_bloco, apenas_cabecalho):
+            entregues += 1
+            yield resultado
+    except (EstruturaNaoSuportada, zipfile.BadZipFile, KeyError):
+        if entregues:
+            raise
+        if hasattr(fonte, 'seek'):
+            fonte.seek(0)
+        yield from _iterar_blocos_openpyxl(fonte, aba, colunas, tamanho_bloco, apenas_cabecalho)
+
+
+def colunas_excel(fonte, aba=None):
+    """Nomes das colunas (primeira linha) de uma aba, sem ler os dados"""
+    try:
+        return next(_com_alternativa(fonte, aba, None, 1, apenas_cabecalho=True), [])
+    finally:
+        if hasattr(fonte, 'seek'):
+            fonte.seek(0)
+
+
+def iterar_blocos_excel(fonte, aba=None, colunas=None, tamanho_bloco=100000):
+    """Itera sobre uma aba em DataFrames de até tamanho_bloco registros"""
+    return _com_alternativa(fonte, aba, colunas, tamanho_bloco)
+
+
+def ler_excel(fonte, aba=None, colunas=None, tamanho_bloco=100000):
+    """Lê uma aba inteira (só as colunas pedidas) montando-a bloco a bloco"""
+    blocos = list(iterar_blocos_excel(fonte, aba, colunas, tamanho_bloco))
+    if not blocos:
+        return pd.DataFrame(columns=colunas or colunas_excel(fonte, aba))
+    return pd.concat(blocos, ignore_index=True) if len(blocos) > 1 else blocos[0]
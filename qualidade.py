@@ -0,0 +1,151 @@
+"""
+Perfil de qualidade dos dados do DataInsight AI
+Em uma única passada por bloco calcula os hashes das linhas (duplicatas
+exatas até um limite de linhas distintas, estimadas depois dele), ausentes
+e valores distintos por coluna e a memória ocupada. O
+perfil é atualizado incrementalmente quando chegam novos blocos e é a fonte
+única da barra lateral, do painel de qualidade e do relatório técnico.
+"""
+
+import numpy as np
+import pandas as pd
+
+from esbocos import HyperLogLog
+
+# Primo do FNV de 64 bits, usado para combinar os hashes das colunas de cada linha
+_PRIMO_FNV = np.uint64(0x100000001B3)
+
+
+def hash_coluna(serie):
+    """Hash uint64 de cada valor (o mesmo de pd.util.hash_pandas_object)"""
+    return pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64)
+
+
+def _uniao_ordenada(ordenados, novos):
+    """União de um array ordenado de hashes únicos com novos hashes"""
+    novos = np.sort(pd.unique(novos))
+    # As duas sequências já ordenadas são fundidas em tempo linear pelo timsort
+    juntos = np.sort(np.concatenate([ordenados, novos]), kind='stable')
+    if len(juntos) == 0:
+        return juntos
+    return juntos[np.append(True, juntos[1:] != juntos[:-1])]
+
+
+class _Distintos:
+    """Valores distintos de uma coluna: exatos até `limite`, depois HyperLogLog"""
+
+    def __init__(self, limite, p=12):
+        self.limite = limite
+        self.p = p
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.hll = None
+
+    def atualizar(self, hashes):
+        if self.hll is None:
+            unicos = pd.unique(hashes)
+            if len(self.hashes) + len(unicos) <= self.limite:
+                self.hashes = _uniao_ordenada(self.hashes, unicos)
+                return
+            # Cardinalidade alta: passa a estimar, sem guardar os hashes
+            self.hll = HyperLogLog(self.p).atualizar_hashes(self.hashes)
+            self.hashes = np.empty(0, dtype=np.uint64)
+            hashes = unicos
+        self.hll.atualizar_hashes(hashes)
+
+    @property
+    def aproximado(self):
+        return self.hll is not None
+
+    def contagem(self):
+        return int(round(self.hll.estimativa())) if self.aproximado else len(self.hashes)
+
+
+class PerfilQualidade:
+    """Duplicatas, ausentes, distintos e memória acumulados bloco a bloco"""
+
+    def __init__(self, limite_distintos_exatos=100_000, p=12, limite_linhas_exatas=5_000_000):
+        self.limite_distintos_exatos = limite_distintos_exatos
+        self.p = p
+        self.n_registros = 0
+        self.n_blocos = 0
+        self.colunas = []
+        self.nulos = pd.Series(dtype='int64')
+        self.memoria_bytes = pd.Series(dtype='int64')
+        # Hashes das linhas distintas: exatos até limite_linhas_exatas (8 bytes cada), depois HyperLogLog
+        self._linhas = _Distintos(limite_linhas_exatas, p)
+        self._distintos = {}
+
+    @classmethod
+    def de_dataframe(cls, df, tamanho_bloco=None, **kwargs):
+        """Perfil de um DataFrame em memória (inteiro ou em blocos de tamanho_bloco)"""
+        perfil = cls(**kwargs)
+        passo = tamanho_bloco or max(len(df), 1)
+        for inicio in range(0, len(df), passo):
+            perfil.atualizar(df.iloc[inicio:inicio + passo])
+        return perfil
+
+    def atualizar(self, bloco):
+        """Incorpora um bloco (DataFrame) ao perfil"""
+        if bloco is None or bloco.empty:
+            return self
+
+        self.n_registros += len(bloco)
+        self.n_blocos += 1
+        nulos = {}
+        linhas = np.zeros(len(bloco), dtype=np.uint64)
+        for col in bloco.columns:
+            if col not in self.colunas:
+                self.colunas.append(col)
+            ausentes = bloco[col].isna().to_numpy()
+            nulos[col] = int(ausentes.sum())
+            hashes = hash_coluna(bloco[col])
+            distintos = self._distintos.setdefault(col, _Distintos(self.limite_distintos_exatos, self.p))
+            distintos.atualizar(hashes[~ausentes] if nulos[col] else hashes)
+            # Hash da linha inteira combinado coluna a coluna (sem guardar todos os hashes)
+            linhas = (linhas ^ hashes) * _PRIMO_FNV
+
+        self.nulos = self.nulos.add(pd.Series(nulos, dtype='int64'), fill_value=0).astype('int64')
+        self.memoria_bytes = self.memoria_bytes.add(
+            bloco.memory_usage(deep=True, index=False), fill_value=0
+        ).astype('int64')
+
+        # Duplicatas: linhas cujo hash já foi visto, neste bloco ou nos anteriores
+        self._linhas.atualizar(linhas)
+        return self
+
+    @property
+    def duplicadas(self):
+        """Linhas repetidas (estimadas se duplicadas_aproximadas)"""
+        return max(0, self.n_registros - self._linhas.contagem())
+
+    @property
+    def duplicadas_aproximadas(self):
+        """True quando as linhas distintas passaram do limite e as duplicatas vêm do HyperLogLog"""
+        return self._linhas.aproximado
+
+    @property
+    def ausentes(self):
+        return int(self.nulos.sum())
+
+    @property
+    def memoria_mb(self):
+        return self.memoria_bytes.sum() / 1024**2
+
+    @property
+    def completude(self):
+        """Percentual de células preenchidas"""
+        celulas = self.n_registros * len(self.colunas)
+        return (celulas - self.ausentes) / celulas * 100 if celulas else 0.0
+
+    @property
+    def erro_distintos(self):
+        """Erro relativo das contagens estimadas pelo HyperLogLog"""
+        return HyperLogLog(self.p).erro_relativo
+
+    def distintos(self):
+        """Série coluna -> valores distintos (exatos ou estimados, ver distintos_aproximados)"""
+        return pd.Series({col: d.contagem() for col, d in self._distintos.items()}, dtype='int64')
+
+    def distintos_aproximados(self):
+        """Colunas cuja contagem de distintos veio do HyperLogLog"""
+        return [col for col, d in self._distintos.items() if d.aproximado]
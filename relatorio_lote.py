@@ -0,0 +1,206 @@
+"""
+Relatórios em lote do DataInsight AI, sem interface
+Gera os relatórios executivo e técnico (e, opcionalmente, a análise do
+Gemini) de cada arquivo de um diretório, em paralelo num pool de processos,
+e grava os resultados em disco com um resumo de tempos por arquivo.
+
+Execute: python relatorio_lote.py DIRETORIO [--saida relatorios] [--processos 4] [--ia nao|cache|online]
+
+--ia cache usa apenas as respostas já guardadas no cache local (sem rede);
+--ia online chama a API (GEMINI_API_KEY) e guarda as respostas no cache.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from cache_ia import CacheRespostas, impressao_dataframe
+from compactacao import compactar_dataframe
+from config import CACHE_CONFIG, DATA_CONFIG, IA_EXECUTOR_CONFIG
+from cubo import CuboOLAP
+from executor_ia import LimitadorTaxa, com_retentativas
+from formatos import formato_do_arquivo
+from ia_gemini import analisar, configurar
+from ingestao import carregar_arquivo
+from qualidade import PerfilQualidade
+from relatorios import gerar_relatorio_executivo, gerar_relatorio_tecnico
+
+MODOS_IA = ('nao', 'cache', 'online')
+
+COLUNAS_TEMPOS = ['arquivo', 'registros', 'colunas', 'leitura_s', 'relatorios_s', 'ia_s', 'total_s', 'erro']
+
+# Estado de cada processo do pool (preenchido por _iniciar_processo)
+_CACHE_IA = None
+_LIMITADOR = None
+
+
+def _iniciar_processo(modo_ia, caminho_cache, api_key, requisicoes_por_minuto):
+    """Prepara cache e API uma vez por processo"""
+    global _CACHE_IA, _LIMITADOR
+    if modo_ia == 'nao':
+        return
+    _CACHE_IA = CacheRespostas(caminho_cache, ttl_segundos=CACHE_CONFIG['ia_ttl_horas'] * 3600,
+                               max_entradas=CACHE_CONFIG['ia_max_entradas'])
+    if modo_ia == 'online':
+        configurar(api_key)
+        _LIMITADOR = LimitadorTaxa(requisicoes_por_minuto)
+
+
+def listar_arquivos(diretorio):
+    """Arquivos de formato suportado do diretório, dos maiores para os menores"""
+    arquivos = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        if not os.path.isfile(caminho):
+            continue
+        try:
+            formato_do_arquivo(nome)
+        except ValueError:
+            continue
+        arquivos.append(caminho)
+    # Os maiores primeiro: o pool não fica esperando um arquivo grande no final
+    return sorted(arquivos, key=os.path.getsize, reverse=True)
+
+
+def nomes_de_saida(arquivos):
+    """Prefixo dos arquivos de saída: o nome sem extensão, ou com ela quando dois coincidem"""
+    bases = [os.path.splitext(os.path.basename(a))[0] for a in arquivos]
+    return {a: (b if bases.count(b) == 1 else os.path.basename(a).replace('.', '_'))
+            for a, b in zip(arquivos, bases)}
+
+
+def _analise_ia(df, cubo, estatisticas, esbocos, modo_ia):
+    impressao = impressao_dataframe(df)
+    if modo_ia == 'cache':
+        return analisar(df, cache=_CACHE_IA, impressao=impressao, somente_cache=True)
+    return com_retentativas(
+        lambda: analisar(df, cache=_CACHE_IA, impressao=impressao, cubo=cubo, estatisticas=estatisticas,
+                         esbocos=esbocos),
+        tentativas=IA_EXECUTOR_CONFIG['max_retries'],
+        espera_inicial=IA_EXECUTOR_CONFIG['initial_backoff_s'],
+        limitador=_LIMITADOR
+    )
+
+
+def processar_arquivo(caminho, saida, prefixo, modo_ia='nao'):
+    """Relatórios de um arquivo; devolve os tempos de cada etapa (ou o erro)"""
+    tempos = dict.fromkeys(COLUNAS_TEMPOS)
+    tempos['arquivo'] = os.path.basename(caminho)
+    inicio = time.perf_counter()
+    try:
+        df, resumo = carregar_arquivo(
+            caminho, formato_do_arquivo(caminho), os.path.getsize(caminho) / 1024**2,
+            limite_streaming_mb=DATA_CONFIG['streaming_threshold_mb'],
+            tamanho_bloco=DATA_CONFIG['chunk_size'],
+            tamanho_amostra=DATA_CONFIG['explorer_sample_size']
+        )
+        df, _ = compactar_dataframe(df)
+        marca = time.perf_counter()
+        tempos['leitura_s'] = marca - inicio
+
+        # Mesmas fontes do app: resumo da ingestão em blocos ou o DataFrame inteiro
+        numericas = df.select_dtypes(include=[np.number]).columns
+        if resumo is not None:
+            cubo, perfil, esbocos = resumo.cubo, resumo.perfil, resumo.esbocos
+            estatisticas, nota = esbocos.describe(numericas), esbocos.nota_erro()
+        else:
+            cubo, perfil, esbocos = None, PerfilQualidade.de_dataframe(df), None
+            estatisticas, nota = df[numericas].describe(), None
+        if cubo is None:
+            cubo = CuboOLAP.construir(df)
+        tempos['registros'], tempos['colunas'] = cubo.n_registros, len(df.columns)
+
+        analise = None
+        if modo_ia != 'nao':
+            analise = _analise_ia(df, cubo, estatisticas, esbocos, modo_ia)
+            tempos['ia_s'] = time.perf_counter() - marca
+            marca = time.perf_counter()
+
+        relatorios = {
+            'executivo': gerar_relatorio_executivo(cubo, n_colunas=len(df.columns), estatisticas=estatisticas,
+                                                   analise_ia=analise, nota_estatisticas=nota),
+            'tecnico': gerar_relatorio_tecnico(df, cubo, perfil=perfil, esbocos=esbocos)
+        }
+        if analise:
+            relatorios['analise_ia'] = analise
+        for tipo, texto in relatorios.items():
+            with open(os.path.join(saida, f"{prefixo}_{tipo}.txt"), 'w', encoding='utf-8') as arquivo:
+                arquivo.write(texto)
+        tempos['relatorios_s'] = time.perf_counter() - marca
+    except Exception as erro:
+        tempos['erro'] = f"{type(erro).__name__}: {erro}"
+    tempos['total_s'] = time.perf_counter() - inicio
+    return tempos
+
+
+def _linha_resumo(tempos):
+    if tempos['erro']:
+        return f"❌ {tempos['arquivo']}: {tempos['erro']}"
+    ia = f" | IA {tempos['ia_s']:.2f}s" if tempos['ia_s'] is not None else ''
+    return (f"✅ {tempos['arquivo']}: {tempos['registros']:,} registros | leitura {tempos['leitura_s']:.2f}s | "
+            f"relatórios {tempos['relatorios_s']:.2f}s{ia} | total {tempos['total_s']:.2f}s")
+
+
+def gerar_relatorios(diretorio, saida, processos=None, modo_ia='nao', caminho_cache=None, ao_concluir=None):
+    """Processa todos os arquivos do diretório; devolve a tabela de tempos (também gravada em saida)"""
+    if modo_ia not in MODOS_IA:
+        raise ValueError(f"Modo de IA inválido: {modo_ia} (use {', '.join(MODOS_IA)})")
+    api_key = os.getenv('GEMINI_API_KEY')
+    if modo_ia == 'online' and not api_key:
+        raise ValueError("--ia online requer a variável de ambiente GEMINI_API_KEY")
+
+    os.makedirs(saida, exist_ok=True)
+    arquivos = listar_arquivos(diretorio)
+    prefixos = nomes_de_saida(arquivos)
+    processos = max(1, min(processos or os.cpu_count() or 1, len(arquivos) or 1))
+    # A cota da API é dividida entre os processos
+    por_processo = IA_EXECUTOR_CONFIG['requests_per_minute'] / processos
+
+    inicio = time.perf_counter()
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                             initargs=(modo_ia, caminho_cache or CACHE_CONFIG['ia_db'], api_key, por_processo)) as pool:
+        futuros = [pool.submit(processar_arquivo, a, saida, prefixos[a], modo_ia) for a in arquivos]
+        for futuro in as_completed(futuros):
+            tempos = futuro.result()
+            resultados.append(tempos)
+            if ao_concluir is not None:
+                ao_concluir(tempos)
+
+    tabela = pd.DataFrame(resultados, columns=COLUNAS_TEMPOS).sort_values('arquivo', ignore_index=True)
+    tabela.attrs['total_s'] = time.perf_counter() - inicio
+    tabela.to_csv(os.path.join(saida, 'tempos.csv'), index=False)
+    return tabela
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Relatórios do DataInsight AI para todos os arquivos de um diretório")
+    parser.add_argument('diretorio', help="diretório com os arquivos de dados (CSV, Excel, JSON, Parquet...)")
+    parser.add_argument('--saida', default='relatorios', help="diretório dos relatórios (padrão: relatorios)")
+    parser.add_argument('--processos', type=int, default=None, help="processos em paralelo (padrão: núcleos da CPU)")
+    parser.add_argument('--ia', choices=MODOS_IA, default='nao',
+                        help="análise do Gemini: nao, cache (só respostas guardadas, offline) ou online")
+    parser.add_argument('--cache-ia', default=CACHE_CONFIG['ia_db'], help="banco SQLite do cache de respostas")
+    args = parser.parse_args(argumentos)
+
+    if not os.path.isdir(args.diretorio):
+        parser.error(f"diretório não encontrado: {args.diretorio}")
+    try:
+        tabela = gerar_relatorios(args.diretorio, args.saida, args.processos, args.ia, args.cache_ia,
+                                  ao_concluir=lambda t: print(_linha_resumo(t), flush=True))
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    falhas = int(tabela['erro'].notna().sum())
+    print(f"\n{len(tabela) - falhas} de {len(tabela)} arquivos processados em {tabela.attrs['total_s']:.2f}s "
+          f"(tempos em {os.path.join(args.saida, 'tempos.csv')})")
+    return 1 if falhas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Relatórios em texto do DataInsight AI
+Gerados a partir do cubo OLAP e das estatísticas já calculadas, sem
+depender do Streamlit (usados pelo Centro de Exportação).
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from correlacao import matriz_do_dataset
+from qualidade import PerfilQualidade
+
+
+def gerar_relatorio_executivo(cubo, n_colunas, estatisticas, analise_ia=None, nota_estatisticas=None):
+    """Monta o relatório executivo consultando o cubo em vez do DataFrame"""
+    medidas = cubo.medidas
+    report = f"""
+RELATÓRIO EXECUTIVO - DATAINSIGHT AI PRO
+========================================
+Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
+Dataset: {cubo.n_registros} registros, {n_colunas} colunas
+
+RESUMO EXECUTIVO:
+================
+• Total de Registros: {cubo.n_registros:,}
+• Total de Colunas: {n_colunas}
+"""
+    
+    if 'vendas' in medidas:
+        total_vendas = cubo.total('vendas')
+        report += f"• Vendas Totais: R$ {total_vendas:,.2f}\n"
+    
+    if 'lucro' in medidas:
+        total_lucro = cubo.total('lucro')
+        margem_total = (total_lucro / total_vendas * 100) if 'vendas' in medidas else 0
+        report += f"• Lucro Total: R$ {total_lucro:,.2f}\n"
+        report += f"• Margem Total: {margem_total:.1f}%\n"
+    
+    if 'satisfacao' in medidas:
+        report += f"• Satisfação Média: {cubo.media('satisfacao'):.1f}/5\n"
+    
+    report += f"""
+
+TOP PERFORMERS:
+==============
+"""
+    
+    if cubo.possui('regiao') and 'vendas' in medidas:
+        top_regiao, top_regiao_valor = cubo.top('regiao', 'vendas')
+        if top_regiao is not None:
+            report += f"• Região Líder: {top_regiao} (R$ {top_regiao_valor:,.0f})\n"
+    
+    if cubo.possui('produto') and 'vendas' in medidas:
+        top_produto, top_produto_valor = cubo.top('produto', 'vendas')
+        if top_produto is not None:
+            report += f"• Produto Top: {top_produto} (R$ {top_produto_valor:,.0f})\n"
+    
+    if analise_ia:
+        report += f"""
+
+ANÁLISE DA IA:
+=============
+{analise_ia}
+"""
+    
+    report += f"""
+
+ESTATÍSTICAS DETALHADAS:
+=======================
+{estatisticas.to_string()}
+{f"({nota_estatisticas})" if nota_estatisticas else ""}
+---
+Relatório gerado automaticamente pelo DataInsight AI Pro
+"""
+    return report
+
+
+def gerar_relatorio_tecnico(df, cubo=None, perfil=None, esbocos=None):
+    """Relatório técnico por coluna; correlações vêm da matriz acumulada pelo cubo
+
+    Qualidade e valores únicos vêm do perfil (PerfilQualidade), calculado sobre
+    o df quando não informado. Com esbocos (EsbocosDataset), os momentos vêm dos
+    esboços, acompanhados dos limites de erro.
+    """
+    if perfil is None:
+        perfil = PerfilQualidade.de_dataframe(df)
+    ausentes = perfil.nulos
+    distintos = perfil.distintos()
+    aproximados = perfil.distintos_aproximados()
+    duplicadas = (f"~{perfil.duplicadas:,} (±{perfil.erro_distintos:.1%} das linhas distintas)"
+                  if perfil.duplicadas_aproximadas else perfil.duplicadas)
+    nao_numericos = ''
+    if cubo is not None and cubo.nao_numericos:
+        descartados = ', '.join(f"{col}: {n}" for col, n in cubo.nao_numericos.items())
+        nao_numericos = f"• Textos em colunas numéricas (tratados como ausentes): {descartados}\n"
+    report = f"""
+RELATÓRIO TÉCNICO - DATAINSIGHT AI PRO
+======================================
+Data: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+
+INFORMAÇÕES DO DATASET:
+======================
+• Nome: Dataset de Análise
+• Registros: {perfil.n_registros:,}
+• Colunas: {len(df.columns)}
+• Tamanho em Memória: {perfil.memoria_mb:.2f} MB
+• Tipos de Dados: {dict(df.dtypes.value_counts())}
+
+QUALIDADE DOS DADOS:
+===================
+• Valores Ausentes: {perfil.ausentes}
+• Linhas Duplicadas: {duplicadas}
+• Completude: {perfil.completude:.1f}%
+{nao_numericos}
+ANÁLISE POR COLUNA:
+==================
+"""
+    
+    if esbocos is not None:
+        report += f"({esbocos.nota_erro()})\n"
+    
+    for col in df.columns:
+        report += f"\n{col}:\n"
+        report += f"  - Tipo: {df[col].dtype}\n"
+        if col in aproximados:
+            report += f"  - Valores únicos: ~{distintos[col]:,} (±{perfil.erro_distintos:.1%})\n"
+        else:
+            report += f"  - Valores únicos: {distintos[col]}\n"
+        report += f"  - Valores ausentes: {ausentes[col]}\n"
+        
+        if esbocos is not None and col in esbocos.momentos:
+            m = esbocos.momentos[col]
+            report += f"  - Mín: {m.min}\n"
+            report += f"  - Máx: {m.max}\n"
+            report += f"  - Média: {m.mean:.2f}\n"
+            report += f"  - Desvio Padrão: {m.std:.2f}\n"
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            report += f"  - Mín: {df[col].min()}\n"
+            report += f"  - Máx: {df[col].max()}\n"
+            report += f"  - Média: {df[col].mean():.2f}\n"
+            report += f"  - Desvio Padrão: {df[col].std():.2f}\n"
+    
+    # Mesmas medidas do cubo: 'id' não entra
+    numericas = [c for c in df.select_dtypes(include=[np.number]).columns if c != 'id']
+    matriz = matriz_do_dataset(df, cubo, numericas)
+    report += f"""
+
+CORRELAÇÕES (COLUNAS NUMÉRICAS):
+===============================
+{matriz.pearson(numericas).to_string()}
+"""
+    if matriz.spearman:
+        report += f"""
+CORRELAÇÕES DE SPEARMAN (APROXIMADAS):
+=====================================
+{matriz.spearman_aproximado(numericas).round(3).to_string()}
+"""
+    report += """
+---
+Relatório técnico gerado pelo DataInsight AI Pro
+"""
+    return report
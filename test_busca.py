@@ -0,0 +1,53 @@
+"""
+Testes do índice da busca textual
+Execute: python -m pytest test_busca.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from busca import IndiceTextual
+
+
+def criar_df(n=3000):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'vendas': rng.integers(1000, 90000, n),
+        'margem': rng.uniform(0, 50, n).round(2),
+        'regiao': pd.Categorical(rng.choice(['Norte', 'Sul', 'Nordeste', 'Centro-Oeste'], n)),
+        'vendedor': rng.choice(['Ana Silva', 'João Santos', 'Maria Oliveira', 'Zé'], n).astype(object)
+    })
+    df.loc[::31, 'vendedor'] = np.nan
+    df.loc[5, 'vendedor'] = 'x' * 300
+    return df
+
+
+def referencia(df, termo, case_sensitive=False, prefixo=False):
+    textos = df.astype(str)
+    if prefixo:
+        alvo = termo if case_sensitive else termo.lower()
+        mask = textos.apply(lambda x: (x if case_sensitive else x.str.lower()).str.startswith(alvo))
+    else:
+        mask = textos.apply(lambda x: x.str.contains(termo, case=case_sensitive, regex=False))
+    return np.flatnonzero(mask.any(axis=1))
+
+
+def test_busca_por_substring_igual_ao_scan():
+    df = criar_df()
+    indice = IndiceTextual(df)
+    for termo in ['norte', 'Norte', 'NORDESTE', 'silva', 'Zé', 'o', 'nan', '12', '.5', 'xxxx', 'inexistente']:
+        for case_sensitive in [False, True]:
+            np.testing.assert_array_equal(
+                indice.buscar(termo, case_sensitive), referencia(df, termo, case_sensitive)
+            )
+
+
+def test_busca_por_prefixo():
+    df = criar_df()
+    indice = IndiceTextual(df)
+    for termo in ['N', 'nor', 'Centro', 'ana', '4']:
+        for case_sensitive in [False, True]:
+            np.testing.assert_array_equal(
+                indice.buscar(termo, case_sensitive, prefixo=True),
+                referencia(df, termo, case_sensitive, prefixo=True)
+            )
@@ -0,0 +1,74 @@
+"""
+Testes do cache de datasets em disco
+Execute: python -m pytest test_cache_datasets.py
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache_datasets import CacheDatasets, chave_conteudo, chave_opcoes, hash_conteudo
+
+
+def criar_df(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'vendas': rng.integers(1000, 90000, n).astype('int32'),
+        'regiao': pd.Categorical(rng.choice(['Norte', 'Sul'], n))
+    })
+
+
+def test_chave_depende_do_conteudo_e_das_opcoes():
+    base = chave_conteudo(b'a,b\n1,2\n', formato='csv')
+    assert base == chave_conteudo(b'a,b\n1,2\n', formato='csv')
+    assert base != chave_conteudo(b'a,b\n1,3\n', formato='csv')
+    assert base != chave_conteudo(b'a,b\n1,2\n', formato='csv', colunas=['a'])
+    # Hash do conteúdo guardado por upload + opções: a mesma chave
+    assert base == chave_opcoes(hash_conteudo(b'a,b\n1,2\n'), formato='csv')
+
+
+def test_guardar_e_obter_preserva_tipos(tmp_path):
+    cache = CacheDatasets(str(tmp_path), max_bytes=50 * 1024**2)
+    df = criar_df()
+
+    assert cache.obter('abc') is None
+    cache.guardar('abc', df, {'relatorio': {'reducao': 3.0}})
+
+    obtido, metadados = cache.obter('abc')
+    pd.testing.assert_frame_equal(obtido, df)
+    assert metadados == {'relatorio': {'reducao': 3.0}}
+
+
+def test_evicao_lru_por_bytes(tmp_path):
+    cache = CacheDatasets(str(tmp_path), max_bytes=10 * 1024**2)
+    cache.guardar('a', criar_df(seed=1))
+    tamanho_entrada = cache.tamanho_total()
+    cache.max_bytes = int(tamanho_entrada * 2.5)
+
+    cache.guardar('b', criar_df(seed=2))
+    # Garante ordem de uso distinguível mesmo em sistemas de arquivos com mtime grosseiro
+    for nome in os.listdir(tmp_path):
+        caminho = os.path.join(tmp_path, nome)
+        atraso = 100 if nome.startswith('b') else 0
+        os.utime(caminho, (time.time() - atraso, time.time() - atraso))
+    cache.obter('a')
+
+    cache.guardar('c', criar_df(seed=3))
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.tamanho_total() <= cache.max_bytes
+
+
+def test_entrada_corrompida_conta_como_ausente_e_sai_do_cache(tmp_path):
+    cache = CacheDatasets(str(tmp_path), max_bytes=50 * 1024**2)
+    cache.guardar('abc', criar_df())
+    with open(cache._caminho('abc', cache.EXTENSAO_DADOS), 'r+b') as arquivo:
+        arquivo.truncate(100)
+
+    assert cache.obter('abc') is None
+    assert 'abc' not in cache
+    assert cache.tamanho_total() == 0
@@ -0,0 +1,78 @@
+"""
+Testes do cache de respostas da IA
+Execute: python -m pytest test_cache_ia.py
+"""
+
+import numpy as np
+import pandas as pd
+
+import ia_gemini
+from cache_ia import CacheRespostas, chave_resposta, impressao_dataframe
+from config import GEMINI_CONFIG
+
+
+class ModeloFalso:
+    def __init__(self):
+        self.chamadas = 0
+
+    def generate_content(self, prompt):
+        self.chamadas += 1
+        return type('Resposta', (), {'text': f"resposta {self.chamadas}"})()
+
+
+def criar_df(n=50):
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        'vendas': rng.integers(1000, 9000, n),
+        'lucro': rng.normal(500, 50, n),
+        'regiao': rng.choice(['Norte', 'Sul'], n)
+    })
+
+
+def test_impressao_muda_com_o_conteudo():
+    df = criar_df()
+    assert impressao_dataframe(df) == impressao_dataframe(df.copy())
+    alterado = df.copy()
+    alterado.loc[0, 'vendas'] += 1
+    assert impressao_dataframe(df) != impressao_dataframe(alterado)
+
+
+def test_ttl_e_limite_de_entradas(tmp_path, monkeypatch):
+    cache = CacheRespostas(str(tmp_path / 'ia.sqlite'), ttl_segundos=60, max_entradas=2)
+    agora = [1000.0]
+    monkeypatch.setattr('cache_ia.time.time', lambda: agora[0])
+
+    cache.guardar('a', 'A')
+    agora[0] += 1
+    cache.guardar('b', 'B')
+    agora[0] += 1
+    assert cache.obter('a') == 'A'  # 'a' passa a ser a mais recente
+    agora[0] += 1
+    cache.guardar('c', 'C')
+
+    assert len(cache) == 2
+    assert cache.obter('b') is None
+    assert cache.obter('c') == 'C'
+
+    agora[0] += 61
+    assert cache.obter('c') is None
+
+
+def test_analisar_reutiliza_resposta_sem_chamar_o_modelo(tmp_path, monkeypatch):
+    modelo = ModeloFalso()
+    monkeypatch.setattr(ia_gemini, 'criar_modelo', lambda config: modelo)
+    cache = CacheRespostas(str(tmp_path / 'ia.sqlite'), ttl_segundos=3600, max_entradas=10)
+    df = criar_df()
+    impressao = impressao_dataframe(df)
+
+    primeira = ia_gemini.analisar(df, cache=cache, impressao=impressao)
+    assert ia_gemini.analisar(df, cache=cache, impressao=impressao) == primeira
+    assert modelo.chamadas == 1
+
+    ia_gemini.analisar(df, 'Qual região vende mais?', cache=cache, impressao=impressao)
+    assert modelo.chamadas == 2
+
+    outra_config = dict(GEMINI_CONFIG, temperature=0.1)
+    ia_gemini.analisar(df, cache=cache, impressao=impressao, config=outra_config)
+    assert modelo.chamadas == 3
+    assert chave_resposta(impressao, ia_gemini.PROMPT_ANALISE, None, outra_config) in cache
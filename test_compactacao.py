@@ -0,0 +1,40 @@
+"""
+Testes da compactação de tipos
+Execute: python -m pytest test_compactacao.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from compactacao import compactar_dataframe
+
+
+def test_compactacao_preserva_valores():
+    rng = np.random.default_rng(1)
+    n = 2000
+    df = pd.DataFrame({
+        'regiao': rng.choice(['Norte', 'Sul', 'Leste', 'Oeste'], n),
+        'id_texto': [f'pedido-{i}' for i in range(n)],
+        'satisfacao': rng.integers(1, 6, n),
+        'vendas': rng.integers(1000, 90000, n),
+        'desconto': rng.uniform(0, 0.35, n).round(3),
+        'metade': np.arange(n) / 2
+    })
+
+    compactado, relatorio = compactar_dataframe(df)
+
+    assert compactado['regiao'].dtype == 'category'
+    assert compactado['id_texto'].dtype == object
+    assert compactado['satisfacao'].dtype == np.int8
+    assert compactado['vendas'].dtype == np.int32
+    assert compactado['desconto'].dtype == np.float64
+    assert compactado['metade'].dtype == np.float32
+    assert relatorio['depois_mb'] < relatorio['antes_mb']
+    assert set(relatorio['colunas']) == {'regiao', 'satisfacao', 'vendas', 'metade'}
+    pd.testing.assert_frame_equal(compactado, df, check_dtype=False, check_categorical=False)
+
+
+def test_somas_por_grupo_nao_estouram():
+    df = pd.DataFrame({'vendas': [30000] * 10, 'regiao': ['Norte'] * 10})
+    compactado, _ = compactar_dataframe(df)
+    assert compactado.groupby('regiao', observed=True)['vendas'].sum().iloc[0] == 300000
@@ -0,0 +1,81 @@
+"""
+Testes do contexto estatístico dos prompts
+Execute: python -m pytest test_contexto_prompt.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from contexto_prompt import QUANTIS, _fmt, amostra_estratificada, estimar_tokens, montar_contexto
+from cubo import CuboOLAP
+from esbocos import EsbocosDataset
+from gerador_dados import gerar_dados_vendas
+
+
+def test_respeita_orcamento_de_tokens():
+    df = gerar_dados_vendas(2000)
+    for orcamento in [40, 200, 800, 3000]:
+        contexto = montar_contexto(df, orcamento_tokens=orcamento)
+        assert estimar_tokens(contexto) + contexto.count('\n') <= orcamento
+    assert 'AMOSTRA ESTRATIFICADA' in montar_contexto(df, orcamento_tokens=3000)
+    assert 'AMOSTRA' not in montar_contexto(df, orcamento_tokens=200)
+
+
+def test_funciona_com_schema_qualquer():
+    rng = np.random.default_rng(5)
+    n = 1000
+    df = pd.DataFrame({
+        'temperatura': rng.normal(25, 5, n),
+        'umidade': rng.uniform(20, 90, n),
+        'sensor': rng.choice(['s1', 's2', 's3'], n),
+        'leitura_id': np.arange(n)
+    })
+    df['sensacao'] = df['temperatura'] * 1.1 + rng.normal(0, 0.5, n)
+    contexto = montar_contexto(df)
+
+    assert '1,000 registros' in contexto
+    assert 'temperatura ~ sensacao' in contexto
+    assert 'sensor (3 valores)' in contexto
+    assert 'leitura_id' not in contexto
+
+
+def test_cubo_e_dataframe_dao_o_mesmo_contexto():
+    df = gerar_dados_vendas(1500)
+    assert montar_contexto(df, cubo=CuboOLAP.construir(df)) == montar_contexto(df)
+
+
+def test_amostra_estratificada_cobre_todos_os_estratos():
+    df = pd.DataFrame({'grupo': ['raro'] * 3 + ['comum'] * 997, 'valor': range(1000)})
+    amostra = amostra_estratificada(df, 'grupo', 10)
+    assert set(amostra['grupo']) == {'raro', 'comum'}
+    assert len(amostra) == 10
+
+
+def test_amostra_nunca_passa_de_n_com_muitos_estratos():
+    df = pd.DataFrame({'grupo': [f'g{i % 20}' for i in range(1000)], 'valor': range(1000)})
+    assert len(amostra_estratificada(df, 'grupo', 8)) == 8
+
+
+def test_amostra_estratificada_com_estratos_booleanos_e_inteiros():
+    df = pd.DataFrame({'ativo': [True] * 7 + [False] * 993, 'faixa': [5] * 3 + [1] * 990 + [0] * 7,
+                       'valor': range(1000)})
+    for coluna in ['ativo', 'faixa']:
+        amostra = amostra_estratificada(df, coluna, 10)
+        assert set(amostra[coluna]) == set(df[coluna])
+        assert len(amostra) == 10
+
+
+def test_secoes_vazias_nao_deixam_linhas_em_branco():
+    df = pd.DataFrame({'nome': [f'n{i % 7}' for i in range(200)], 'cidade': ['A', 'B'] * 100})
+    contexto = montar_contexto(df, orcamento_tokens=3000)
+    assert '\n\n\n' not in contexto
+
+
+def test_quantis_vem_dos_esbocos_e_nao_da_amostra():
+    df = gerar_dados_vendas(3000)
+    esbocos = EsbocosDataset.de_dataframe(df)
+    # Como na ingestão em blocos: o df é só uma amostra, os agregados cobrem tudo
+    contexto = montar_contexto(df.head(100), cubo=CuboOLAP.construir(df), estatisticas=esbocos.describe(),
+                               esbocos=esbocos, n_registros=len(df), orcamento_tokens=3000)
+    faixa = '/'.join(_fmt(v) for v in esbocos.quantis['margem'].quantis(QUANTIS))
+    assert faixa in next(linha for linha in contexto.split('\n') if linha.startswith('- margem:'))
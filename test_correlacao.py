@@ -0,0 +1,73 @@
+"""
+Testes do motor de correlação incremental
+Execute: python -m pytest test_correlacao.py
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from correlacao import MatrizCorrelacao, matriz_do_dataset
+from cubo import CuboOLAP
+from gerador_dados import gerar_dados_vendas
+from ingestao import ingerir_blocos
+
+
+def dados_com_nulos(n=20_000):
+    df = gerar_dados_vendas(n).select_dtypes(include=[np.number])
+    df.loc[df.sample(frac=0.05, random_state=1).index, 'lucro'] = np.nan
+    df.loc[df.sample(frac=0.02, random_state=2).index, 'margem'] = np.nan
+    return df
+
+
+def test_pearson_em_blocos_igual_ao_pandas():
+    df = dados_com_nulos()
+    matriz = MatrizCorrelacao(df.columns)
+    for inicio in range(0, len(df), 3_000):
+        matriz.atualizar(df.iloc[inicio:inicio + 3_000])
+
+    assert matriz.n_registros == len(df)
+    np.testing.assert_allclose(matriz.pearson().to_numpy(), df.corr().to_numpy(), atol=1e-10)
+    sub = matriz.pearson(['lucro', 'vendas'])
+    assert list(sub.columns) == ['lucro', 'vendas']
+    assert sub.loc['lucro', 'vendas'] == matriz.par('vendas', 'lucro')
+
+
+def test_coluna_vazia_no_primeiro_bloco_nao_emite_aviso():
+    df = dados_com_nulos(6_000)
+    df.loc[:2_999, 'margem'] = np.nan
+    matriz = MatrizCorrelacao(df.columns, spearman=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        for inicio in range(0, len(df), 3_000):
+            matriz.atualizar(df.iloc[inicio:inicio + 3_000])
+
+    np.testing.assert_allclose(matriz.pearson().to_numpy(), df.corr().to_numpy(), atol=1e-8)
+
+
+def test_spearman_aproximado_perto_do_exato():
+    df = dados_com_nulos()
+    aproximado = MatrizCorrelacao.de_dataframe(df).spearman_aproximado()
+    np.testing.assert_allclose(aproximado.to_numpy(), df.corr(method='spearman').to_numpy(), atol=0.01)
+
+    # Relação monotônica não linear: Spearman ~1, Pearson bem menor
+    x = np.random.default_rng(0).uniform(0, 10, 5_000)
+    matriz = MatrizCorrelacao.de_dataframe(pd.DataFrame({'x': x, 'y': np.exp(x)}))
+    assert matriz.par('x', 'y', metodo='spearman') > 0.99 > 0.8 > matriz.par('x', 'y')
+
+
+def test_ingestao_em_blocos_reaproveita_a_matriz_do_cubo():
+    df = gerar_dados_vendas(12_000)
+    resumo = ingerir_blocos(df.iloc[i:i + 2_500] for i in range(0, len(df), 2_500))
+    colunas = ['vendas', 'lucro', 'margem']
+
+    matriz = matriz_do_dataset(resumo.amostra, resumo.cubo, colunas)
+    assert matriz is resumo.cubo.correlacao
+    np.testing.assert_allclose(matriz.pearson(colunas).to_numpy(), df[colunas].corr().to_numpy(), atol=1e-10)
+
+    # Cubo sem a matriz (gravado antes dela) ou sem a coluna: calcula do DataFrame
+    cubo_antigo = CuboOLAP.construir(df)
+    del cubo_antigo.correlacao
+    assert matriz_do_dataset(df, cubo_antigo, colunas).n_registros == len(df)
+    assert matriz_do_dataset(df, resumo.cubo, ['id', 'vendas']) is not resumo.cubo.correlacao
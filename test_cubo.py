@@ -0,0 +1,65 @@
+"""
+Testes do cubo OLAP
+Execute: python -m pytest test_cubo.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cubo import CuboOLAP
+from gerador_dados import gerar_dados_vendas
+
+
+@pytest.fixture(scope='module')
+def df():
+    return gerar_dados_vendas(3000)
+
+
+def test_consultas_iguais_ao_groupby(df):
+    cubo = CuboOLAP.construir(df)
+
+    esperado = df.groupby('regiao', observed=True)['vendas'].agg(['sum', 'count', 'min', 'max', 'mean'])
+    for func in esperado.columns:
+        np.testing.assert_allclose(cubo.agregar('regiao', 'vendas', func).sort_index(), esperado[func].sort_index())
+
+    rotulo, valor = cubo.top('produto', 'vendas')
+    somas = df.groupby('produto', observed=True)['vendas'].sum()
+    assert rotulo == somas.idxmax() and valor == somas.max()
+    assert cubo.n_registros == len(df)
+    assert cubo.total('lucro') == df['lucro'].sum()
+    assert np.isclose(cubo.media('satisfacao'), df['satisfacao'].mean())
+
+
+def test_pares_nos_dois_sentidos(df):
+    cubo = CuboOLAP.construir(df)
+    esperado = df.groupby(['produto', 'regiao'], observed=True)['lucro'].sum().sort_index()
+    pd.testing.assert_series_equal(cubo.agregar(('produto', 'regiao'), 'lucro').sort_index(), esperado,
+                                   check_names=False, check_index_type=False)
+    with pytest.raises(KeyError):
+        cubo.agregar(('vendedor', 'genero'), 'lucro')
+
+
+def test_cubo_mesclado_por_blocos_igual_ao_completo(df):
+    completo = CuboOLAP.construir(df)
+    em_blocos = CuboOLAP.para_colunas(df.columns, df.select_dtypes(include=[np.number]).columns)
+    for inicio in range(0, len(df), 700):
+        em_blocos.atualizar(df.iloc[inicio:inicio + 700])
+
+    assert em_blocos.n_registros == completo.n_registros
+    for func in ['sum', 'count', 'min', 'max']:
+        pd.testing.assert_series_equal(
+            em_blocos.agregar(('regiao', 'categoria'), 'vendas', func).sort_index(),
+            completo.agregar(('regiao', 'categoria'), 'vendas', func).sort_index(),
+            check_index_type=False, check_dtype=False
+        )
+    assert em_blocos.total('vendas', 'max') == completo.total('vendas', 'max')
+
+
+def test_top_em_cubo_vazio_ou_dimensao_sem_grupos(df):
+    rotulo, valor = CuboOLAP.construir(df.head(0)).top('regiao', 'vendas')
+    assert rotulo is None and np.isnan(valor)
+
+    sem_regiao = df.head(50).assign(regiao=np.nan)
+    rotulo, valor = CuboOLAP.construir(sem_regiao).top('regiao', 'vendas')
+    assert rotulo is None and np.isnan(valor)
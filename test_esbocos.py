@@ -0,0 +1,76 @@
+"""
+Testes dos esboços aproximados (KLL, HyperLogLog e momentos)
+Execute: python -m pytest test_esbocos.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from esbocos import EsbocoKLL, EsbocosDataset, HyperLogLog
+
+
+def test_kll_respeita_erro_de_posto_e_combina():
+    rng = np.random.default_rng(1)
+    valores = rng.lognormal(5, 1, 400_000)
+    ordenados = np.sort(valores)
+    qs = np.linspace(0.01, 0.99, 99)
+
+    a, b = EsbocoKLL(200, seed=1), EsbocoKLL(200, seed=2)
+    for inicio in range(0, 200_000, 5_000):
+        a.atualizar(valores[inicio:inicio + 5_000])
+    b.atualizar(valores[200_000:])
+    a.combinar(b)
+
+    postos = np.searchsorted(ordenados, a.quantis(qs)) / len(valores)
+    assert np.abs(postos - qs).max() <= a.erro_posto
+    assert a.n == len(valores) and a.itens_guardados < 2_000
+    assert a.quantis([0, 1]).tolist() == [valores.min(), valores.max()]
+
+
+def test_hyperloglog_estima_distintos_e_combina():
+    rng = np.random.default_rng(2)
+    for n_distintos in [7, 3_000, 200_000]:
+        valores = pd.Series(rng.integers(0, n_distintos, 300_000))
+        a, b = HyperLogLog(12), HyperLogLog(12)
+        a.atualizar(valores[:150_000])
+        b.atualizar(valores[150_000:])
+        reais = valores.nunique()
+        assert abs(a.combinar(b).estimativa() / reais - 1) <= 3 * a.erro_relativo
+
+    textos = HyperLogLog(12).atualizar(pd.Series(['a', 'b', None, 'a', 'c']))
+    assert round(textos.estimativa()) == 3
+
+
+def test_describe_por_blocos_bate_com_pandas():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'vendas': rng.integers(100, 10_000, 50_000),
+        'lucro': rng.normal(500, 100, 50_000),
+        'regiao': rng.choice(['Norte', 'Sul', 'Leste'], 50_000)
+    })
+    df.loc[::40, 'lucro'] = np.nan
+
+    metade = len(df) // 2
+    esbocos = EsbocosDataset.de_dataframe(df.iloc[:metade], tamanho_bloco=7_000)
+    esbocos.combinar(EsbocosDataset.de_dataframe(df.iloc[metade:], tamanho_bloco=7_000))
+
+    esperado, obtido = df.describe(), esbocos.describe()
+    for linha in ['count', 'mean', 'std', 'min', 'max']:
+        np.testing.assert_allclose(obtido.loc[linha, esperado.columns], esperado.loc[linha])
+    for col in esperado.columns:
+        for linha, q in [('25%', 0.25), ('50%', 0.5), ('75%', 0.75)]:
+            posto = (df[col] <= obtido.loc[linha, col]).sum() / df[col].count()
+            assert abs(posto - q) <= esbocos.erro_quantis
+    assert esbocos.n_distintos()['regiao'] == 3
+    assert 'KLL' in esbocos.nota_erro()
+
+
+def test_coluna_numerica_que_vira_texto_em_outro_bloco_continua_contada():
+    esbocos = EsbocosDataset()
+    esbocos.atualizar(pd.DataFrame({'vendas': [10.0, 20.0, 30.0]}))
+    esbocos.atualizar(pd.DataFrame({'vendas': ['40', 'N/A', '50']}))
+
+    resumo = esbocos.describe()['vendas']
+    assert resumo['count'] == 5
+    assert resumo['max'] == 50
+    assert resumo['mean'] == 30
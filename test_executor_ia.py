@@ -0,0 +1,84 @@
+"""
+Testes do executor concorrente de análises da IA
+Execute: python -m pytest test_executor_ia.py
+"""
+
+import threading
+import time
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from executor_ia import ExecutorIA, LimitadorTaxa, com_retentativas, eh_erro_de_cota
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+        self.esperas = []
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+
+def test_token_bucket_libera_rajada_e_depois_segue_a_taxa():
+    relogio = RelogioFalso()
+    limitador = LimitadorTaxa(60, capacidade=3, relogio=relogio, dormir=relogio.dormir)
+    for _ in range(3):
+        limitador.adquirir()
+    assert relogio.esperas == []
+
+    limitador.adquirir()
+    limitador.adquirir()
+    assert relogio.agora == pytest.approx(2.0)
+
+
+def test_retentativas_com_espera_exponencial_so_em_erro_de_cota():
+    esperas = []
+    falhas = [google_exceptions.ResourceExhausted('quota'), RuntimeError('429 Too Many Requests')]
+
+    def chamada():
+        if falhas:
+            raise falhas.pop(0)
+        return 'ok'
+
+    assert com_retentativas(chamada, tentativas=3, espera_inicial=1.0, dormir=esperas.append) == 'ok'
+    assert len(esperas) == 2
+    assert 0.8 <= esperas[0] <= 1.2 and 1.6 <= esperas[1] <= 2.4
+
+    with pytest.raises(ValueError):
+        com_retentativas(lambda: (_ for _ in ()).throw(ValueError('outro erro')), dormir=esperas.append)
+    assert len(esperas) == 2
+    assert not eh_erro_de_cota(ValueError('chave inválida'))
+
+
+def test_executar_respeita_limite_de_concorrencia():
+    executor = ExecutorIA(max_concorrencia=2, requisicoes_por_minuto=None)
+    ativas, maximo, trava = [0], [0], threading.Lock()
+
+    def tarefa(valor):
+        def executar():
+            with trava:
+                ativas[0] += 1
+                maximo[0] = max(maximo[0], ativas[0])
+            time.sleep(0.05)
+            with trava:
+                ativas[0] -= 1
+            if valor == 3:
+                raise ValueError('falhou')
+            return valor * 10
+        return executar
+
+    progresso = []
+    resultados = executor.executar({i: tarefa(i) for i in range(6)},
+                                   ao_concluir=lambda nome, r, feitas, total: progresso.append((feitas, total)))
+    executor.encerrar()
+
+    assert maximo[0] == 2
+    assert isinstance(resultados.pop(3), ValueError)
+    assert resultados == {0: 0, 1: 10, 2: 20, 4: 40, 5: 50}
+    assert progresso[-1] == (6, 6)
@@ -0,0 +1,133 @@
+"""
+Testes da exportação em blocos
+Execute: python -m pytest test_exportacao.py
+"""
+
+import gzip
+import io
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exportacao import (DIRETORIO_EXPORTACOES, FORMATOS_BINARIOS, OPENPYXL_AVAILABLE, ZSTD_AVAILABLE, escrever_csv,
+                        escrever_json, escrever_excel, exportar_em_arquivo, limpar_exportacoes_antigas,
+                        remover_arquivo)
+from formatos import PYARROW_AVAILABLE
+
+
+def criar_df(n=1000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'vendas': rng.normal(5000, 800, n).round(2),
+        'regiao': rng.choice(['Norte', 'Sul'], n),
+        'data': pd.date_range('2024-01-01', periods=n, freq='h')
+    })
+    df.loc[::17, 'vendas'] = np.nan
+    return df
+
+
+def test_csv_em_blocos_igual_ao_pandas_com_as_opcoes():
+    df = criar_df()
+    for opcoes in [{}, {'incluir_indice': True, 'formato_data': '%d/%m/%Y', 'decimal': ','}]:
+        destino = io.BytesIO()
+        escrever_csv(df, destino, tamanho_bloco=64, **opcoes)
+        decimal = opcoes.get('decimal', '.')
+        esperado = df.to_csv(index=opcoes.get('incluir_indice', False), sep=';' if decimal == ',' else ',',
+                             decimal=decimal, date_format=opcoes.get('formato_data'))
+        assert destino.getvalue().decode('utf-8') == esperado
+
+
+def test_json_em_blocos_e_array_de_registros_valido():
+    df = criar_df(300)
+    destino = io.BytesIO()
+    escrever_json(df, destino, tamanho_bloco=7)
+    assert destino.getvalue().decode('utf-8') == df.to_json(orient='records', indent=2, date_format='iso')
+
+    destino = io.BytesIO()
+    escrever_json(df.head(5), destino, incluir_indice=True, formato_data='%d/%m/%Y', tamanho_bloco=2)
+    registros = json.loads(destino.getvalue())
+    assert [r['index'] for r in registros] == list(range(5))
+    assert registros[0]['data'] == '01/01/2024'
+
+    vazio = io.BytesIO()
+    escrever_json(df.head(0), vazio)
+    assert json.loads(vazio.getvalue()) == []
+
+
+@pytest.mark.parametrize('compressao', [None, 'gzip', 'zstd'])
+def test_arquivo_temporario_comprimido_relido(compressao):
+    if compressao == 'zstd' and not ZSTD_AVAILABLE:
+        pytest.skip('zstd indisponível')
+    df = criar_df()
+    caminho, estatisticas = exportar_em_arquivo(df, 'csv', compressao=compressao, tamanho_bloco=100)
+    try:
+        if compressao == 'zstd':
+            # pandas lê zstd só com o pacote zstandard; o pyarrow descomprime sozinho
+            import pyarrow as pa
+            with pa.CompressedInputStream(caminho, 'zstd') as fonte:
+                relido = pd.read_csv(io.BytesIO(fonte.read()), parse_dates=['data'])
+        else:
+            relido = pd.read_csv(caminho, compression=compressao, parse_dates=['data'])
+        pd.testing.assert_frame_equal(relido, df)
+        assert estatisticas['registros'] == len(df) and estatisticas['bytes'] > 0
+        if compressao == 'gzip':
+            with gzip.open(caminho) as arquivo:
+                assert arquivo.readline().startswith(b'vendas,regiao,data')
+    finally:
+        remover_arquivo(caminho)
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason='pyarrow indisponível')
+@pytest.mark.parametrize('formato', FORMATOS_BINARIOS)
+def test_formatos_colunares_gravados_em_arquivo(formato):
+    df = criar_df()
+    # A compressão de CSV/JSON não vale para os formatos colunares
+    caminho, estatisticas = exportar_em_arquivo(df, formato, compressao='gzip')
+    try:
+        assert caminho.endswith(f'.{formato}')
+        relido = pd.read_parquet(caminho) if formato == 'parquet' else pd.read_feather(caminho)
+        pd.testing.assert_frame_equal(relido, df)
+        assert estatisticas['registros'] == len(df) and estatisticas['bytes'] > 0
+    finally:
+        remover_arquivo(caminho)
+
+
+@pytest.mark.skipif(not OPENPYXL_AVAILABLE, reason='openpyxl indisponível')
+def test_excel_divide_abas_no_limite_de_linhas(tmp_path):
+    df = criar_df(25)
+    caminho = tmp_path / 'dados.xlsx'
+    abas = escrever_excel(df, caminho, estatisticas=df[['vendas']].describe(), analise_ia='Resumo da IA',
+                          tamanho_bloco=4, max_linhas=11)
+    assert abas == 3
+
+    livro = pd.read_excel(caminho, sheet_name=None)
+    assert list(livro) == ['Dados', 'Dados_2', 'Dados_3', 'Estatísticas', 'Análise_IA']
+    dados = pd.concat([livro['Dados'], livro['Dados_2'], livro['Dados_3']], ignore_index=True)
+    assert [len(livro[f]) for f in ['Dados', 'Dados_2', 'Dados_3']] == [10, 10, 5]
+    pd.testing.assert_frame_equal(dados, df, check_dtype=False)
+    assert livro['Análise_IA'].iloc[0, 0] == 'Resumo da IA'
+
+    caminho_tmp, estatisticas = exportar_em_arquivo(df, 'xlsx', compressao='gzip')
+    assert caminho_tmp.endswith('.xlsx') and estatisticas['abas'] == 1
+    remover_arquivo(caminho_tmp)
+
+
+def test_limpeza_apaga_so_exportacoes_antigas(tmp_path):
+    caminho, _ = exportar_em_arquivo(criar_df(10), 'csv')
+    try:
+        assert os.path.dirname(caminho) == DIRETORIO_EXPORTACOES
+    finally:
+        remover_arquivo(caminho)
+
+    for nome in ('datainsight_velho.csv', 'datainsight_novo.csv', 'outro.csv'):
+        (tmp_path / nome).write_text('a\n1\n')
+    velho = time.time() - 7200
+    os.utime(tmp_path / 'datainsight_velho.csv', (velho, velho))
+    os.utime(tmp_path / 'outro.csv', (velho, velho))
+
+    assert limpar_exportacoes_antigas(3600, str(tmp_path)) == 1
+    assert sorted(os.listdir(tmp_path)) == ['datainsight_novo.csv', 'outro.csv']
@@ -0,0 +1,84 @@
+"""
+Testes do motor de filtros do Explorador
+Execute: python -m pytest test_filtros.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from filtros import MotorFiltros
+
+
+def criar_df(n=5000):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'vendas': rng.integers(1000, 90000, n),
+        'lucro': rng.normal(500, 200, n),
+        'regiao': pd.Categorical(rng.choice(['Norte', 'Sul', 'Leste', 'Oeste'], n)),
+        'produto': rng.choice(['A', 'B', 'C'], n).astype(object)
+    })
+    df.loc[::40, 'lucro'] = np.nan
+    df.loc[::97, 'produto'] = np.nan
+    return df
+
+
+def esperado(df, coluna=None, valores=None, faixa_col=None, faixa=None):
+    filtrado = df
+    if coluna is not None:
+        filtrado = filtrado[filtrado[coluna].isin(valores)]
+    if faixa_col is not None:
+        filtrado = filtrado[(filtrado[faixa_col] >= faixa[0]) & (filtrado[faixa_col] <= faixa[1])]
+    return filtrado
+
+
+def conferir(motor, filtrado):
+    assert motor.n_registros == len(filtrado)
+    assert np.isclose(motor.soma('vendas'), filtrado['vendas'].sum())
+    assert np.isclose(motor.soma('lucro'), filtrado['lucro'].sum())
+    pd.testing.assert_frame_equal(motor.filtrar(), filtrado)
+
+
+def test_categorias_incrementais_coincidem_com_mascara():
+    df = criar_df()
+    motor = MotorFiltros(df)
+    for valores in [['Norte'], ['Norte', 'Sul'], ['Sul', 'Leste', 'Oeste'], ['Oeste']]:
+        motor.definir_categorias('regiao', valores)
+        conferir(motor, esperado(df, 'regiao', valores))
+
+    motor.definir_categorias('produto', ['A', np.nan])
+    conferir(motor, esperado(df, 'produto', ['A', np.nan]))
+
+    motor.definir_categorias(None, None)
+    assert motor.filtrar() is df
+
+
+def test_faixa_numerica_combinada_com_categorias():
+    df = criar_df()
+    motor = MotorFiltros(df)
+
+    motor.definir_faixa('lucro', 300.0, 700.0)
+    conferir(motor, esperado(df, faixa_col='lucro', faixa=(300, 700)))
+
+    motor.definir_categorias('regiao', ['Norte', 'Leste'])
+    conferir(motor, esperado(df, 'regiao', ['Norte', 'Leste'], 'lucro', (300, 700)))
+
+    motor.definir_categorias('regiao', ['Leste'])
+    motor.definir_faixa('lucro', 450.0, 650.0)
+    filtrado = esperado(df, 'regiao', ['Leste'], 'lucro', (450, 650))
+    conferir(motor, filtrado)
+
+    pd.testing.assert_series_equal(
+        motor.agregar('produto', 'vendas'),
+        filtrado.groupby('produto')['vendas'].sum().astype('float64'),
+        check_index_type=False, check_names=False
+    )
+
+
+def test_agregar_por_dimensao_filtrada():
+    df = criar_df()
+    motor = MotorFiltros(df).definir_categorias('regiao', ['Sul', 'Norte'])
+    obtido = motor.agregar('regiao', 'vendas').sort_index()
+    filtrado = esperado(df, 'regiao', ['Sul', 'Norte'])
+    referencia = filtrado.groupby('regiao', observed=True)['vendas'].sum().sort_index()
+    np.testing.assert_allclose(obtido.to_numpy(), referencia.to_numpy())
+    assert list(obtido.index) == list(referencia.index)
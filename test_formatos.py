@@ -0,0 +1,75 @@
+"""
+Testes dos formatos colunares (Parquet / Feather / Arrow IPC)
+Execute: python -m pytest test_formatos.py
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from formatos import (colunas_disponiveis, exportar_feather, exportar_parquet,
+                      formato_do_arquivo, interpretar_valor, ler_colunar)
+
+
+def criar_df(n=3000):
+    rng = np.random.default_rng(2)
+    return pd.DataFrame({
+        'vendas': rng.integers(1000, 90000, n),
+        'lucro': rng.normal(500, 100, n),
+        'regiao': pd.Categorical(rng.choice(['Norte', 'Sul', 'Leste'], n)),
+        'produto': rng.choice(['A', 'B', 'C'], n)
+    })
+
+
+def test_formato_do_arquivo():
+    assert formato_do_arquivo('dados.PARQUET') == 'parquet'
+    assert formato_do_arquivo('export.arrow') == 'arrow'
+    with pytest.raises(ValueError):
+        formato_do_arquivo('dados.txt')
+
+
+@pytest.mark.parametrize('formato, exportar', [
+    ('parquet', exportar_parquet),
+    ('feather', exportar_feather)
+])
+def test_ida_e_volta(formato, exportar):
+    df = criar_df()
+    fonte = io.BytesIO(exportar(df))
+
+    assert colunas_disponiveis(fonte, formato) == list(df.columns)
+    pd.testing.assert_frame_equal(ler_colunar(fonte, formato), df)
+
+
+@pytest.mark.parametrize('formato, exportar', [
+    ('parquet', exportar_parquet),
+    ('feather', exportar_feather)
+])
+def test_projecao_e_filtro(formato, exportar):
+    df = criar_df()
+    fonte = io.BytesIO(exportar(df))
+
+    lido = ler_colunar(fonte, formato, colunas=['vendas', 'produto'],
+                       filtros=[('produto', '==', 'A'), ('vendas', '>=', 50000)])
+    esperado = df.loc[(df['produto'] == 'A') & (df['vendas'] >= 50000), ['vendas', 'produto']]
+
+    assert list(lido.columns) == ['vendas', 'produto']
+    pd.testing.assert_frame_equal(lido.reset_index(drop=True), esperado.reset_index(drop=True))
+
+
+def test_parquet_filtra_com_varios_row_groups():
+    df = pd.DataFrame({'vendas': np.arange(10000)})
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buffer, row_group_size=1000)
+
+    lido = ler_colunar(buffer, 'parquet', filtros=[('vendas', '<', 1500)])
+    assert len(lido) == 1500
+
+
+def test_interpretar_valor():
+    assert interpretar_valor('10') == 10
+    assert interpretar_valor('2.5') == 2.5
+    assert interpretar_valor('Norte') == 'Norte'
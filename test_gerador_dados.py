@@ -0,0 +1,61 @@
+"""
+Testes do gerador vetorizado de dados de exemplo
+Execute: python -m pytest test_gerador_dados.py
+"""
+
+import pandas as pd
+import pytest
+
+from gerador_dados import gerar_blocos, gerar_dados_vendas, salvar_dados
+
+COLUNAS_APP = [
+    'id', 'vendas', 'custo', 'lucro', 'margem', 'regiao', 'produto', 'categoria', 'mes',
+    'vendedor', 'canal', 'satisfacao', 'quantidade', 'desconto', 'tempo_entrega', 'avaliacao',
+    'idade_cliente', 'genero', 'ticket_medio', 'roi', 'score_cliente'
+]
+
+
+def test_schema_e_regras_do_perfil_app():
+    df = gerar_dados_vendas(20000, perfil='app')
+
+    assert list(df.columns) == COLUNAS_APP
+    assert df['id'].is_unique and df['id'].min() == 1
+    assert (df['vendas'] >= 2000).all()
+    assert (df['lucro'] == df['vendas'] - df['custo']).all()
+    assert df['satisfacao'].between(1, 5).all()
+    # Regras de negócio do gerador original
+    assert (df.loc[df['margem'] > 45, 'satisfacao'] >= 4).all()
+    assert (df.loc[df['vendas'] > 50000, 'quantidade'] < 5).all()
+
+
+def test_perfis_robusto_e_exemplo():
+    robusto = gerar_dados_vendas(5000, perfil='robusto')
+    exemplo = gerar_dados_vendas(5000, perfil='exemplo')
+
+    assert {'cidade', 'forma_pagamento', 'vendas_por_dia', 'eficiencia'} <= set(robusto.columns)
+    assert robusto['regiao'].nunique() == 6
+    assert 'data_venda' in exemplo.columns and 'avaliacao' not in exemplo.columns
+    assert (exemplo.loc[exemplo['canal'] == 'Loja Física', 'tempo_entrega'] == 0).all()
+    assert set(exemplo['mes'].unique()) <= {
+        'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+        'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
+    }
+
+
+def test_blocos_reprodutiveis_e_continuos():
+    blocos = list(gerar_blocos(2500, tamanho_bloco=1000, seed=7))
+    assert [len(b) for b in blocos] == [1000, 1000, 500]
+    juntos = pd.concat(blocos, ignore_index=True)
+    assert juntos['id'].tolist() == list(range(1, 2501))
+    de_novo = pd.concat(gerar_blocos(2500, tamanho_bloco=1000, seed=7), ignore_index=True)
+    pd.testing.assert_frame_equal(juntos, de_novo)
+
+
+@pytest.mark.parametrize('extensao', ['.csv', '.parquet'])
+def test_salvar_em_blocos(tmp_path, extensao):
+    caminho = str(tmp_path / f'vendas{extensao}')
+    total = salvar_dados(caminho, 2500, tamanho_bloco=1000)
+
+    lido = pd.read_csv(caminho) if extensao == '.csv' else pd.read_parquet(caminho)
+    assert total == len(lido) == 2500
+    assert lido['id'].tolist() == list(range(1, 2501))
@@ -0,0 +1,73 @@
+"""
+Testes do cache de figuras Plotly
+Execute: python -m pytest test_graficos_cache.py
+"""
+
+import threading
+import time
+
+from cubo import CuboOLAP
+from gerador_dados import gerar_dados_vendas
+from graficos_avancados import GRAFICOS, construir_grafico
+from graficos_cache import CacheFiguras, carregar_figura, chave_figura
+
+
+def test_figura_volta_do_cache_sem_reconstruir():
+    df = gerar_dados_vendas(500)
+    cubo = CuboOLAP.construir(df)
+    cache = CacheFiguras(max_bytes=50 * 1024 * 1024)
+    construcoes = []
+
+    def construir(grafico):
+        construcoes.append(grafico)
+        return construir_grafico(grafico, df, cubo)
+
+    for _ in range(2):
+        for grafico in GRAFICOS:
+            chave = chave_figura('v1', grafico, GRAFICOS[grafico][1])
+            texto = cache.obter_ou_criar(chave, lambda: construir(grafico))
+            assert carregar_figura(texto).layout.title.text
+
+    assert construcoes == list(GRAFICOS)
+    assert cache.acertos >= len(GRAFICOS)
+    # Parâmetros diferentes são outra figura
+    assert chave_figura('v1', 'vendas_produto', {'top_n': 5}) != chave_figura('v1', 'vendas_produto', {'top_n': 8})
+
+
+def test_grafico_sem_colunas_fica_marcado_como_ausente():
+    df = gerar_dados_vendas(200)[['vendas', 'regiao']]
+    cache = CacheFiguras(max_bytes=1024 * 1024)
+    texto = cache.obter_ou_criar('x', lambda: construir_grafico('top_vendedores', df, None))
+    assert texto == '' and 'x' in cache
+    assert carregar_figura(texto) is None
+
+
+def test_limite_de_bytes_descarta_menos_usadas():
+    cache = CacheFiguras(max_bytes=30)
+    cache.guardar('a', 'a' * 10)
+    cache.guardar('b', 'b' * 10)
+    cache.guardar('c', 'c' * 10)
+    cache.obter('a')
+    cache.guardar('d', 'd' * 10)
+
+    assert 'b' not in cache and all(c in cache for c in 'acd')
+    assert cache.bytes_usados == 30
+    cache.guardar('grande', 'g' * 31)
+    assert 'grande' not in cache
+
+
+def test_sessoes_simultaneas_constroem_uma_vez():
+    cache = CacheFiguras(max_bytes=1024)
+    chamadas = []
+
+    def construir():
+        chamadas.append(1)
+        time.sleep(0.05)
+        return None
+
+    threads = [threading.Thread(target=cache.obter_ou_criar, args=('k', construir)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(chamadas) == 1
@@ -0,0 +1,63 @@
+"""
+Testes dos histogramas e box plots pré-calculados
+Execute: python -m pytest test_graficos_estatisticas.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from cubo import CuboOLAP
+from gerador_dados import gerar_dados_vendas
+from graficos_avancados import construir_grafico
+from graficos_estatisticas import estatisticas_caixa, estatisticas_caixa_por_grupo, histograma
+
+
+def test_histograma_ignora_nan_e_conta_tudo():
+    valores = np.array([1.0, 2.0, 2.5, np.nan, 10.0])
+    bordas, contagens = histograma(valores, nbins=3)
+    assert len(bordas) == 4 and contagens.sum() == 4
+    assert bordas[0] == 1.0 and bordas[-1] == 10.0
+
+
+def test_caixa_igual_a_definicao_de_tukey():
+    rng = np.random.default_rng(3)
+    valores = np.append(rng.normal(100, 10, 5000), [400.0, -300.0])
+    caixa = estatisticas_caixa(valores, max_outliers=1000)
+    q1, med, q3 = np.quantile(valores, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    dentro = valores[(valores >= q1 - 1.5 * iqr) & (valores <= q3 + 1.5 * iqr)]
+
+    assert (caixa['q1'], caixa['med'], caixa['q3']) == (q1, med, q3)
+    assert (caixa['whislo'], caixa['whishi']) == (dentro.min(), dentro.max())
+    assert len(caixa['fliers']) == len(valores) - len(dentro)
+    assert {400.0, -300.0} <= set(caixa['fliers'])
+    assert len(estatisticas_caixa(valores, max_outliers=5)['fliers']) == 5
+
+
+def test_caixa_por_grupo_segue_ordem_e_rotulos_dos_grupos():
+    df = pd.DataFrame({'g': pd.Categorical(['b', 'a', 'b', 'a', 'c']), 'h': [1, 1, 2, 1, 1],
+                       'v': [1.0, 2.0, 3.0, 4.0, 5.0]})
+    assert [e['label'] for e in estatisticas_caixa_por_grupo(df, 'g', 'v')] == ['b', 'a', 'c']
+    por_dois = estatisticas_caixa_por_grupo(df, ['g', 'h'], 'v')
+    assert [e['label'] for e in por_dois] == [('b', 1), ('a', 1), ('b', 2), ('c', 1)]
+    assert por_dois[1]['med'] == 3.0
+
+
+def test_figura_nao_cresce_com_o_numero_de_linhas():
+    tamanhos = []
+    for n in [2_000, 100_000]:
+        df = gerar_dados_vendas(n)
+        cubo = CuboOLAP.construir(df)
+        tamanhos.append(sum(len(construir_grafico(g, df, cubo).to_json())
+                            for g in ['distribuicao_vendas', 'vendas_produto']))
+    assert tamanhos[1] < 3 * tamanhos[0]
+
+
+def test_serie_vazia_ou_so_nan_nao_quebra_a_caixa():
+    assert estatisticas_caixa([]) is None
+    assert estatisticas_caixa([np.nan, np.nan]) is None
+
+    df = gerar_dados_vendas(200)
+    df['vendas'] = np.nan
+    fig = construir_grafico('distribuicao_vendas', df, CuboOLAP.construir(df))
+    assert [trace.type for trace in fig.data] == ['bar']
@@ -0,0 +1,59 @@
+"""
+Testes do nível de detalhe dos gráficos
+Execute: python -m pytest test_graficos_lod.py
+"""
+
+import numpy as np
+
+from cubo import CuboOLAP
+from gerador_dados import gerar_dados_vendas
+from graficos_avancados import construir_grafico
+from graficos_lod import densidade_2d, lttb, minmax, modo_dispersao, reduzir_linha
+
+
+def test_lttb_mantem_extremos_e_picos():
+    x = np.arange(10_000)
+    y = np.sin(x / 500.0)
+    y[6_123] = 50.0
+    indices = lttb(x, y, 200)
+
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert 6_123 in indices
+
+
+def test_minmax_guarda_minimo_e_maximo_de_cada_balde():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=10_000)
+    indices = minmax(y, 100)
+    assert len(indices) <= 200
+    assert y.argmin() in indices and y.argmax() in indices
+
+    x_meses = np.array(['Jan', 'Fev', 'Mar'])
+    assert reduzir_linha(x_meses, np.array([1, 2, 3]), max_pontos=10)[0].tolist() == ['Jan', 'Fev', 'Mar']
+
+
+def test_densidade_tem_tamanho_fixo_e_conta_todos():
+    rng = np.random.default_rng(2)
+    x = rng.integers(1, 6, 200_000).astype(float)
+    y = rng.normal(5000, 800, 200_000)
+    centros_x, centros_y, contagens = densidade_2d(x, y, grade=50)
+
+    assert centros_x.tolist() == [1, 2, 3, 4, 5]
+    assert contagens.shape == (50, 5)
+    assert contagens.sum() == 200_000
+
+
+def test_dispersao_escolhe_modo_pelo_numero_de_linhas():
+    assert [modo_dispersao(n) for n in [100, 20_000, 1_000_000]] == ['svg', 'webgl', 'densidade']
+
+    df = gerar_dados_vendas(3000)
+    cubo = CuboOLAP.construir(df)
+    tamanhos = {}
+    for limites, tipo in [((5000, 10000), 'scatter'), ((100, 10000), 'scattergl'), ((100, 1000), 'heatmap')]:
+        fig = construir_grafico('vendas_satisfacao', df, cubo,
+                                {'limite_svg': limites[0], 'limite_webgl': limites[1]})
+        assert fig.data[0].type == tipo
+        tamanhos[tipo] = len(fig.to_json())
+    assert tamanhos['heatmap'] < tamanhos['scatter'] / 10
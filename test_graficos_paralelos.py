@@ -0,0 +1,38 @@
+"""
+Testes da construção paralela de gráficos
+Execute: python -m pytest test_graficos_paralelos.py
+"""
+
+import threading
+import time
+
+from graficos_paralelos import executar_graficos
+
+
+def test_tarefas_rodam_juntas_e_tempos_sao_medidos():
+    barreira = threading.Barrier(3, timeout=5)
+
+    def tarefa(valor):
+        def construir():
+            barreira.wait()  # só passa se as três estiverem rodando ao mesmo tempo
+            time.sleep(0.01 * valor)
+            return valor
+        return construir
+
+    progresso = []
+    resultados, tempos = executar_graficos(
+        {nome: tarefa(i) for i, nome in enumerate(['a', 'b', 'c'], start=1)}, max_trabalhadores=3,
+        ao_concluir=lambda nome, r, s, feitas, total: progresso.append((nome, feitas, total))
+    )
+
+    assert resultados == {'a': 1, 'b': 2, 'c': 3}
+    assert set(tempos) == {'a', 'b', 'c'} and tempos['c'] >= 0.03
+    assert [p[1:] for p in progresso] == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_erro_em_um_grafico_nao_derruba_os_outros():
+    resultados, tempos = executar_graficos({'ok': lambda: 'figura', 'falha': lambda: 1 / 0})
+    assert resultados['ok'] == 'figura'
+    assert isinstance(resultados['falha'], ZeroDivisionError)
+    assert 'falha' in tempos
+    assert executar_graficos({}) == ({}, {})
@@ -0,0 +1,121 @@
+"""
+Testes da integração com o Gemini contra um servidor falso local
+Execute: python -m pytest test_ia_gemini.py
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ia_gemini
+from config import GEMINI_CONFIG
+
+
+def resposta_json(texto):
+    return {'candidates': [{'content': {'parts': [{'text': texto}], 'role': 'model'},
+                            'finishReason': 'STOP', 'index': 0}]}
+
+
+class GeminiFalso(BaseHTTPRequestHandler):
+    trechos = ['Vendas ', 'em ', 'alta']
+    streaming_disponivel = True
+    erro_streaming = 400
+    caminhos = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        GeminiFalso.caminhos.append(self.path)
+        if 'streamGenerateContent' in self.path:
+            if not self.streaming_disponivel:
+                self.send_error(self.erro_streaming, 'streaming desativado')
+                return
+            corpo = [resposta_json(t) for t in self.trechos]
+        else:
+            corpo = resposta_json(''.join(self.trechos))
+        dados = json.dumps(corpo).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def config_falsa():
+    servidor = HTTPServer(('127.0.0.1', 0), GeminiFalso)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    GeminiFalso.streaming_disponivel = True
+    GeminiFalso.erro_streaming = 400
+    GeminiFalso.trechos = ['Vendas ', 'em ', 'alta']
+    GeminiFalso.caminhos = []
+    config = dict(GEMINI_CONFIG, api_endpoint=f'http://127.0.0.1:{servidor.server_port}')
+    ia_gemini.configurar('chave-falsa', config)
+    yield config
+    servidor.shutdown()
+
+
+def criar_df(n=30):
+    rng = np.random.default_rng(4)
+    return pd.DataFrame({'vendas': rng.integers(1000, 9000, n), 'regiao': rng.choice(['Norte', 'Sul'], n)})
+
+
+def test_streaming_entrega_texto_parcial_e_mede_latencia(config_falsa):
+    parciais, metricas = [], {}
+    resposta = ia_gemini.analisar(criar_df(), config=config_falsa, ao_receber=parciais.append, metricas=metricas)
+
+    assert resposta == 'Vendas em alta'
+    assert parciais == ['Vendas ', 'Vendas em ', 'Vendas em alta']
+    assert metricas['origem'] == 'streaming'
+    assert 0 <= metricas['primeiro_trecho_s'] <= metricas['total_s']
+    assert all('streamGenerateContent' in c for c in GeminiFalso.caminhos)
+
+
+def test_sem_streaming_usa_chamada_bloqueante(config_falsa):
+    GeminiFalso.streaming_disponivel = False
+    parciais, metricas = [], {}
+    resposta = ia_gemini.analisar(criar_df(), 'Qual região lidera?', config=config_falsa,
+                                  ao_receber=parciais.append, metricas=metricas)
+
+    assert resposta == 'Vendas em alta'
+    assert parciais == []
+    assert metricas['origem'] == 'bloqueante'
+    assert ':generateContent' in GeminiFalso.caminhos[-1]
+
+
+def test_stream_so_com_trechos_vazios_registra_o_primeiro_trecho(config_falsa):
+    GeminiFalso.trechos = ['', '']
+    metricas = {}
+    assert ia_gemini.analisar(criar_df(), config=config_falsa, ao_receber=lambda t: None, metricas=metricas) == ''
+    assert metricas['origem'] == 'streaming'
+    assert metricas['primeiro_trecho_s'] == metricas['total_s']
+
+
+def test_erro_de_cota_no_streaming_nao_repete_a_chamada(config_falsa):
+    GeminiFalso.streaming_disponivel = False
+    GeminiFalso.erro_streaming = 429
+    with pytest.raises(Exception, match='429|quota|exhausted|Too Many'):
+        ia_gemini.analisar(criar_df(), config=config_falsa, ao_receber=lambda t: None)
+    assert len(GeminiFalso.caminhos) == 1
+
+
+def test_tarefas_montam_o_contexto_uma_vez(config_falsa, monkeypatch):
+    montagens = []
+    original = ia_gemini.montar_contexto
+
+    def montar_contexto(*args, **kwargs):
+        montagens.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ia_gemini, 'montar_contexto', montar_contexto)
+    tarefas = ia_gemini.tarefas_analises(criar_df(), config=config_falsa, sugestoes=['Qual região lidera?'])
+    assert not montagens
+
+    assert [tarefa() for tarefa in tarefas.values()] == ['Vendas em alta'] * 3
+    assert len(montagens) == 1
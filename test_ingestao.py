@@ -0,0 +1,78 @@
+"""
+Testes da ingestão em blocos
+Execute: python -m pytest test_ingestao.py
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from ingestao import ResumoIngestao, iterar_blocos_csv, ingerir_blocos
+
+
+def criar_df(n=1000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'vendas': rng.integers(1000, 10000, n),
+        'lucro': rng.normal(500, 100, n),
+        'regiao': rng.choice(['Norte', 'Sul', 'Leste'], n),
+        'produto': rng.choice(['A', 'B', 'C', 'D'], n)
+    })
+    df.loc[::50, 'lucro'] = np.nan
+    return df
+
+
+def test_agregados_iguais_ao_pandas():
+    """Agregados em blocos devem coincidir com o cálculo sobre o DataFrame inteiro"""
+    df = criar_df()
+    buffer = io.StringIO(df.to_csv(index=False))
+    resumo = ingerir_blocos(iterar_blocos_csv(buffer, tamanho_bloco=97), tamanho_amostra=100)
+
+    assert resumo.total_registros == len(df)
+    assert resumo.total_blocos == 11
+    assert resumo.nulos['lucro'] == df['lucro'].isnull().sum()
+    assert np.isclose(resumo.cubo.total('vendas'), df['vendas'].sum())
+    pd.testing.assert_series_equal(
+        resumo.cubo.agregar('regiao', 'vendas').sort_index().astype('int64'),
+        df.groupby('regiao')['vendas'].sum().sort_index(),
+        check_names=False
+    )
+
+    esperado = df.describe()
+    obtido = resumo.estatisticas()
+    for linha in ['count', 'mean', 'std', 'min', 'max']:
+        np.testing.assert_allclose(obtido.loc[linha, esperado.columns], esperado.loc[linha])
+
+
+def test_amostra_limitada_e_ordenada():
+    """A amostra respeita o tamanho máximo e preserva a ordem do arquivo"""
+    df = criar_df(5000).reset_index().rename(columns={'index': 'posicao'})
+    resumo = ResumoIngestao(tamanho_amostra=200)
+    for inicio in range(0, len(df), 512):
+        resumo.atualizar(df.iloc[inicio:inicio + 512])
+
+    amostra = resumo.amostra
+    assert len(amostra) == 200
+    assert resumo.amostrado
+    assert amostra['posicao'].is_monotonic_increasing
+    assert amostra['posicao'].is_unique
+
+
+def test_dataset_pequeno_fica_inteiro_na_amostra():
+    df = criar_df(150)
+    resumo = ResumoIngestao(tamanho_amostra=1000).atualizar(df)
+    assert not resumo.amostrado
+    pd.testing.assert_frame_equal(resumo.amostra, df)
+
+
+def test_medida_que_vira_texto_em_blocos_posteriores():
+    """Coluna numérica no primeiro bloco e com texto depois não derruba a ingestão"""
+    valores = list(range(100)) + ['x'] * 99 + ['7']
+    buffer = io.StringIO(pd.DataFrame({'vendas': valores, 'regiao': ['Norte', 'Sul'] * 100}).to_csv(index=False))
+    resumo = ingerir_blocos(iterar_blocos_csv(buffer, tamanho_bloco=100), tamanho_amostra=50)
+
+    assert resumo.total_registros == 200
+    assert resumo.cubo.total('vendas') == sum(range(100)) + 7
+    assert resumo.cubo.total('vendas', 'count') == 101
+    assert resumo.cubo.nao_numericos == {'vendas': 99}
@@ -0,0 +1,80 @@
+"""
+Testes da leitura de JSON em blocos
+Execute: python -m pytest test_leitura_json.py
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import leitura_json
+from exportacao import escrever_json
+from leitura_json import iterar_blocos_json, ler_json
+
+
+def criar_df(n=1000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'id': np.arange(n),
+        'vendas': rng.normal(5000, 800, n).round(2),
+        'regiao': rng.choice(['Norte', 'Sul', 'São {Paulo}'], n),
+        'data': pd.date_range('2024-01-01', periods=n, freq='h')
+    })
+
+
+@pytest.fixture
+def leitura_pequena(monkeypatch):
+    # Pedaços pequenos para cortar registros e linhas no meio
+    monkeypatch.setattr(leitura_json, 'TAMANHO_LEITURA', 777)
+
+
+def test_array_do_centro_de_exportacao_em_blocos(leitura_pequena):
+    df = criar_df()
+    destino = io.BytesIO()
+    escrever_json(df, destino, tamanho_bloco=300)
+    destino.seek(0)
+
+    blocos = list(iterar_blocos_json(destino, tamanho_bloco=400))
+    assert [len(b) for b in blocos] == [400, 400, 200]
+    assert all(b['data'].dtype.kind == 'M' for b in blocos)
+    pd.testing.assert_frame_equal(pd.concat(blocos, ignore_index=True), df)
+    assert not destino.closed
+
+
+def test_json_lines_com_linhas_vazias_e_chaves_ausentes(leitura_pequena):
+    df = criar_df(50)
+    texto = df.to_json(orient='records', lines=True, date_format='iso')
+    texto = texto.replace('\n', '\n\n', 3) + '{"id": 50, "extra": true}'
+
+    lido = ler_json(io.BytesIO(texto.encode('utf-8')), tamanho_bloco=20, linhas=True)
+    assert len(lido) == 51
+    assert lido['data'].dtype.kind == 'M'
+    assert lido['extra'].iloc[-1] == True  # noqa: E712
+    assert pd.isna(lido['vendas'].iloc[-1])
+    pd.testing.assert_frame_equal(lido.iloc[:50][list(df.columns)], df, check_dtype=False)
+
+
+def test_outras_formas_de_json_usam_o_pandas():
+    df = criar_df(30).drop(columns='data')
+    for orient in ('columns', 'values'):
+        texto = df.to_json(orient=orient)
+        esperado = pd.read_json(io.StringIO(texto))
+        pd.testing.assert_frame_equal(ler_json(io.BytesIO(texto.encode('utf-8'))), esperado)
+
+    # Um único objeto de escalares é um registro
+    assert ler_json(io.BytesIO(b'{"a": 1, "b": "x"}')).to_dict('records') == [{'a': 1, 'b': 'x'}]
+
+
+def test_valor_que_nao_e_data_num_bloco_posterior_nao_vira_nat():
+    df = criar_df(30)
+    df['data'] = df['data'].dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object)
+    df.loc[25, 'data'] = 'sem data'
+    texto = df.to_json(orient='records', lines=True)
+
+    with pytest.warns(UserWarning, match="'data'.*registro 21"):
+        blocos = list(iterar_blocos_json(io.BytesIO(texto.encode('utf-8')), tamanho_bloco=10))
+    assert [b['data'].dtype.kind for b in blocos] == ['M', 'M', 'O']
+    # Nenhum valor perdido: o bloco com o texto fica como estava no arquivo
+    assert blocos[2]['data'].tolist() == df['data'].iloc[20:].tolist()
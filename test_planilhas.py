@@ -0,0 +1,159 @@
+"""
+Testes da leitura de planilhas Excel em blocos
+Execute: python -m pytest test_planilhas.py
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import planilhas
+from planilhas import OPENPYXL_AVAILABLE, abas_excel, colunas_excel, iterar_blocos_excel, ler_excel
+
+pytestmark = pytest.mark.skipif(not OPENPYXL_AVAILABLE, reason="openpyxl não instalado")
+
+
+def criar_planilha(n=500):
+    rng = np.random.default_rng(0)
+    vendas = pd.DataFrame({
+        'id': np.arange(n),
+        'vendas': rng.normal(5000, 800, n).round(2),
+        'regiao': rng.choice(['Norte', 'Sul', 'Café & Cia'], n),
+        'data': pd.date_range('2024-01-01', periods=n, freq='h'),
+        'ativo': rng.random(n) > 0.5
+    })
+    vendas.loc[::7, 'vendas'] = np.nan
+    vendas.loc[::11, 'regiao'] = None
+    metas = pd.DataFrame({'mes': ['jan', 'fev'], 'meta': [10.5, 12.0]})
+    arquivo = io.BytesIO()
+    with pd.ExcelWriter(arquivo, engine='openpyxl') as escritor:
+        vendas.to_excel(escritor, sheet_name='Vendas', index=False)
+        metas.to_excel(escritor, sheet_name='Metas', index=False)
+    arquivo.seek(0)
+    return arquivo
+
+
+def montar_planilha(linhas, textos=(), dimensao=None):
+    """xlsx com o XML da aba escrito à mão (o openpyxl grava textos em linha e sempre a dimensão)"""
+    import zipfile
+    from openpyxl import Workbook
+
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    aba = f'<worksheet {ns}>'
+    if dimensao:
+        aba += f'<dimension ref="{dimensao}"/>'
+    aba += f'<sheetData>{linhas}</sheetData></worksheet>'
+    base = io.BytesIO()
+    Workbook().save(base)
+    arquivo = io.BytesIO()
+    with zipfile.ZipFile(base) as origem, zipfile.ZipFile(arquivo, 'w') as destino:
+        for nome in origem.namelist():
+            if nome != 'xl/worksheets/sheet1.xml':
+                destino.writestr(nome, origem.read(nome))
+        destino.writestr('xl/worksheets/sheet1.xml', aba)
+        if textos:
+            destino.writestr('xl/sharedStrings.xml',
+                             f'<sst {ns}>' + ''.join(f'<si><t>{t}</t></si>' for t in textos) + '</sst>')
+    arquivo.seek(0)
+    return arquivo
+
+
+def test_leitura_igual_ao_pandas_com_tipos():
+    arquivo = criar_planilha()
+    esperado = pd.read_excel(arquivo)
+    arquivo.seek(0)
+    df = ler_excel(arquivo, tamanho_bloco=120)
+
+    pd.testing.assert_frame_equal(df, esperado)
+    assert df['id'].dtype == np.int64
+    assert df['data'].dtype.kind == 'M'
+
+
+def test_escolha_de_aba_e_colunas_antes_da_leitura():
+    arquivo = criar_planilha()
+    assert abas_excel(arquivo) == ['Vendas', 'Metas']
+    assert colunas_excel(arquivo, 'Metas') == ['mes', 'meta']
+
+    df = ler_excel(arquivo, colunas=['regiao', 'vendas'])
+    assert list(df.columns) == ['regiao', 'vendas']
+    assert len(df) == 500
+    blocos = list(iterar_blocos_excel(arquivo, colunas=['id'], tamanho_bloco=200))
+    assert [len(b) for b in blocos] == [200, 200, 100]
+
+    with pytest.raises(ValueError):
+        ler_excel(arquivo, aba='Inexistente')
+
+
+def test_cabecalho_le_so_o_inicio_dos_textos_compartilhados(monkeypatch):
+    # Textos compartilhados: cabeçalho com os índices 0 e 1, dados com os demais
+    textos = ['nome', 'regiao', 'Norte', 'Sul'] + [f'cliente {i}' for i in range(300)]
+    linhas = ['<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>']
+    for i in range(300):
+        linhas.append(f'<row r="{i + 2}"><c r="A{i + 2}" t="s"><v>{i + 4}</v></c>'
+                      f'<c r="B{i + 2}" t="s"><v>{2 + i % 2}</v></c></row>')
+    arquivo = montar_planilha(''.join(linhas), textos)
+    lidos = []
+    original = planilhas.PastaExcel._ler_textos
+
+    def ler_textos(self, quantidade=None):
+        lidos.append(quantidade)
+        return original(self, quantidade)
+
+    def tabela_inteira(self):
+        raise RuntimeError("tabela de textos inteira carregada no cabeçalho")
+
+    monkeypatch.setattr(planilhas.PastaExcel, '_ler_textos', ler_textos)
+    monkeypatch.setattr(planilhas.PastaExcel, 'textos', property(tabela_inteira))
+    assert colunas_excel(arquivo) == ['nome', 'regiao']
+    # Só os textos até o maior índice do cabeçalho, não os 300 nomes
+    assert lidos == [2]
+
+
+# Trechos sem células numa coluna não podem cair no aviso de concat com colunas todas ausentes
+@pytest.mark.filterwarnings('error::FutureWarning')
+def test_celula_alem_do_cabecalho_tem_a_mesma_regra_em_todos_os_blocos(monkeypatch):
+    # Pedaços pequenos: as células soltas caem no primeiro e num bloco posterior
+    monkeypatch.setattr(planilhas, 'TAMANHO_PEDACO', 2048)
+    linhas = ['<row r="1"><c r="A1" t="inlineStr"><is><t>a</t></is></c>'
+              '<c r="B1" t="inlineStr"><is><t>b</t></is></c></row>']
+    for i in range(2, 302):
+        solta = f'<c r="C{i}"><v>9</v></c>' if i in (3, 250) else ''
+        linhas.append(f'<row r="{i}"><c r="A{i}"><v>{i}</v></c><c r="B{i}"><v>{i * 2}</v></c>{solta}</row>')
+
+    # Com <dimension>, a coluna extra existe em todos os blocos, como no pandas
+    arquivo = montar_planilha(''.join(linhas), dimensao='A1:C301')
+    esperado = pd.read_excel(arquivo)
+    arquivo.seek(0)
+    blocos = list(iterar_blocos_excel(arquivo, tamanho_bloco=100))
+    assert all(list(b.columns) == ['a', 'b', 'Unnamed: 2'] for b in blocos)
+    pd.testing.assert_frame_equal(pd.concat(blocos, ignore_index=True), esperado)
+
+    # Sem <dimension>, vale a largura do cabeçalho: as células soltas saem de todos os blocos, com aviso
+    arquivo = montar_planilha(''.join(linhas))
+    with pytest.warns(UserWarning, match='2 células'):
+        df = ler_excel(arquivo, tamanho_bloco=100)
+    assert list(df.columns) == ['a', 'b']
+    assert len(df) == 300
+
+
+def test_linhas_vazias_e_celulas_fora_do_padrao():
+    from openpyxl import Workbook
+
+    livro = Workbook()
+    planilha = livro.active
+    planilha.append(['nome', 'valor', None, 'nome'])
+    planilha.append(['a', 1.5, 'x', 'b'])
+    planilha.append([])
+    planilha.append(['c', '=1+1', None, 'd'])
+    arquivo = io.BytesIO()
+    livro.save(arquivo)
+    arquivo.seek(0)
+
+    esperado = pd.read_excel(arquivo)
+    arquivo.seek(0)
+    df = ler_excel(arquivo)
+    # Fórmula sem valor em cache fica vazia, como no pandas
+    assert list(df.columns) == ['nome', 'valor', 'Unnamed: 2', 'nome.1']
+    pd.testing.assert_frame_equal(df, esperado)
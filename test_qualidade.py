@@ -0,0 +1,73 @@
+"""
+Testes do perfil de qualidade dos dados
+Execute: python -m pytest test_qualidade.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from qualidade import PerfilQualidade
+
+
+def criar_df(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'vendas': rng.integers(1, 50, n),
+        'lucro': rng.normal(500, 100, n).round(0),
+        'regiao': pd.Categorical(rng.choice(['Norte', 'Sul', 'Leste'], n)),
+        'produto': rng.choice(['A', 'B', 'C'], n)
+    })
+    df.loc[::30, 'lucro'] = np.nan
+    return df
+
+
+def test_perfil_igual_ao_pandas_inteiro_ou_em_blocos():
+    df = criar_df()
+    for tamanho_bloco in [None, 250]:
+        perfil = PerfilQualidade.de_dataframe(df, tamanho_bloco=tamanho_bloco)
+        assert perfil.n_registros == len(df)
+        assert perfil.duplicadas == df.duplicated().sum()
+        assert perfil.ausentes == df.isnull().sum().sum()
+        pd.testing.assert_series_equal(perfil.nulos, df.isnull().sum(), check_names=False)
+        pd.testing.assert_series_equal(perfil.distintos(), df.nunique(), check_names=False)
+        assert perfil.distintos_aproximados() == []
+    # Em blocos, cada pedaço categórico repete suas categorias
+    inteiro = PerfilQualidade.de_dataframe(df)
+    assert inteiro.memoria_bytes.sum() == df.memory_usage(deep=True, index=False).sum()
+
+
+def test_duplicatas_entre_blocos_anexados():
+    df = criar_df(500)
+    perfil = PerfilQualidade().atualizar(df)
+    antes = perfil.duplicadas
+
+    perfil.atualizar(df.iloc[:40])
+    assert perfil.duplicadas == antes + 40
+    perfil.atualizar(pd.DataFrame({'vendas': [999], 'lucro': [np.nan], 'regiao': ['Oeste'], 'produto': ['Z']}))
+    assert perfil.duplicadas == antes + 40
+    assert perfil.completude == 100 * (1 - perfil.ausentes / (perfil.n_registros * 4))
+
+
+def test_cardinalidade_alta_passa_a_ser_estimada():
+    perfil = PerfilQualidade(limite_distintos_exatos=1000)
+    for inicio in range(0, 50_000, 10_000):
+        perfil.atualizar(pd.DataFrame({'id': np.arange(inicio, inicio + 10_000), 'grupo': inicio % 3}))
+
+    assert perfil.distintos_aproximados() == ['id']
+    assert abs(perfil.distintos()['id'] / 50_000 - 1) <= 3 * perfil.erro_distintos
+    assert perfil.distintos()['grupo'] == 3
+    assert perfil.duplicadas == 0
+
+
+def test_duplicatas_estimadas_acima_do_limite_de_linhas():
+    perfil = PerfilQualidade(limite_linhas_exatas=1000)
+    distintas = pd.DataFrame({'id': np.arange(15_000), 'grupo': np.arange(15_000) % 7})
+    for inicio in range(0, 15_000, 5_000):
+        perfil.atualizar(distintas.iloc[inicio:inicio + 5_000])
+    perfil.atualizar(distintas.iloc[:5_000])
+
+    assert perfil.duplicadas_aproximadas
+    # Memória limitada: os hashes das linhas não são mais guardados
+    assert len(perfil._linhas.hashes) == 0
+    assert abs(perfil.duplicadas - 5_000) <= 3 * perfil.erro_distintos * 15_000
+    assert not PerfilQualidade.de_dataframe(distintas).duplicadas_aproximadas
@@ -0,0 +1,64 @@
+"""
+Testes dos relatórios em lote
+Execute: python -m pytest test_relatorio_lote.py
+"""
+
+import os
+
+import pandas as pd
+
+from cache_ia import CacheRespostas, chave_resposta, impressao_dataframe
+from compactacao import compactar_dataframe
+from config import GEMINI_CONFIG
+from gerador_dados import gerar_dados_vendas
+from ia_gemini import PROMPT_ANALISE
+from relatorio_lote import gerar_relatorios, main
+
+
+def criar_diretorio(tmp_path):
+    dados = tmp_path / 'dados'
+    dados.mkdir()
+    gerar_dados_vendas(n_registros=500, seed=1).to_csv(dados / 'norte.csv', index=False)
+    gerar_dados_vendas(n_registros=300, seed=2).to_json(dados / 'sul.jsonl', orient='records', lines=True,
+                                                        date_format='iso')
+    (dados / 'quebrado.json').write_text('{oops', encoding='utf-8')
+    (dados / 'leia-me.txt').write_text('ignorado', encoding='utf-8')
+    return dados
+
+
+def test_relatorios_de_cada_arquivo_com_tempos(tmp_path):
+    dados = criar_diretorio(tmp_path)
+    saida = tmp_path / 'saida'
+
+    tabela = gerar_relatorios(str(dados), str(saida), processos=2)
+
+    assert list(tabela['arquivo']) == ['norte.csv', 'quebrado.json', 'sul.jsonl']
+    assert tabela.set_index('arquivo')['registros'].dropna().to_dict() == {'norte.csv': 500, 'sul.jsonl': 300}
+    assert tabela['erro'].notna().tolist() == [False, True, False]
+    for prefixo in ('norte', 'sul'):
+        assert 'RELATÓRIO EXECUTIVO' in (saida / f'{prefixo}_executivo.txt').read_text(encoding='utf-8')
+        assert 'RELATÓRIO TÉCNICO' in (saida / f'{prefixo}_tecnico.txt').read_text(encoding='utf-8')
+    assert len(pd.read_csv(saida / 'tempos.csv')) == 3
+
+    # Arquivo com erro: código de saída 1
+    assert main([str(dados), '--saida', str(saida), '--processos', '1']) == 1
+
+
+def test_modo_cache_usa_respostas_guardadas_sem_rede(tmp_path):
+    dados = criar_diretorio(tmp_path)
+    os.remove(dados / 'quebrado.json')
+    saida = tmp_path / 'saida'
+    caminho_cache = str(tmp_path / 'respostas.sqlite')
+
+    # Resposta guardada para o mesmo DataFrame que o app analisaria (já compactado)
+    df, _ = compactar_dataframe(pd.read_csv(dados / 'norte.csv'))
+    cache = CacheRespostas(caminho_cache, ttl_segundos=3600, max_entradas=10)
+    cache.guardar(chave_resposta(impressao_dataframe(df), PROMPT_ANALISE, None, GEMINI_CONFIG), 'Análise guardada')
+
+    tabela = gerar_relatorios(str(dados), str(saida), processos=1, modo_ia='cache', caminho_cache=caminho_cache)
+
+    assert tabela['erro'].isna().all()
+    assert (saida / 'norte_analise_ia.txt').read_text(encoding='utf-8') == 'Análise guardada'
+    assert 'Análise guardada' in (saida / 'norte_executivo.txt').read_text(encoding='utf-8')
+    # Sem resposta em cache: relatórios sem a análise, sem chamar a API
+    assert not (saida / 'sul_analise_ia.txt').exists()